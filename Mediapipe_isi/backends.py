@@ -0,0 +1,330 @@
+import argparse
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS
+from replay import HANDEDNESS_LABELS, LandmarkReplay, recorded_labels
+
+# Landmark arka uçları: çizim hattı modelden bağımsız olarak normalize NumPy landmark'ları alır.
+# Her arka uç detect(image_rgb, timestamp) ile HandDetection döner; model ilk tespitte (veya load ile) yüklenir.
+# detect_async aynı sonucu Future olarak verir (çağıran beklemez); zaman damgaları time.perf_counter saniyesidir.
+# Aynı çizim hattında arka uçlar değiştirilerek verim karşılaştırılabilir (benchmarks/backends.py).
+
+
+class HandDetection:
+    # points: normalize (n, 21, 3) float32; handedness: (n, 2) [etiket (0 sol, 1 sağ), skor] veya None.
+    # multi_hand_landmarks: eski MediaPipe çözümünün protobuf sonucu (sadece iskelet çizimi için), yoksa None
+    __slots__ = ('points', 'handedness', 'multi_hand_landmarks')
+
+    def __init__(self, points, handedness=None, multi_hand_landmarks=None):
+        self.points = points
+        self.handedness = handedness
+        self.multi_hand_landmarks = multi_hand_landmarks
+
+    def __len__(self):
+        return len(self.points)
+
+    def labels(self):
+        # El etiketleri ('Left'/'Right'); etiket yoksa None (eller sadece konumla eşleştirilir)
+        if self.handedness is None:
+            return None
+        return [HANDEDNESS_LABELS[int(label)] for label in self.handedness[:, 0]]
+
+
+def empty_detection():
+    return HandDetection(np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32), np.zeros((0, 2), dtype=np.float32))
+
+
+def mirror_detection(detection):
+    # Yatay aynalanmış karedeki karşılık: x -> 1 - x, sol/sağ etiketleri yer değiştirir (diziler yerinde
+    # değişir, arka ucun her tespitte ürettiği yeni dizilerdir). Protobuf sonucu aynalanmamış karededir, atılır
+    points = detection.points
+    np.subtract(1, points[..., 0], out=points[..., 0])
+    if detection.handedness is not None:
+        np.subtract(1, detection.handedness[:, 0], out=detection.handedness[:, 0])
+    detection.multi_hand_landmarks = None
+    return detection
+
+
+def _categories_to_arrays(hands, handedness, max_hands):
+    # [[landmark]] ve [(etiket, skor)] -> (n, 21, 3), (n, 2); protobuf ve Tasks sonuçları için ortak
+    n = min(len(hands), max_hands)
+    points = np.array([[(lm.x, lm.y, lm.z) for lm in hand] for hand in hands[:n]],
+                      dtype=np.float32).reshape(n, NUM_LANDMARKS, 3)
+    scores = np.zeros((n, 2), dtype=np.float32)
+    for i, (label, score) in enumerate(handedness[:n]):
+        scores[i] = (HANDEDNESS_LABELS.index(label), score)
+    return points, scores
+
+
+class LandmarkBackend:
+    # Ortak iskelet; alt sınıflar _load ve _detect'i doldurur.
+    # warms_up: ilk çağrısı pahalı olan (model) arka uçlar; kayıt ve sahte arka uçta ısınma kare tüketirdi.
+    # uses_image: sonuç görüntüden üretilir; mirror=True ise aynalanmamış kamera karesindeki sonuç
+    # ekranda gösterilecek aynalı kareye çevrilir (pikseller model için çevrilmez)
+    name = 'none'
+    warms_up = False
+    uses_image = False
+
+    def __init__(self, max_hands=2):
+        self.max_hands = max_hands
+        self.loaded = False
+        self.mirror = False
+        self._executor = None
+
+    def load(self):
+        if not self.loaded:
+            self._load()
+            self.loaded = True
+        return self
+
+    def warm_up(self, size):
+        # İlk çağrı grafiği başlatır ve tensörleri ayırır: boş sentetik karede döngüden önce ödenir
+        # (elsiz kare takip durumunu etkilemez)
+        if not self.warms_up:
+            return
+        w, h = size
+        self.detect(np.zeros((h, w, 3), dtype=np.uint8))
+
+    def detect(self, image_rgb, timestamp=None):
+        if not self.loaded:
+            self.load()
+        return self._output(self._detect(image_rgb, time.perf_counter() if timestamp is None else timestamp))
+
+    def detect_async(self, image_rgb, timestamp):
+        # Varsayılan: tek işçili thread'de detect. Girdi sonuç gelene kadar yeniden yazılmamalı
+        # (InputBuffer tamponu; SkippingDetector önceki sonuç gelmeden yeni girdi hazırlamaz)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}-infer")
+        return self._executor.submit(self.detect, image_rgb, timestamp)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _output(self, detection):
+        return mirror_detection(detection) if self.mirror and self.uses_image and len(detection) else detection
+
+    def _load(self):
+        pass
+
+    def _detect(self, image_rgb, timestamp):
+        return empty_detection()
+
+
+class SolutionsBackend(LandmarkBackend):
+    # Eski mp.solutions.hands.Hands; model_complexity=0 hafif (lite) landmark modelidir
+    name = 'mediapipe'
+    warms_up = True
+    uses_image = True
+
+    def __init__(self, max_hands=2, static_image_mode=False, min_detection_confidence=0.7,
+                 min_tracking_confidence=0.7, model_complexity=1):
+        super().__init__(max_hands)
+        self.options = dict(static_image_mode=static_image_mode, max_num_hands=max_hands,
+                            min_detection_confidence=min_detection_confidence,
+                            min_tracking_confidence=min_tracking_confidence, model_complexity=model_complexity)
+        self.hands = None
+
+    def _load(self):
+        # mediapipe (TFLite, protobuf) burada içe aktarılır
+        import mediapipe as mp
+        self.hands = mp.solutions.hands.Hands(**self.options)
+
+    def _detect(self, image_rgb, timestamp):
+        results = self.hands.process(image_rgb)
+        if not results.multi_hand_landmarks:
+            return empty_detection()
+        points, handedness = _categories_to_arrays(
+            [hand.landmark for hand in results.multi_hand_landmarks],
+            [(h.classification[0].label, h.classification[0].score) for h in results.multi_handedness or ()],
+            self.max_hands)
+        return HandDetection(points, handedness, results.multi_hand_landmarks)
+
+    def close(self):
+        super().close()
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = None
+            self.loaded = False
+
+
+class TasksBackend(LandmarkBackend):
+    # MediaPipe Tasks HandLandmarker; model paketi (.task) ayrıca indirilir.
+    # live_stream=False: VIDEO modu (senkron). live_stream=True: LIVE_STREAM modu, kareler detect_async ile
+    # grafiğe verilir ve sonuç MediaPipe'ın callback'inde zaman damgasıyla eşlenip Future'a yazılır
+    name = 'tasks'
+    warms_up = True
+    uses_image = True
+
+    def __init__(self, model_path, max_hands=2, min_detection_confidence=0.7, min_presence_confidence=0.7,
+                 min_tracking_confidence=0.7, live_stream=False):
+        super().__init__(max_hands)
+        self.model_path = model_path
+        self.min_detection_confidence = min_detection_confidence
+        self.min_presence_confidence = min_presence_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.live_stream = live_stream
+        self.landmarker = None
+        self._mp = None
+        self._last_ms = -1
+        # ms zaman damgası -> bekleyen Future (LIVE_STREAM)
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions
+        from mediapipe.tasks.python.vision import HandLandmarker, HandLandmarkerOptions, RunningMode
+        self._mp = mp
+        options = HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=self.model_path),
+            running_mode=RunningMode.LIVE_STREAM if self.live_stream else RunningMode.VIDEO,
+            result_callback=self._on_result if self.live_stream else None,
+            num_hands=self.max_hands,
+            min_hand_detection_confidence=self.min_detection_confidence,
+            min_hand_presence_confidence=self.min_presence_confidence,
+            min_tracking_confidence=self.min_tracking_confidence)
+        self.landmarker = HandLandmarker.create_from_options(options)
+
+    def _timestamp_ms(self, timestamp):
+        # VIDEO ve LIVE_STREAM modları kesin artan ms zaman damgası ister (aynı ms'deki iki kare reddedilir)
+        ms = max(int(timestamp * 1000), self._last_ms + 1)
+        self._last_ms = ms
+        return ms
+
+    def _image(self, image_rgb):
+        return self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=np.ascontiguousarray(image_rgb))
+
+    def _to_detection(self, result):
+        if not result.hand_landmarks:
+            return empty_detection()
+        points, handedness = _categories_to_arrays(
+            result.hand_landmarks,
+            [(h[0].category_name, h[0].score) for h in result.handedness],
+            self.max_hands)
+        return HandDetection(points, handedness)
+
+    def detect(self, image_rgb, timestamp=None):
+        if self.live_stream:
+            # LIVE_STREAM'de senkron çağrı yok (ısınma gibi tek seferlik kullanımlar için);
+            # sonuç callback'te aynalanmıştır
+            return self.detect_async(image_rgb, time.perf_counter() if timestamp is None else timestamp).result()
+        return super().detect(image_rgb, timestamp)
+
+    def _detect(self, image_rgb, timestamp):
+        return self._to_detection(self.landmarker.detect_for_video(self._image(image_rgb),
+                                                                   self._timestamp_ms(timestamp)))
+
+    def detect_async(self, image_rgb, timestamp):
+        if not self.live_stream:
+            return super().detect_async(image_rgb, timestamp)
+        self.load()
+        future = Future()
+        with self._lock:
+            ms = self._timestamp_ms(timestamp)
+            self._futures[ms] = future
+        self.landmarker.detect_async(self._image(image_rgb), ms)
+        return future
+
+    def _on_result(self, result, image, timestamp_ms):
+        # MediaPipe thread'inde çağrılır. Grafik meşgulken gelen kareleri düşürür: bu sonuçtan eski
+        # bekleyen Future'lar iptal edilir (sonuç gelmeyecek)
+        detection = self._output(self._to_detection(result))
+        with self._lock:
+            future = self._futures.pop(timestamp_ms, None)
+            dropped = [self._futures.pop(ms) for ms in [ms for ms in self._futures if ms < timestamp_ms]]
+        for stale in dropped:
+            stale.cancel()
+        if future is not None:
+            future.set_result(detection)
+
+    def close(self):
+        super().close()
+        if self.landmarker is not None:
+            self.landmarker.close()
+            self.landmarker = None
+            self.loaded = False
+
+
+class ReplayBackend(LandmarkBackend):
+    # Kaydedilmiş landmark'lar (replay.py) kare sırasıyla döner; görüntü kullanılmaz.
+    # loop: kayıt bitince başa sarar, aksi halde boş sonuç döner
+    name = 'replay'
+
+    def __init__(self, recording, loop=True):
+        self.recording = LandmarkReplay(recording) if isinstance(recording, str) else recording
+        super().__init__(self.recording.max_hands)
+        self.loop = loop
+        self.position = 0
+
+    def _detect(self, image_rgb, timestamp):
+        if self.position >= len(self.recording):
+            if not self.loop or not len(self.recording):
+                return empty_detection()
+            self.position = 0
+        _, points, handedness = self.recording.frame(self.position)
+        self.position += 1
+        # Etiketsiz kayıtta (skor 0) etiket yok: canlı çalışmadaki gibi eller konumla eşleştirilir
+        return HandDetection(np.array(points),
+                             np.array(handedness) if recorded_labels(handedness) is not None else None)
+
+
+class FakeBackend(LandmarkBackend):
+    # Model yerine sabit gecikme (sn) ve hazır akış: hat yükünü modelden ayırmak için.
+    # stream: (points, counts) (LandmarkReplay.as_stream biçimi); yoksa hiç el dönmez
+    name = 'fake'
+
+    def __init__(self, stream=None, latency=0.0, max_hands=2):
+        super().__init__(max_hands if stream is None else stream[0].shape[1])
+        self.stream = stream
+        self.latency = latency
+        self.position = 0
+
+    def _detect(self, image_rgb, timestamp):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.stream is None:
+            return empty_detection()
+        points, counts = self.stream
+        i = self.position % len(counts)
+        self.position += 1
+        return HandDetection(points[i, :counts[i]].copy())
+
+
+BACKENDS = ('mediapipe', 'mediapipe-lite', 'tasks', 'replay', 'fake')
+
+
+def parse_backend(spec):
+    # "mediapipe", "mediapipe-lite", "tasks:hand_landmarker.task", "replay:oturum1", "fake:15" (ms gecikme).
+    # argparse type= olarak kullanılır: hatalı değer kullanım mesajıyla bildirilir
+    name, _, arg = spec.partition(':')
+    if name not in BACKENDS:
+        raise argparse.ArgumentTypeError(f"Bilinmeyen arka uç: {name} (seçenekler: {', '.join(BACKENDS)})")
+    if name in ('tasks', 'replay') and not arg:
+        raise argparse.ArgumentTypeError(f"'{name}' arka ucu bir dosya ister, örn. {name}:dosya")
+    if name == 'fake' and arg:
+        try:
+            float(arg)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"'fake' arka ucunun gecikmesi ms cinsinden sayı olmalı: {arg}") from None
+    return name, arg
+
+
+def make_backend(spec, max_hands=2, min_detection_confidence=0.7, min_tracking_confidence=0.7, live_stream=False):
+    # spec: parse_backend biçimi veya (ad, argüman); live_stream: Tasks arka ucu LIVE_STREAM modunda açılır
+    name, arg = parse_backend(spec) if isinstance(spec, str) else spec
+    if name in ('mediapipe', 'mediapipe-lite'):
+        return SolutionsBackend(max_hands, min_detection_confidence=min_detection_confidence,
+                                min_tracking_confidence=min_tracking_confidence,
+                                model_complexity=0 if name == 'mediapipe-lite' else 1)
+    if name == 'tasks':
+        return TasksBackend(arg, max_hands, min_detection_confidence=min_detection_confidence,
+                            min_tracking_confidence=min_tracking_confidence, live_stream=live_stream)
+    if name == 'replay':
+        return ReplayBackend(arg)
+    return FakeBackend(latency=float(arg or 0) / 1000, max_hands=max_hands)
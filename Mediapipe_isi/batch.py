@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+from inference import FramePool, parse_size
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+
+def collect_videos(paths):
+    # Dosyalar olduğu gibi, klasörlerdeki videolar sıralı olarak alınır
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(VIDEO_EXTENSIONS):
+                    videos.append(os.path.join(path, name))
+        else:
+            videos.append(path)
+    return videos
+
+
+def create_app(app_name, inference_size):
+    if app_name == 'advanced':
+        from deneme import AdvancedHandDrawing
+        app = AdvancedHandDrawing(inference_size=inference_size)
+    else:
+        from deneme2 import FingerDrawingApp
+        app = FingerDrawingApp(inference_size=inference_size)
+        app.verbose = False
+    return app
+
+
+def process_frame(app, app_name, image, timestamp):
+    # (işlenmiş kare, piksel uzayında eller, jestler).
+    # timestamp: video zamanı (kare / FPS); toplu işlem gerçek zamandan hızlı çalıştığı için filtreler,
+    # jest bekleme ve soğuma süreleri duvar saatiyle değil bununla işler (sonuç CPU hızından bağımsız)
+    results = app.process_frame(image)
+    if app_name == 'advanced':
+        output = app.process_drawing(image, results, timestamp)
+        app.draw_ui(output)
+        return output, app.landmarks.points[:app.landmarks.count], app.last_gestures
+    output = app.process_drawing(image, results, timestamp)
+    return output, app.landmarks.points[:app.landmarks.count], [app.last_gesture]
+
+
+def final_canvas(app, app_name):
+    if app_name == 'advanced':
+        return app.drawing_canvas.raster() if app.drawing_canvas is not None else None
+    return app.canvas
+
+
+def process_video(path, out_dir, app_name='advanced', inference_size=None,
+                  write_video=True, write_log=True, mirror=True, threads=None):
+    # Tek bir videoyu pencere açmadan, olabildiğince hızlı işler
+    if threads is not None:
+        cv2.setNumThreads(threads)
+    app = create_app(app_name, inference_size)
+    name = os.path.splitext(os.path.basename(path))[0]
+    os.makedirs(out_dir, exist_ok=True)
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    writer = None
+    log_file = open(os.path.join(out_dir, f"{name}_landmarks.jsonl"), "w", encoding="utf-8") if write_log else None
+
+    # Kareler aynı tampona okunur ve yerinde aynalanır (kare başına tam kare ayrılmaz)
+    frames = FramePool()
+    frame_count = 0
+    start_time = time.perf_counter()
+    try:
+        while True:
+            success, image = frames.read(cap)
+            if not success:
+                break
+            if mirror:
+                cv2.flip(image, 1, dst=image)
+            timestamp = frame_count / fps
+            output, hands, gestures = process_frame(app, app_name, image, timestamp)
+
+            if write_video:
+                if writer is None:
+                    h, w = output.shape[:2]
+                    writer = cv2.VideoWriter(os.path.join(out_dir, f"{name}_annotated.mp4"),
+                                             cv2.VideoWriter_fourcc(*'mp4v'), fps, (w, h))
+                writer.write(output)
+            if log_file is not None:
+                record = {
+                    'frame': frame_count,
+                    'time': round(timestamp, 4),
+                    'hands': np.round(hands, 2).tolist(),
+                    'gestures': list(gestures),
+                }
+                log_file.write(json.dumps(record) + "\n")
+            frames.release(image)
+            frame_count += 1
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+        if log_file is not None:
+            log_file.close()
+
+    canvas = final_canvas(app, app_name)
+    if canvas is not None:
+        cv2.imwrite(os.path.join(out_dir, f"{name}_canvas.png"), canvas)
+    if app_name != 'advanced':
+        # Tanınan metin (bekleyen tanımalar tamamlanır)
+        app.close()
+        with open(os.path.join(out_dir, f"{name}_text.txt"), "w", encoding="utf-8") as f:
+            f.write(app.written_text)
+    elapsed = time.perf_counter() - start_time
+    return {'video': path, 'frames': frame_count, 'seconds': elapsed,
+            'fps': frame_count / elapsed if elapsed > 0 else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıtlı videolarda toplu el takibi ve çizim")
+    parser.add_argument('inputs', nargs='+', help="Video dosyaları veya video klasörleri")
+    parser.add_argument('--out', default='batch_output', help="Çıktı klasörü")
+    parser.add_argument('--app', choices=('advanced', 'simple'), default='advanced',
+                        help="advanced: deneme.py, simple: deneme2.py")
+    parser.add_argument('--workers', type=int, default=1, help="Paralel işlenecek video sayısı")
+    parser.add_argument('--inference-size', type=parse_size, default=None)
+    parser.add_argument('--no-video', action='store_true', help="İşaretlenmiş video yazma")
+    parser.add_argument('--no-log', action='store_true', help="Kare bazlı landmark/jest kaydı yazma")
+    parser.add_argument('--no-mirror', action='store_true', help="Kareleri yatay çevirme")
+    args = parser.parse_args()
+
+    videos = collect_videos(args.inputs)
+    if not videos:
+        print("İşlenecek video bulunamadı")
+        return
+
+    options = dict(app_name=args.app, inference_size=args.inference_size,
+                   write_video=not args.no_video, write_log=not args.no_log,
+                   mirror=not args.no_mirror)
+    start_time = time.perf_counter()
+    total_frames = 0
+    if args.workers <= 1:
+        for path in videos:
+            summary = process_video(path, args.out, **options)
+            total_frames += summary['frames']
+            print(f"{summary['video']}: {summary['frames']} kare, {summary['fps']:.1f} FPS")
+    else:
+        # Her süreç tek OpenCV thread'i kullanır, çekirdekleri videolar paylaşır
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(process_video, path, args.out, threads=1, **options) for path in videos]
+            for future in as_completed(futures):
+                summary = future.result()
+                total_frames += summary['frames']
+                print(f"{summary['video']}: {summary['frames']} kare, {summary['fps']:.1f} FPS")
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Toplam: {len(videos)} video, {total_frames} kare, {elapsed:.2f} sn, "
+          f"{total_frames / max(elapsed, 1e-9):.1f} FPS")
+
+
+if __name__ == "__main__":
+    main()
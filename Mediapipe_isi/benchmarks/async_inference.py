@@ -0,0 +1,103 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import HandDetection, LandmarkBackend
+from landmarks import INDEX_TIP
+from prediction import SkippingDetector
+from fixtures import synthetic_stream
+
+# Asenkron çıkarımda zaman damgası düzeltmesinin etkisi: kamera sabit hızda kare üretir, sahte model
+# gönderilen karenin gerçek landmark'larını sabit gecikmeyle döner. Ekrana çizilen işaret parmağı ucunun,
+# kare gösterildiği andaki gerçek konumdan sapması ölçülür:
+#   senkron    her kare model bitene kadar bekler (FPS model hızında, gösterilen kare gecikme kadar eski)
+#   asenkron   son sonuç olduğu gibi kullanılır (ileri kestirim kapalı)
+#   düzeltmeli son sonuç kendi karesinin zamanından o anki kareye ileri kestirilir
+# Düzeltmeli modun p95 sapması düzeltmesiz asenkrondan kötüyse çıkış kodu 1 (kestirim hedefi aşıyor)
+
+
+class TruthBackend(LandmarkBackend):
+    # "Görüntü" kare indeksidir; sonuç o karenin gerçek landmark'ları
+    name = 'truth'
+
+    def __init__(self, truth, latency):
+        super().__init__(truth.shape[1])
+        self.truth = truth
+        self.latency = latency
+
+    def _detect(self, index, timestamp):
+        time.sleep(self.latency)
+        return HandDetection(self.truth[index])
+
+
+def run(truth, size, fps, latency, mode):
+    frames = len(truth)
+    backend = TruthBackend(truth, latency)
+    frame = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    index = [0]
+    detector = SkippingDetector(lambda image: index[0], backend.detect, truth.shape[1], adaptive=True,
+                                submit_fn=backend.detect_async)
+    if mode == 'asenkron':
+        detector.predictor.max_horizon = 0.0
+    scale = np.array((size[0], size[1]), dtype=np.float32)
+    errors = []
+    shown_frames = 0
+    last = -1
+    start = time.perf_counter()
+    while True:
+        # Kamera en yeni kareyi verir (kare i, start + i / fps anında hazır); yeni kare yoksa beklenir
+        i = max(int((time.perf_counter() - start) * fps), last + 1)
+        if i >= frames:
+            break
+        captured_at = start + i / fps
+        remaining = captured_at - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        index[0] = last = i
+        if mode == 'senkron':
+            hands = backend.detect(i, captured_at).points[..., :2] * scale
+        else:
+            hands = detector(frame, captured_at)[0][..., :2]
+        shown_frames += 1
+        # Elin gösterim anındaki gerçek konumu (kamera o an hangi kareyi üretiyorsa)
+        shown = min(int((time.perf_counter() - start) * fps), frames - 1)
+        if len(hands):
+            errors.append(np.hypot(*(hands[0, INDEX_TIP] - truth[shown, 0, INDEX_TIP, :2] * scale)))
+    elapsed = time.perf_counter() - start
+    detector.close()
+    backend.close()
+    return np.array(errors), shown_frames / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asenkron çıkarım ve zaman damgası düzeltmesi benchmark'ı")
+    parser.add_argument('--latency', type=float, default=60.0, help="Sahte model gecikmesi (ms)")
+    parser.add_argument('--fps', type=float, default=30.0, help="Kamera FPS'i")
+    parser.add_argument('--frames', type=int, default=240)
+    parser.add_argument('--size', default='1280x720')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split('x'))
+    points, counts = synthetic_stream(1, seed=args.seed, noise=0.0)
+    truth = points[:args.frames, :1]
+    print(f"{len(truth)} kare, kamera {args.fps:.0f} FPS, model gecikmesi {args.latency:.0f} ms, {os.cpu_count()} çekirdek")
+    print(f"  {'mod':<12} {'FPS':>7} {'sapma p50':>10} {'p95':>8} {'en çok':>8}  (px, işaret parmağı ucu)")
+    p95 = {}
+    for mode in ('senkron', 'asenkron', 'düzeltmeli'):
+        errors, fps = run(truth, size, args.fps, args.latency / 1000, mode)
+        p95[mode] = np.percentile(errors, 95)
+        print(f"  {mode:<12} {fps:7.1f} {np.percentile(errors, 50):10.1f} {p95[mode]:8.1f} "
+              f"{errors.max():8.1f}")
+    if p95['düzeltmeli'] > p95['asenkron']:
+        print(f"HATA: düzeltmeli p95 ({p95['düzeltmeli']:.1f} px) düzeltmesizden ({p95['asenkron']:.1f} px) kötü")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
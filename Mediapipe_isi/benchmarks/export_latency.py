@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from canvas import DrawingCanvas
+from export import ExportQueue, parse_formats
+
+# Kaydetmenin kare döngüsüne maliyeti: eski senkron cv2.imwrite ile arka plan kuyruğu karşılaştırılır.
+# Kuyrukta ana thread'in ödediği süre anlık görüntü + iş ekleme, ve kayıt sürerken çizilen karelerdir.
+
+
+def fill_canvas(canvas, strokes, seed=0):
+    # Uzun bir oturumu andıran rastgele yürüyüş çizgileri
+    rng = np.random.default_rng(seed)
+    w, h = canvas.width, canvas.height
+    for _ in range(strokes):
+        p = rng.integers(0, (w, h))
+        color = (int(rng.integers(0, 256)), int(rng.integers(0, 256)), 255)
+        for _ in range(40):
+            q = np.clip(p + rng.integers(-25, 26, 2), 0, (w - 1, h - 1))
+            canvas.line(tuple(map(int, p)), tuple(map(int, q)), color, int(rng.integers(3, 15)))
+            p = q
+        canvas.end_stroke(0)
+    canvas.raster()
+
+
+def draw_frames(canvas, frames, rng, samples):
+    # Kare başına bir kısa çizgi parçası + birleştirme (canlı çizim yükü)
+    w, h = canvas.width, canvas.height
+    p = rng.integers(0, (w, h))
+    frame = np.zeros((h, w, 3), dtype=np.uint8)
+    for _ in range(frames):
+        q = np.clip(p + rng.integers(-20, 21, 2), 0, (w - 1, h - 1))
+        start = time.perf_counter_ns()
+        canvas.line(tuple(map(int, p)), tuple(map(int, q)), (255, 255, 255), 8)
+        canvas.compose(frame)
+        samples.append(time.perf_counter_ns() - start)
+        p = q
+    canvas.end_stroke(0)
+
+
+def percentiles(samples_ns):
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    return f"{np.percentile(ms, 50):8.3f} {np.percentile(ms, 99):8.3f} {ms.max():8.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaydetme gecikmesi benchmark'ı")
+    parser.add_argument('--size', default='1280x720')
+    parser.add_argument('--strokes', type=int, default=200, help="Tuvaldeki çizgi sayısı")
+    parser.add_argument('--saves', type=int, default=20)
+    parser.add_argument('--formats', type=parse_formats, default=('png',), help="Arka plan kuyruğunun biçimleri")
+    parser.add_argument('--frames-per-save', type=int, default=30, help="Kayıtlar arası çizilen kare")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    w, h = (int(v) for v in args.size.split('x'))
+    canvas = DrawingCanvas((h, w, 3))
+    fill_canvas(canvas, args.strokes, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    out_dir = tempfile.mkdtemp(prefix="export_bench_")
+
+    # Eski yol: kare döngüsünde senkron PNG yazımı
+    sync, frames_plain = [], []
+    for i in range(args.saves):
+        start = time.perf_counter_ns()
+        cv2.imwrite(os.path.join(out_dir, f"sync_{i}.png"), canvas.render())
+        sync.append(time.perf_counter_ns() - start)
+        draw_frames(canvas, args.frames_per_save, rng, frames_plain)
+
+    # Kuyruk: ana thread sadece anlık görüntü alır; kayıt sürerken kareler çizilmeye devam eder
+    exports = ExportQueue(args.formats, verbose=False)
+    submit, frames_saving = [], []
+    for i in range(args.saves):
+        start = time.perf_counter_ns()
+        future = exports.save(canvas, os.path.join(out_dir, f"async_{i}"))
+        submit.append(time.perf_counter_ns() - start)
+        draw_frames(canvas, args.frames_per_save, rng, frames_saving)
+        future.result()
+    exports.close()
+
+    print(f"{w}x{h}, {args.strokes} çizgi, {args.saves} kayıt ({', '.join(args.formats)}), {os.cpu_count()} çekirdek")
+    print(f"  {'ölçüm (ms)':<34} {'p50':>8} {'p99':>8} {'en çok':>8}")
+    print(f"  {'senkron imwrite (kare döngüsünde)':<34} {percentiles(sync)}")
+    print(f"  {'kuyruğa ekleme (anlık görüntü)':<34} {percentiles(submit)}")
+    print(f"  {'kare, kayıt yokken':<34} {percentiles(frames_plain)}")
+    print(f"  {'kare, kayıt sürerken':<34} {percentiles(frames_saving)}")
+
+
+if __name__ == "__main__":
+    main()
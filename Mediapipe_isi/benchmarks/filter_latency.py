@@ -0,0 +1,142 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filters import make_filter
+from fixtures import synthetic_stream, load_stream
+from landmarks import LandmarkBuffer, INDEX_TIP
+from replay import LandmarkReplay
+
+# Landmark filtrelerinin gecikme / titreme dengesi. Kayıtlı akışta referans ham ölçümdür;
+# sentetik akışta gürültüsüz yörünge bilindiği için hata da raporlanır.
+
+DEFAULT_FILTERS = 'none,mean5,ema,ema:alpha=0.7,one_euro,one_euro:min_cutoff=0.5,beta=0.02,kalman,kalman:q=10000'
+
+
+def load(args, shape):
+    # (T, H, 21, 3) piksel landmark'ları, kare başına el sayısı, zaman damgaları ve (varsa) gerçek yörünge
+    truth = None
+    if args.landmarks and args.landmarks.endswith('.npz'):
+        points, counts = load_stream(args.landmarks)
+        timestamps = np.arange(len(points)) / args.fps
+    elif args.landmarks:
+        recording = LandmarkReplay(args.landmarks)
+        points, counts = recording.as_stream()
+        timestamps = recording.index['timestamp'] - recording.index['timestamp'][0]
+    else:
+        truth, counts = synthetic_stream(args.hands, seed=args.seed, noise=0.0, repeat=args.repeat)
+        points = truth.copy()
+        timestamps = np.arange(len(points)) / args.fps
+    buffer = LandmarkBuffer(points.shape[1])
+    to_pixels = lambda stream: np.stack([buffer.update_normalized(frame, shape).copy() for frame in stream])
+    points = to_pixels(points)
+    if truth is not None:
+        truth = to_pixels(truth)
+        rng = np.random.default_rng(args.seed + 1)
+        points[..., :2] += rng.normal(0, args.noise, points[..., :2].shape).astype(np.float32)
+    return points, counts, timestamps, truth
+
+
+def run_filter(spec, points, counts, timestamps):
+    # Akışı kare kare filtreler; (çıktılar, güncelleme başına µs)
+    # mean5: eski yöntem, son 5 konumun ortalaması
+    output = np.zeros_like(points)
+    landmark_filter = None if spec == 'mean5' else make_filter(spec, points.shape[1])
+    elapsed = 0
+    for k in range(len(points)):
+        n = int(counts[k])
+        start = time.perf_counter_ns()
+        if landmark_filter is None:
+            output[k, :n] = points[max(0, k - 4):k + 1, :n].mean(axis=0)
+        else:
+            output[k, :n] = landmark_filter.update(points[k, :n], None, float(timestamps[k]))
+        elapsed += time.perf_counter_ns() - start
+    return output, elapsed / len(points) / 1e3
+
+
+def jitter(series, valid):
+    # İkinci farkın RMS'i (piksel / kare²): ham gürültü ve titreme bunu büyütür.
+    # Sentetik akışta gerçek yörüngeden sapma verilir; hareketin kendi ivmesi sayılmaz
+    accel = series[2:] - 2 * series[1:-1] + series[:-2]
+    ok = valid[2:] & valid[1:-1] & valid[:-2]
+    return float(np.sqrt((accel[ok] ** 2).sum(axis=-1).mean()))
+
+
+def lag(output, reference, valid, max_shift=10.0, step=0.1):
+    # Çıktının referansın gecikmiş haline en iyi oturduğu kayma (kare, alt kare çözünürlüklü, doğrusal ara değerleme)
+    best, best_err = 0.0, np.inf
+    for shift in np.arange(0.0, max_shift + step / 2, step):
+        whole = int(shift)
+        frac = shift - whole
+        start = whole + 1
+        if start >= len(reference):
+            break
+        # delayed[t] = reference[t - shift]
+        delayed = reference[start - whole:len(reference) - whole] * (1 - frac) + reference[:len(reference) - start] * frac
+        mask = valid[start:] & valid[1:len(valid) - whole] & valid[:len(valid) - start]
+        err = ((output[start:][mask] - delayed[mask]) ** 2).sum(axis=-1).mean()
+        if err < best_err:
+            best, best_err = shift, err
+    return best
+
+
+def steady_frames(truth, valid, threshold=2.0, settle=10):
+    # Jest değişiminde parmak pozu bir karede sıçrar; titreme/hata bu sıçramalardan uzak karelerde ölçülür
+    accel = np.zeros(len(truth))
+    accel[1:-1] = np.hypot(*(truth[2:] - 2 * truth[1:-1] + truth[:-2]).T)
+    jumps = np.flatnonzero(accel > threshold)
+    steady = valid.copy()
+    for k in jumps.tolist():
+        steady[max(0, k - 1):k + settle] = False
+    return steady
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Landmark filtresi gecikme / titreme benchmark'ı")
+    parser.add_argument('--landmarks', help="Kaydedilmiş akış (.npz veya deneme.py --record kaydı)")
+    parser.add_argument('--filters', default=DEFAULT_FILTERS,
+                        help="Virgülle ayrılmış filtreler; parametreler ':' sonrası (ör. kalman:q=5000)")
+    parser.add_argument('--landmark', type=int, default=INDEX_TIP, help="Ölçülen landmark (varsayılan işaret parmağı ucu)")
+    parser.add_argument('--hands', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--noise', type=float, default=2.0, help="Sentetik akışa eklenen gürültü (piksel)")
+    parser.add_argument('--fps', type=float, default=30.0, help="Zaman damgası olmayan akışlar için")
+    parser.add_argument('--size', default='1280x720')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    w, h = (int(v) for v in args.size.split('x'))
+    points, counts, timestamps, truth = load(args, (h, w, 3))
+    valid = counts > 0
+    # Filtre parametreleri de virgül içerdiğinden ad ile başlayan parçalar yeni filtre sayılır
+    specs = []
+    for part in args.filters.split(','):
+        if specs and '=' in part and ':' not in part:
+            specs[-1] += ',' + part
+        else:
+            specs.append(part)
+
+    frame_ms = float(np.median(np.diff(timestamps))) * 1e3 if len(timestamps) > 1 else 1e3 / args.fps
+    # Ölçüt: ilk elin seçilen landmark'ı (x, y)
+    reference = (truth if truth is not None else points)[:, 0, args.landmark, :2]
+    steady = steady_frames(reference, valid) if truth is not None else valid
+    print(f"{len(points)} kare, {'sentetik (gürültü ' + str(args.noise) + ' px)' if truth is not None else args.landmarks}")
+    header = f"  {'filtre':<36} {'titreme px':>10} {'gecikme ms':>10} {'µs/kare':>8}"
+    print(header + (f" {'hata px':>8}" if truth is not None else ''))
+    for spec in specs:
+        output, us = run_filter(spec, points, counts, timestamps)
+        tip = output[:, 0, args.landmark, :2]
+        shake = jitter(tip - reference if truth is not None else tip, steady)
+        line = f"  {spec:<36} {shake:10.2f} {lag(tip, reference, valid) * frame_ms:10.1f} {us:8.1f}"
+        if truth is not None:
+            line += f" {float(np.sqrt(((tip - reference)[steady] ** 2).sum(axis=-1).mean())):8.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import numpy as np
+
+# Sentetik landmark akışları: kamera ve model olmadan tekrarlanabilir ölçüm için
+
+# Jest -> açık parmaklar [başparmak, işaret, orta, yüzük, serçe]
+GESTURE_FINGERS = {
+    'draw': (0, 1, 0, 0, 0),
+    'erase': (0, 1, 1, 0, 0),
+    'color_change': (0, 1, 1, 1, 0),
+    'clear_canvas': (1, 1, 1, 1, 1),
+    'fist': (0, 0, 0, 0, 0),
+    'peace': (0, 1, 1, 0, 0),
+    'thumb': (1, 0, 0, 0, 0),
+    'pinky': (0, 0, 0, 0, 1),
+}
+
+# Çizim ağırlıklı gerçekçi bir oturum sırası (jest, kare sayısı)
+DEFAULT_SCRIPT = (
+    ('draw', 90), ('fist', 15), ('draw', 60), ('erase', 30), ('draw', 45),
+    ('color_change', 20), ('draw', 60), ('fist', 20), ('clear_canvas', 10), ('draw', 50),
+)
+
+# Parmak tabanlarının (MCP) bilek göre konumu, normalize el boyu biriminde
+_FINGER_BASE_X = (-0.35, -0.18, 0.0, 0.16, 0.3)
+
+
+def hand_pose(center, scale, fingers):
+    # Normalize (21, 3) landmark dizisi; center: bileğin (x, y) konumu
+    points = np.zeros((21, 3), dtype=np.float32)
+    cx, cy = center
+    points[0] = (cx, cy, 0)
+    for f, extended in enumerate(fingers):
+        base = 1 + 4 * f
+        bx = cx + _FINGER_BASE_X[f] * scale
+        by = cy - (0.45 if f else 0.2) * scale
+        for j in range(4):
+            if f == 0:
+                # Başparmak yana doğru açılır veya avuca kıvrılır
+                dx = (0.12 if extended else -0.08) * (j + 1) * scale
+                points[base + j] = (bx + dx, by - 0.06 * j * scale, -0.01 * j)
+            elif extended:
+                points[base + j] = (bx, by - 0.18 * j * scale, -0.01 * j)
+            else:
+                # Kıvrık parmak: uç, orta eklemin altına iner
+                offsets = (0.0, -0.12, -0.04, 0.06)
+                points[base + j] = (bx, by + offsets[j] * scale, -0.02 * j)
+    return points
+
+
+def synthetic_stream(num_hands=1, script=DEFAULT_SCRIPT, seed=0, noise=0.002, repeat=1):
+    # (kareler, eller, 21, 3) normalize landmark'lar ve her karedeki el sayısı
+    rng = np.random.default_rng(seed)
+    poses = []
+    t = 0
+    for _ in range(repeat):
+        for gesture, frames in script:
+            for _ in range(frames):
+                hands = []
+                for hand in range(num_hands):
+                    # Her el ekranda farklı bir Lissajous eğrisi çizer
+                    phase = hand * 1.7
+                    center = (0.3 + 0.4 * hand / max(num_hands - 1, 1) + 0.12 * np.sin(t / 23 + phase),
+                              0.75 + 0.08 * np.cos(t / 17 + phase))
+                    pose = hand_pose(center, 0.22, GESTURE_FINGERS[gesture])
+                    pose[:, :2] += rng.normal(0, noise, (21, 2))
+                    hands.append(pose)
+                poses.append(hands)
+                t += 1
+    points = np.asarray(poses, dtype=np.float32)
+    counts = np.full(len(points), num_hands, dtype=np.int32)
+    return points, counts
+
+
+def save_stream(path, points, counts):
+    np.savez_compressed(path, points=points, counts=counts)
+
+
+def load_stream(path):
+    data = np.load(path)
+    return data['points'].astype(np.float32), data['counts'].astype(np.int32)
+
+
+def synthetic_frames(shape, count=4, seed=0):
+    # Kamera görüntüsü yerine kullanılan dokulu kareler (sabit içerik, tekrarlanabilir)
+    rng = np.random.default_rng(seed)
+    h, w = shape[:2]
+    frames = []
+    for _ in range(count):
+        base = rng.integers(40, 200, (h // 8, w // 8, 3), dtype=np.uint8)
+        frames.append(np.ascontiguousarray(np.repeat(np.repeat(base, 8, axis=0), 8, axis=1)))
+    return frames
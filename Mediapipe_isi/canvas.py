@@ -0,0 +1,439 @@
+import threading
+
+import cv2
+import numpy as np
+
+from brush import NOMINAL_DT, StrokeBatch, draw_dots, sample_segments, speed_width
+from history import CanvasHistory, TileSnapshot
+from strokes import StrokeStore, LINE, DOTS
+
+# Geçmiş ve tembel temizleme için karo boyu (piksel)
+TILE = 64
+# Depo, kullanılmayan noktalar hem bu sayıyı hem de kullanılan nokta sayısını aşınca sıkıştırılır
+COMPACT_MIN_POINTS = 4096
+
+
+class DrawingCanvas:
+    # Çizim katmanı: self.image önceden çarpılmış (premultiplied) renk, self.mask alfa kaplamasıdır;
+    # kenar yumuşatmalı çizgiler kareye "kare * (1 - alfa) + renk" olarak birleştirilir.
+    # Asıl veri vektör çizgilerdir (self.strokes); self.image onların raster önbelleğidir.
+    # Noktalar Catmull-Rom eğrisiyle birleştirilir; bir parça sonraki nokta gelince kesinleşir ve
+    # kesinleşen parçalar flush'ta (karede bir kez) toplu çizilir. Son parça sadece ekranda önizlenir.
+    # Raster TILE x TILE karolara bölünür: geri al/yinele sadece değişen karoları saklar,
+    # temizleme ise nesil (generation) numarasını artırır; eski karolar ilk okunduklarında sıfırlanır.
+    # antialias=False: keskin kenarlı çizim; alfa ikili kalır ve birleştirme maskeli kopyadır (daha hızlı)
+    def __init__(self, shape, history_bytes=64 << 20, antialias=True):
+        h, w = shape[:2]
+        self.height, self.width = h, w
+        self.antialias = antialias
+        self.strokes = StrokeStore((w, h))
+        self.strokes.line_type = cv2.LINE_AA if antialias else cv2.LINE_8
+        # Piksel -> çizgi deposu koordinat ölçeği (boyut değişince 1'den farklı olur)
+        self.store_scale = (1.0, 1.0)
+        # Her anahtarın açık çizgisindeki son piksel noktası ve zaman damgası (hıza bağlı kalınlık için)
+        self.last_points = {}
+        self.last_times = {}
+        self.batch = StrokeBatch(self.strokes.line_type)
+        # Silgisi açık olan anahtarlar (silme adımı bitene kadar geçmiş adımı açık kalır)
+        self.erasing = set()
+        self.image = np.zeros((h, w, 3), dtype=np.uint8)
+        self.mask = np.zeros((h, w), dtype=np.uint8)
+        # 255 - alfa, 3 kanal; birleştirmede her karede yeniden hesaplanmaz, kirli bölgelerde güncellenir
+        self.inverse = np.full((h, w, 3), 255, dtype=np.uint8) if antialias else None
+        self.dirty_rects = []
+        # Mürekkep bulunan bölgenin sınırları (x0, y0, x1, y1), boşsa None
+        self.ink_rect = None
+        self.generation = 0
+        self._next_generation = 1
+        self.tile_gen = np.zeros((-(-h // TILE), -(-w // TILE)), dtype=np.int64)
+        self.history = CanvasHistory(self, history_bytes)
+        # Her değişiklikte artar (otomatik kaydetme değişmeyen tuvali yeniden yazmaz)
+        self.version = 0
+        # Dışa aktarılmakta olan anlık görüntüler; karolar değişmeden önce onlara kopyalanır
+        self.snapshots = []
+        self.snapshot_lock = threading.Lock()
+        # Depo sıkıştırılınca çizgi indekslerini tutan kullanıcılar için: fn(stroke_map), eski -> yeni, atılan -1
+        self.compact_listeners = []
+
+    @property
+    def shape(self):
+        return self.image.shape
+
+    def line(self, p1, p2, color, thickness, key=0, timestamp=None):
+        # key: çizen el; her el kendi açık çizgisini sürdürür. Nokta kaydedilir, çizim flush'ta yapılır.
+        # Kalınlık hızla azalır; timestamp (saniye) yoksa noktalar arası NOMINAL_DT kabul edilir
+        stroke = self.strokes.current(key)
+        if (stroke is None or stroke.kind != LINE or stroke.color != tuple(color)
+                or self.last_points.get(key) != tuple(p1)):
+            self.erasing.discard(key)
+            self._begin(key, color, LINE)
+            self._add(key, p1, thickness)
+            stroke = self.strokes.current(key)
+            self.last_times[key] = timestamp
+        last_time = self.last_times.get(key)
+        dt = timestamp - last_time if timestamp is not None and last_time is not None else NOMINAL_DT
+        prev_width = stroke.points[stroke.count - 1, 2] / min(self.store_scale)
+        width = speed_width(thickness, prev_width, np.hypot(p2[0] - p1[0], p2[1] - p1[1]), dt)
+        self._add(key, p2, width)
+        self.last_points[key] = tuple(p2)
+        self.last_times[key] = timestamp
+
+    def circle(self, center, radius, color, thickness=-1, key=0):
+        # Dolu daireler aynı el için tek DOTS çizgisinde birikir
+        pad = radius + max(thickness, 0) // 2 + 2
+        rect = self._prepare(center[0] - pad, center[1] - pad, center[0] + pad + 1, center[1] + pad + 1)
+        stroke = self.strokes.current(key)
+        if stroke is None or stroke.kind != DOTS or stroke.color != tuple(color):
+            self._begin(key, color, DOTS)
+        self._add(key, center, radius)
+        draw_dots(self.image, self.mask, np.array([(center[0], center[1], radius)], dtype=np.float32), color,
+                  line_type=self.strokes.line_type)
+        if rect is not None:
+            self.dirty_rects.append(rect)
+
+    def erase(self, center, radius, key=0):
+        # Nesne silgisi: sadece daireye değen çizgi parçaları kaldırılır, çizgiler bölünür;
+        # altta kalan çizimler korunur. Etkilenen bölge vektörlerden yeniden çizilir.
+        self.end_stroke_only(key)
+        self.erasing.add(key)
+        sx, sy = self.store_scale
+        killed = self.strokes.erase(center[0] * sx, center[1] * sy, radius * min(sx, sy))
+        if not len(killed):
+            return 0
+        x0, y0, x1, y1 = self.strokes.segment_bounds(killed)
+        rect = self._prepare(int(x0 / sx) - 1, int(y0 / sy) - 1, int(x1 / sx) + 2, int(y1 / sy) + 2)
+        self.history.add_segments(killed)
+        if rect is not None:
+            self.redraw(rect)
+        return len(killed)
+
+    def remove_stroke(self, index):
+        # Seçilen çizgiyi geri alınabilir şekilde kaldırır
+        killed = self.strokes.remove_stroke(index)
+        if not len(killed):
+            return
+        sx, sy = self.store_scale
+        x0, y0, x1, y1 = self.strokes.segment_bounds(killed)
+        rect = self._prepare(int(x0 / sx) - 1, int(y0 / sy) - 1, int(x1 / sx) + 2, int(y1 / sy) + 2)
+        self.history.add_segments(killed)
+        if rect is not None:
+            self.redraw(rect)
+        self.history.commit()
+        self.collect()
+
+    def collect(self):
+        # Geçmişten adım atıldıysa artık geri getirilemeyen çizgiler (gizli veya tamamen silinmiş, hiçbir adımın
+        # başvurmadığı) depodan ve ızgaradan atılır. Geçmiş adımı bittikten sonra çağrılır (bekleyen indeks yokken).
+        # Kullanılmayan kısım kullanılanı aşınca sıkıştırılır: bellek en fazla iki katı kalır, maliyet paylaştırılır.
+        # Sıkıştırma yapıldıysa çizgi eşlemesini döner
+        if not self.history.dropped:
+            return None
+        self.history.dropped = False
+        strokes, segments = self.history.references()
+        keep = self.strokes.in_use(strokes, segments)
+        used = int(self.strokes.lengths[:self.strokes.count][keep].sum())
+        unused = self.strokes.num_points - used
+        if unused < max(COMPACT_MIN_POINTS, used):
+            # Kullanılmayanlar sadece adım atılınca artar; bir sonraki atılışta yeniden sayılır
+            return None
+        stroke_map, point_map = self.strokes.compact(keep)
+        self.history.remap(stroke_map, point_map)
+        for listener in self.compact_listeners:
+            listener(stroke_map)
+        return stroke_map
+
+    def stroke_at(self, point, tolerance=4):
+        # Piksel noktasındaki en üstteki çizginin indeksi (ızgara sorgusu, çizgi sayısından bağımsız)
+        sx, sy = self.store_scale
+        return self.strokes.stroke_at(point[0] * sx, point[1] * sy, tolerance * min(sx, sy))
+
+    def redraw(self, rect):
+        # Bölgeyi sıfırlayıp o bölgeye değen çizgileri yeniden çizer
+        x0, y0, x1, y1 = rect
+        self.image[y0:y1, x0:x1] = 0
+        self.mask[y0:y1, x0:x1] = 0
+        self.strokes.render(self.image, self.mask, rect=rect)
+        self.dirty_rects.append(rect)
+
+    def _clip(self, x0, y0, x1, y1):
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x0 < x1 and y0 < y1:
+            return (x0, y0, x1, y1)
+        return None
+
+    def _prepare(self, x0, y0, x1, y1):
+        # Çizimden önce: eski nesilden kalan karolar sıfırlanır, geçmiş için önceki içerik saklanır
+        rect = self._clip(x0, y0, x1, y1)
+        if rect is not None:
+            r0, r1, c0, c1 = self._tile_range(rect)
+            self.version += 1
+            self.preserve_tiles(r0, r1, c0, c1)
+            self._materialize(r0, r1, c0, c1)
+            self.history.touch(r0, r1, c0, c1)
+        return rect
+
+    def _tile_range(self, rect):
+        x0, y0, x1, y1 = rect
+        return y0 // TILE, -(-y1 // TILE), x0 // TILE, -(-x1 // TILE)
+
+    def _materialize(self, r0, r1, c0, c1):
+        stale = self.tile_gen[r0:r1, c0:c1] != self.generation
+        if not stale.any():
+            return
+        for r, c in np.argwhere(stale).tolist():
+            r += r0
+            c += c0
+            tile = self.tile_view(r, c)
+            self.history.save_cleared(r, c, int(self.tile_gen[r, c]), tile)
+            self.preserve_tiles(r, r + 1, c, c + 1)
+            for view in tile:
+                view[:] = 0
+            self.tile_gen[r, c] = self.generation
+            self.mark_tile_dirty(r, c)
+
+    def preserve_tiles(self, r0, r1, c0, c1):
+        # Karolar yazılmadan önce çağrılır; açık anlık görüntü yoksa maliyeti yok
+        if not self.snapshots:
+            return
+        with self.snapshot_lock:
+            for snapshot in self.snapshots:
+                snapshot.preserve(r0, r1, c0, c1)
+
+    def snapshot(self):
+        # Dışa aktarım için yazarken-kopyala anlık görüntü (raster + vektör); ana thread bekletilmez.
+        # İşi biten kullanıcı release() çağırmalıdır
+        self.flush()
+        snapshot = TileSnapshot(self, TILE)
+        with self.snapshot_lock:
+            self.snapshots.append(snapshot)
+        return snapshot
+
+    def release_snapshot(self, snapshot):
+        with self.snapshot_lock:
+            if snapshot in self.snapshots:
+                self.snapshots.remove(snapshot)
+
+    def tile_view(self, r, c):
+        # Karonun renk ve alfa görünümleri
+        rows, cols = slice(r * TILE, (r + 1) * TILE), slice(c * TILE, (c + 1) * TILE)
+        return self.image[rows, cols], self.mask[rows, cols]
+
+    def mark_tile_dirty(self, r, c):
+        self.mark_dirty(c * TILE, r * TILE, (c + 1) * TILE, (r + 1) * TILE)
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        rect = self._clip(x0, y0, x1, y1)
+        if rect is not None:
+            self.dirty_rects.append(rect)
+
+    def _begin(self, key, color, kind):
+        self.history.add_stroke(self._finish(key))
+        self.strokes.begin(key, color, kind)
+
+    def _finish(self, key):
+        # Açık çizginin kalan parçaları (son nokta uç kabul edilerek) çizilir, çizgi depoya taşınır
+        stroke = self.strokes.current(key)
+        if stroke is not None and stroke.kind == LINE:
+            self._queue(stroke, stroke.count - 1)
+            self._draw_batch()
+        return self.strokes.end(key)
+
+    def _queue(self, stroke, last):
+        # drawn + 1 .. last parçalarının eğrileri bu karenin toplu çizimine eklenir
+        if last <= stroke.drawn:
+            return
+        if self.batch.needs_flush(stroke.color):
+            self._draw_batch()
+        sx, sy = self.store_scale
+        points = stroke.points[:stroke.count]
+        for xy, widths in sample_segments(points, np.arange(stroke.drawn + 1, last + 1), 1 / sx, 1 / sy):
+            self.batch.add(xy, widths, stroke.color)
+        stroke.drawn = last
+
+    def _draw_batch(self):
+        # Toplu çizim: önce dokunulacak karolar hazırlanır (tembel temizleme + geçmiş), sonra
+        # (renk, kalınlık) grubu başına renk ve alfaya birer polylines çağrısı
+        batch = self.batch
+        if not len(batch):
+            return
+        for x0, y0, x1, y1 in batch.bounds:
+            rect = self._prepare(int(np.floor(x0)), int(np.floor(y0)), int(np.ceil(x1)) + 1, int(np.ceil(y1)) + 1)
+            if rect is not None:
+                self.dirty_rects.append(rect)
+        batch.draw(self.image, self.mask)
+        batch.clear()
+
+    def _add(self, key, point, width):
+        sx, sy = self.store_scale
+        if sx == 1.0 and sy == 1.0:
+            self.strokes.add(key, point, width)
+        else:
+            self.strokes.add(key, (point[0] * sx, point[1] * sy), width * min(sx, sy))
+
+    def end_stroke_only(self, key):
+        # Anahtarın açık çizgisini kapatır, geçmiş adımı açık kalır
+        self.last_points.pop(key, None)
+        self.last_times.pop(key, None)
+        index = self._finish(key)
+        self.history.add_stroke(index)
+        return index
+
+    def end_stroke(self, key=0):
+        index = self.end_stroke_only(key)
+        self.erasing.discard(key)
+        if not self.strokes.open and not self.erasing:
+            # Açık çizgi/silgi kalmadı: bu adım geçmişe yazılır
+            self.history.commit()
+            stroke_map = self.collect()
+            if stroke_map is not None and index is not None:
+                index = int(stroke_map[index])
+        return index
+
+    def end_strokes(self):
+        for key in list(self.strokes.open):
+            self.end_stroke_only(key)
+        self.erasing.clear()
+        self.history.commit()
+        self.collect()
+
+    def clear(self):
+        # O(1): nesil numarası artar, karolar ilk okunduklarında sıfırlanır (yeniden bellek ayrılmaz)
+        self.end_strokes()
+        # Bekleyen kirli bölgeler işlenir: geri alınınca dokunulmamış karolar alfa önbelleğiyle tutarlı kalır
+        self.flush()
+        hidden = self.strokes.visible_strokes()
+        if self.ink_rect is None and not len(hidden):
+            return
+        self.version += 1
+        self.strokes.set_visible(hidden, False)
+        prev_gen = self.generation
+        self.generation = self._next_generation
+        self._next_generation += 1
+        self.history.record_clear(prev_gen, self.generation, self.ink_rect, hidden)
+        self.ink_rect = None
+        self.dirty_rects.clear()
+        self.collect()
+
+    def undo(self):
+        self.end_strokes()
+        self.version += 1
+        done = self.history.undo()
+        self.collect()
+        return done
+
+    def redo(self):
+        self.end_strokes()
+        self.version += 1
+        done = self.history.redo()
+        self.collect()
+        return done
+
+    def undo_clear(self, entry):
+        # Saklanan karolar geri yazılır; hiç dokunulmamış karolar zaten eski içeriği taşır
+        for (r, c), tile in entry.tiles.items():
+            self.preserve_tiles(r, r + 1, c, c + 1)
+            for view, saved in zip(self.tile_view(r, c), tile):
+                np.copyto(view, saved)
+            self.tile_gen[r, c] = entry.prev_gen
+            self.mark_tile_dirty(r, c)
+        self.generation = entry.prev_gen
+        self.strokes.set_visible(entry.strokes, True)
+        self._extend_ink(entry.ink_rect)
+
+    def redo_clear(self, entry):
+        self.flush()
+        self.generation = entry.gen
+        self.strokes.set_visible(entry.strokes, False)
+        self.ink_rect = None
+        self.dirty_rects.clear()
+
+    def resize(self, shape):
+        # Pencere/kaynak boyutu değişince raster vektörlerden yeni boyutta üretilir, kalite kaybı olmaz.
+        # Karo düzeni değiştiği için geçmiş sıfırlanır.
+        h, w = shape[:2]
+        if (h, w) == (self.height, self.width):
+            return
+        self.end_strokes()
+        # Açık anlık görüntüler eski tamponları tutar (artık değişmezler), yeni karolarla ilişkileri kesilir
+        with self.snapshot_lock:
+            self.snapshots = []
+        self.version += 1
+        self.height, self.width = h, w
+        self.store_scale = (self.strokes.size[0] / w, self.strokes.size[1] / h)
+        self.image, self.mask = self.strokes.rasterize((h, w), with_alpha=True)
+        if self.antialias:
+            self.inverse = np.empty((h, w, 3), dtype=np.uint8)
+        self.tile_gen = np.full((-(-h // TILE), -(-w // TILE)), self.generation, dtype=np.int64)
+        self.history.reset()
+        self.collect()
+        self.ink_rect = None
+        self.dirty_rects = [(0, 0, w, h)]
+
+    def raster(self):
+        # Tüm görüntüyü okuyacak kullanıcılar için: kesinleşen parçalar çizilir, bekleyen tembel temizlemeler uygulanır
+        self.flush()
+        self._materialize(0, self.tile_gen.shape[0], 0, self.tile_gen.shape[1])
+        return self.image
+
+    def render(self, scale=1.0):
+        # Yüksek çözünürlüklü dışa aktarım: raster önbellekten bağımsız, vektörlerden çizilir
+        if scale == 1.0:
+            return self.raster().copy()
+        return self.strokes.rasterize((int(round(self.height * scale)), int(round(self.width * scale))))
+
+    def _extend_ink(self, rect):
+        if rect is None:
+            return
+        if self.ink_rect is None:
+            self.ink_rect = rect
+        else:
+            ix0, iy0, ix1, iy1 = self.ink_rect
+            self.ink_rect = (min(ix0, rect[0]), min(iy0, rect[1]), max(ix1, rect[2]), max(iy1, rect[3]))
+
+    def flush(self):
+        # Karede bir kez: açık çizgilerin kesinleşen parçaları toplu çizilir, mürekkep kutusu genişletilir
+        for stroke in self.strokes.open.values():
+            if stroke.kind == LINE:
+                self._queue(stroke, stroke.count - 2)
+        self._draw_batch()
+        if not self.dirty_rects:
+            return
+        for rect in self.dirty_rects:
+            self._extend_ink(rect)
+        # Mürekkep kutusu içinde kalan eski nesil karolar okunmadan önce sıfırlanır (sıfırlananlar kirli işaretlenir)
+        self._materialize(*self._tile_range(self.ink_rect))
+        if self.antialias:
+            for x0, y0, x1, y1 in self.dirty_rects:
+                cv2.cvtColor(cv2.bitwise_not(self.mask[y0:y1, x0:x1]), cv2.COLOR_GRAY2BGR,
+                             dst=self.inverse[y0:y1, x0:x1])
+        self.dirty_rects.clear()
+
+    def draw_preview(self, image):
+        # Henüz kesinleşmemiş son parçalar (çizgi şimdi bitse çizilecek eğri) doğrudan görüntüye çizilir
+        preview = None
+        sx, sy = self.store_scale
+        for stroke in self.strokes.open.values():
+            if stroke.kind != LINE or stroke.count - 1 <= stroke.drawn:
+                continue
+            if preview is None:
+                preview = StrokeBatch(self.strokes.line_type)
+            points = stroke.points[:stroke.count]
+            for xy, widths in sample_segments(points, np.arange(stroke.drawn + 1, stroke.count), 1 / sx, 1 / sy):
+                preview.add(xy, widths, stroke.color)
+        if preview is not None:
+            preview.draw(image)
+        return image
+
+    def compose(self, image):
+        # Önceden çarpılmış alfa birleştirme yerinde yapılır, sadece mürekkepli bölge işlenir
+        self.flush()
+        if self.ink_rect is not None:
+            x0, y0, x1, y1 = self.ink_rect
+            roi = image[y0:y1, x0:x1]
+            if self.antialias:
+                cv2.multiply(roi, self.inverse[y0:y1, x0:x1], dst=roi, scale=1 / 255)
+                cv2.add(roi, self.image[y0:y1, x0:x1], dst=roi)
+            else:
+                cv2.copyTo(self.image[y0:y1, x0:x1], self.mask[y0:y1, x0:x1], roi)
+        return self.draw_preview(image)
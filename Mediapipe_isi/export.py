@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from strokes import DOTS
+
+# Kaydetme/dışa aktarma arka plan thread'inde: ana thread sadece yazarken-kopyala anlık görüntü alır
+# (DrawingCanvas.snapshot), kodlama ve disk yazımı kare döngüsünü bekletmez.
+
+FORMATS = ('png', 'webp', 'svg', 'json')
+
+
+def parse_formats(spec):
+    # "png,svg" -> ('png', 'svg'); argparse type= olarak kullanılır
+    formats = tuple(f.strip().lower() for f in spec.split(',') if f.strip())
+    if not formats:
+        raise argparse.ArgumentTypeError(f"En az bir biçim gerekli (seçenekler: {', '.join(FORMATS)})")
+    for name in formats:
+        if name not in FORMATS:
+            raise argparse.ArgumentTypeError(f"Bilinmeyen biçim: {name} (seçenekler: {', '.join(FORMATS)})")
+    return formats
+
+
+def _hex(color):
+    b, g, r = (int(v) for v in color)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _visible_items(store):
+    # (noktalar, BGR renk, tür, çizilecek parça indeksleri): görünür çizgiler ve açık çizgilerin kesinleşen kısmı.
+    # Metin üretimi saf Python'dur: her çizgiden sonra GIL bırakılır, ana thread 5 ms'lik geçiş aralığını beklemez
+    for i in store.visible_strokes().tolist():
+        points = store.stroke(i)
+        start = store.starts[i]
+        ends = np.flatnonzero(store.alive[start:start + len(points)])
+        yield points, store.colors[i].tolist(), int(store.kinds[i]), ends
+        time.sleep(0)
+    for stroke in store.open.values():
+        points = stroke.points[:stroke.count]
+        ends = np.arange(stroke.count) if stroke.kind == DOTS else np.arange(1, stroke.drawn + 1)
+        yield points, list(stroke.color), stroke.kind, ends
+
+
+def strokes_to_svg(store, scale=1.0):
+    # Çizgiler rasterdeki eğrinin aynısıdır: Catmull-Rom parçası, kontrol noktaları b + (c - a) / 6 ve
+    # c - (d - b) / 6 olan kübik Bezier'dir. Kalınlığı aynı olan ardışık parçalar tek <path> olur.
+    w, h = store.size
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{round(w * scale)}" height="{round(h * scale)}" '
+             f'viewBox="0 0 {w} {h}" fill="none" stroke-linecap="round" stroke-linejoin="round">']
+    for points, color, kind, ends in _visible_items(store):
+        if not len(ends):
+            continue
+        if kind == DOTS:
+            for x, y, r in points[ends].tolist():
+                lines.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r:.1f}" fill="{_hex(color)}"/>')
+            continue
+        n = len(points)
+        a = points[np.maximum(ends - 2, 0)]
+        b = points[ends - 1]
+        c = points[ends]
+        d = points[np.minimum(ends + 1, n - 1)]
+        c1 = b[:, :2] + (c[:, :2] - a[:, :2]) / 6
+        c2 = c[:, :2] - (d[:, :2] - b[:, :2]) / 6
+        widths = np.maximum(1, np.rint((b[:, 2] + c[:, 2]) / 2)).astype(np.int64).tolist()
+        ends = ends.tolist()
+        path = []
+        for k in range(len(ends)):
+            # Silgiyle bölünen yerde veya kalınlık değişince yeni yol
+            if k == 0 or ends[k] != ends[k - 1] + 1 or widths[k] != widths[k - 1]:
+                if path:
+                    lines.append(f'<path d="{" ".join(path)}" stroke="{_hex(color)}" stroke-width="{widths[k - 1]}"/>')
+                path = [f"M{b[k, 0]:.1f},{b[k, 1]:.1f}"]
+            path.append(f"C{c1[k, 0]:.1f},{c1[k, 1]:.1f} {c2[k, 0]:.1f},{c2[k, 1]:.1f} {c[k, 0]:.1f},{c[k, 1]:.1f}")
+        lines.append(f'<path d="{" ".join(path)}" stroke="{_hex(color)}" stroke-width="{widths[-1]}"/>')
+    lines.append('</svg>')
+    return "\n".join(lines)
+
+
+def strokes_to_json(store):
+    # Görünür çizgiler: noktalar (x, y, kalınlık), BGR renk, tür ve silgiyle silinen parça indeksleri.
+    # Çizgiler ayrı ayrı kodlanır (tek büyük json.dumps çağrısı GIL'i boyunca tutardı)
+    strokes = []
+    for points, color, kind, ends in _visible_items(store):
+        first = 0 if kind == DOTS else 1
+        erased = np.setdiff1d(np.arange(first, len(points)), ends)
+        strokes.append(json.dumps({'color': color, 'kind': 'dots' if kind == DOTS else 'line',
+                                   'points': np.round(points.astype(np.float64), 2).tolist(),
+                                   'erased': erased.tolist()}))
+    return f'{{"size": {json.dumps(list(store.size))}, "strokes": [{", ".join(strokes)}]}}'
+
+
+def _write_atomic(path, write):
+    # Önce geçici dosyaya yazılır: yarıda kesilen kayıt eski dosyayı bozmaz
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.tmp{ext}"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _write_text(path, text):
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+    _write_atomic(path, write)
+
+
+def _write_image(path, image, params=()):
+    def write(tmp):
+        if not cv2.imwrite(tmp, image, list(params)):
+            raise OSError(f"Yazılamadı: {path}")
+    _write_atomic(path, write)
+
+
+def write_snapshot(snapshot, base, formats=('png',), scale=1.0):
+    # Anlık görüntüyü istenen biçimlerde yazar; yazılan dosya yollarını döner
+    paths = []
+    try:
+        if 'png' in formats or 'webp' in formats:
+            if scale == 1.0:
+                image = snapshot.read()[0]
+            else:
+                # Yüksek çözünürlük vektörlerden üretilir
+                image = snapshot.strokes.rasterize((int(round(snapshot.height * scale)), int(round(snapshot.width * scale))))
+            if 'png' in formats:
+                paths.append(f"{base}.png")
+                _write_image(paths[-1], image)
+            if 'webp' in formats:
+                # Kalite > 100: kayıpsız WebP
+                paths.append(f"{base}.webp")
+                _write_image(paths[-1], image, (cv2.IMWRITE_WEBP_QUALITY, 101))
+    finally:
+        # Raster okundu (veya vektörden üretildi): karo kopyalamaya gerek kalmadı
+        snapshot.release()
+    if 'svg' in formats:
+        paths.append(f"{base}.svg")
+        _write_text(paths[-1], strokes_to_svg(snapshot.strokes, scale))
+    if 'json' in formats:
+        paths.append(f"{base}.json")
+        _write_text(paths[-1], strokes_to_json(snapshot.strokes))
+    return paths
+
+
+class ExportQueue:
+    # Kayıt işleri tek işçili arka plan thread'inde sırayla yazılır.
+    # autosave_interval (sn) verilirse tick() tuval değiştiyse periyodik olarak aynı dosyanın üzerine yazar;
+    # önceki otomatik kayıt bitmemişse yenisi atlanır (disk yavaşsa işler birikmez).
+    def __init__(self, formats=('png',), scale=1.0, autosave_interval=None, autosave_base='autosave', verbose=True):
+        self.formats = tuple(formats)
+        self.scale = scale
+        self.autosave_interval = autosave_interval
+        self.autosave_base = autosave_base
+        self.verbose = verbose
+        self.saved = 0
+        self.errors = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+        self._pending = []
+        self._autosave = None
+        self._autosave_version = None
+        self._last_autosave = time.monotonic()
+
+    def save(self, canvas, base, texts=None, formats=None, quiet=False):
+        # Anlık görüntü alınır ve kuyruğa eklenir; texts: {yol: metin} ek metin dosyaları
+        snapshot = canvas.snapshot()
+        future = self._executor.submit(self._run, snapshot, base, formats or self.formats, texts or {},
+                                       quiet or not self.verbose)
+        self._pending.append(future)
+        return future
+
+    def _run(self, snapshot, base, formats, texts, quiet):
+        try:
+            paths = write_snapshot(snapshot, base, formats, self.scale)
+            for path, text in texts.items():
+                _write_text(path, text)
+                paths.append(path)
+        except Exception as exc:
+            self.errors += 1
+            print(f"Kaydetme hatası ({base}): {exc}")
+            raise
+        self.saved += 1
+        if not quiet:
+            print(f"Çizim kaydedildi: {', '.join(paths)}")
+        return paths
+
+    def tick(self, canvas, now=None, texts=None):
+        # Karede bir kez çağrılır; çoğu karede sadece zaman karşılaştırmasıdır.
+        # texts: save() ile aynı, veya sadece kayıt zamanı gelince çağrılan fonksiyon
+        self._pending = [future for future in self._pending if not future.done()]
+        if self.autosave_interval is None or canvas is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if now - self._last_autosave < self.autosave_interval:
+            return None
+        self._last_autosave = now
+        if canvas.version == self._autosave_version or (self._autosave is not None and not self._autosave.done()):
+            return None
+        self._autosave_version = canvas.version
+        self._autosave = self.save(canvas, self.autosave_base, texts() if callable(texts) else texts, quiet=True)
+        return self._autosave
+
+    @property
+    def pending(self):
+        return sum(not future.done() for future in self._pending)
+
+    def close(self, wait=True):
+        # Bekleyen kayıtlar tamamlanır (çıkışta çizim kaybolmaz)
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,207 @@
+import argparse
+import inspect
+import math
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS
+
+# Landmark yumuşatma filtreleri: tüm ellerin 21 landmark'ı tek seferde (vektörel) filtrelenir.
+# Durum slot (el) başına önceden ayrılmış dizilerde tutulur; update() seçilen slotları günceller.
+
+
+class LandmarkFilter:
+    # Ortak iskelet: slot başına son zaman damgası ve başlatılma bilgisi.
+    # max_gap saniyeden uzun süre görülmeyen slot sıfırlanır (el kaybolup geri geldiğinde sıçrama olmaz)
+    name = 'none'
+
+    def __init__(self, slots=2, max_gap=0.5, shape=(NUM_LANDMARKS, 3)):
+        self.slots = slots
+        self.max_gap = max_gap
+        self.shape = shape
+        self.value = np.zeros((slots,) + shape, dtype=np.float32)
+        self.last_time = np.zeros(slots, dtype=np.float64)
+        self.initialized = np.zeros(slots, dtype=bool)
+        self.out = np.empty((slots,) + shape, dtype=np.float32)
+
+    def reset(self, slot=None):
+        if slot is None:
+            self.initialized[:] = False
+        else:
+            self.initialized[slot] = False
+
+    def update(self, values, slots=None, timestamp=0.0):
+        # values: (n, 21, 3) ölçümler; slots: her satırın slotu (varsayılan 0..n-1).
+        # Dönüş: (n, 21, 3) filtrelenmiş değerler (her çağrıda üzerine yazılan önceden ayrılmış tampon)
+        n = len(values)
+        out = self.out[:n]
+        if n == 0:
+            return out
+        if slots is None or all(slot == i for i, slot in enumerate(slots)):
+            # Sık durum: slotlar 0..n-1; durum dizileri dilim görünümleriyle yerinde güncellenir
+            sel = slice(0, n)
+        else:
+            sel = np.asarray(slots, dtype=np.int64)
+        gap = timestamp - self.last_time[sel]
+        fresh = ~self.initialized[sel] | (gap > self.max_gap)
+        if fresh.any():
+            rows = np.flatnonzero(fresh)
+            new = rows if isinstance(sel, slice) else sel[rows]
+            self.value[new] = values[rows]
+            self._start(new, values[rows])
+            self.initialized[new] = True
+            if not fresh.all():
+                rows = np.flatnonzero(~fresh)
+                self._step(rows if isinstance(sel, slice) else sel[rows], values[rows], gap[rows])
+        else:
+            self._step(sel, values, gap)
+        self.last_time[sel] = timestamp
+        out[:] = self.value[sel]
+        return out
+
+    def _start(self, sel, values):
+        pass
+
+    def _step(self, sel, values, dt):
+        self.value[sel] = values
+
+
+class EMAFilter(LandmarkFilter):
+    # Üstel hareketli ortalama: alpha büyüdükçe gecikme azalır, titreme artar
+    name = 'ema'
+
+    def __init__(self, slots=2, alpha=0.5, **kwargs):
+        super().__init__(slots, **kwargs)
+        self.alpha = alpha
+
+    def _step(self, sel, values, dt):
+        value = self.value[sel]
+        value += self.alpha * (values - value)
+        self.value[sel] = value
+
+
+def _time_step(gap):
+    # Slot başına geçen süre; hepsi aynıysa (sık durum) skaler, değilse (n, 1, 1) dizi
+    if gap.min() == gap.max():
+        return max(float(gap[0]), 1e-3)
+    return np.maximum(gap, 1e-3).astype(np.float32)[:, None, None]
+
+
+def _smoothing_factor(dt, cutoff):
+    # Birinci dereceden alçak geçiren filtre katsayısı: 1 / (1 + tau / dt), tau = 1 / (2π fc)
+    return 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+
+
+class OneEuroFilter(LandmarkFilter):
+    # One Euro (Casiez vd.): kesim frekansı hızla artar; yavaş harekette titreme, hızlı harekette gecikme az.
+    # min_cutoff (Hz): durağan eldeki yumuşatma; beta: hıza duyarlılık (piksel/sn başına); d_cutoff: türev filtresi
+    name = 'one_euro'
+
+    def __init__(self, slots=2, min_cutoff=1.0, beta=0.05, d_cutoff=1.0, **kwargs):
+        super().__init__(slots, **kwargs)
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.derivative = np.zeros_like(self.value)
+
+    def _start(self, sel, values):
+        self.derivative[sel] = 0
+
+    def _step(self, sel, values, dt):
+        dt = _time_step(dt)
+        value = self.value[sel]
+        derivative = self.derivative[sel]
+        delta = values - value
+        derivative += _smoothing_factor(dt, self.d_cutoff) * (delta / dt - derivative)
+        cutoff = np.abs(derivative)
+        cutoff *= self.beta
+        cutoff += self.min_cutoff
+        delta *= _smoothing_factor(dt, cutoff)
+        value += delta
+        self.value[sel] = value
+        self.derivative[sel] = derivative
+
+
+class KalmanFilter(LandmarkFilter):
+    # Sabit hız modelli Kalman filtresi; her koordinat bağımsız (konum, hız) durumudur.
+    # q: ivme gürültüsü yoğunluğu (piksel²/sn³), r: ölçüm varyansı (piksel²).
+    # 2x2 kovaryans elemanları (p00, p01, p11) ayrı dizilerde, kapalı formda güncellenir
+    name = 'kalman'
+
+    def __init__(self, slots=2, q=50000.0, r=9.0, **kwargs):
+        super().__init__(slots, **kwargs)
+        self.q = q
+        self.r = r
+        self.velocity = np.zeros_like(self.value)
+        self.p00 = np.zeros_like(self.value)
+        self.p01 = np.zeros_like(self.value)
+        self.p11 = np.zeros_like(self.value)
+
+    def _start(self, sel, values):
+        self.velocity[sel] = 0
+        self.p00[sel] = self.r
+        self.p01[sel] = 0
+        # Başlangıç hızı bilinmiyor: ilk ölçümlerde hıza hızla yakınsar
+        self.p11[sel] = 1e6
+
+    def _step(self, sel, values, dt):
+        dt = _time_step(dt)
+        q = self.q
+        x, v = self.value[sel], self.velocity[sel]
+        p00, p01, p11 = self.p00[sel], self.p01[sel], self.p11[sel]
+        # Tahmin
+        x += v * dt
+        p00 += dt * (2 * p01 + dt * p11) + q * dt ** 3 / 3
+        p01 += dt * p11 + q * dt ** 2 / 2
+        p11 += q * dt
+        # Düzeltme
+        gain0 = p00 / (p00 + self.r)
+        gain1 = p01 / (p00 + self.r)
+        residual = values - x
+        x += gain0 * residual
+        v += gain1 * residual
+        p11 -= gain1 * p01
+        p01 *= 1 - gain0
+        p00 *= 1 - gain0
+        self.value[sel], self.velocity[sel] = x, v
+        self.p00[sel], self.p01[sel], self.p11[sel] = p00, p01, p11
+
+
+FILTERS = {cls.name: cls for cls in (LandmarkFilter, EMAFilter, OneEuroFilter, KalmanFilter)}
+
+
+def filter_params(cls):
+    # Komut satırından verilebilen parametreler (alt sınıftan üst sınıfa, kurucu imzalarından)
+    names = {}
+    for klass in cls.__mro__[:-1]:
+        if '__init__' in vars(klass):
+            for param in inspect.signature(klass.__init__).parameters.values():
+                if param.kind == param.POSITIONAL_OR_KEYWORD and param.name not in ('self', 'slots', 'shape'):
+                    names[param.name] = None
+    return list(names)
+
+
+def parse_filter(spec):
+    # "one_euro", "kalman:q=500,r=9" veya "ema:alpha=0.4" -> (ad, parametreler); argparse type= olarak kullanılır
+    name, _, params = spec.partition(':')
+    if name not in FILTERS:
+        raise argparse.ArgumentTypeError(f"Bilinmeyen filtre: {name} (seçenekler: {', '.join(FILTERS)})")
+    allowed = filter_params(FILTERS[name])
+    kwargs = {}
+    for item in filter(None, params.split(',')):
+        key, _, value = item.partition('=')
+        key = key.strip()
+        if key not in allowed:
+            raise argparse.ArgumentTypeError(f"'{name}' filtresinde {key} parametresi yok "
+                                             f"(parametreler: {', '.join(allowed)})")
+        try:
+            kwargs[key] = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"{key} sayı olmalı: {value}") from None
+    return name, kwargs
+
+
+def make_filter(spec, slots=2):
+    # spec: parse_filter biçimi veya (ad, parametreler)
+    name, kwargs = parse_filter(spec) if isinstance(spec, str) else spec
+    return FILTERS[name](slots, **kwargs)
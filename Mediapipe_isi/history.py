@@ -0,0 +1,258 @@
+from collections import deque
+
+import numpy as np
+
+EDIT = 0
+CLEAR = 1
+
+
+class _Entry:
+    # Bir geçmiş adımı: dokunulan karoların önceki içeriği (renk, alfa), eklenen/gizlenen çizgiler ve silinen parçalar.
+    # Geri al/yinele karoları yer değiştirir; aynı kayıt iki yönde de kullanılır.
+    # stroke_bytes: adımın çizgileri gizliyken depoda sadece bu adım için tutulan vektör verisi (nbytes'a dahil)
+    __slots__ = ('kind', 'tiles', 'strokes', 'segments', 'nbytes', 'stroke_bytes', 'prev_gen', 'gen', 'ink_rect')
+
+    def __init__(self, kind, prev_gen=0, gen=0, ink_rect=None, strokes=None):
+        self.kind = kind
+        self.tiles = {}
+        self.strokes = [] if strokes is None else strokes
+        self.segments = []
+        self.nbytes = 0
+        self.stroke_bytes = 0
+        self.prev_gen = prev_gen
+        self.gen = gen
+        self.ink_rect = ink_rect
+
+
+class CanvasHistory:
+    # Karo bazlı yazarken-kopyala (copy-on-write) geri al/yinele.
+    # Bir adım, açık çizgi olduğu sürece yapılan tüm çizimleri kapsar (aynı anda çizen eller tek adım).
+    # Toplam boyut (karo kopyaları, silinen parça listeleri ve gizli çizgilerin vektör verisi) max_bytes'ı aşınca
+    # en eski adımlar atılır. Adım atılınca artık geri getirilemeyen çizgiler tuval tarafından depodan silinir
+    # (dropped bayrağı, DrawingCanvas.collect).
+    def __init__(self, canvas, max_bytes=64 << 20):
+        self.canvas = canvas
+        self.max_bytes = max_bytes
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.nbytes = 0
+        self.current = None
+        # Temizleme adımları, öncesindeki nesil numarasıyla (henüz sıfırlanmamış karolar için)
+        self.clears = {}
+        # Adım atıldı: depoda artık kullanılmayan çizgiler olabilir
+        self.dropped = False
+
+    def touch(self, r0, r1, c0, c1):
+        # Karolar bu adımda ilk kez değişecekse önceki içerikleri saklanır
+        entry = self.current
+        if entry is None:
+            entry = self.current = _Entry(EDIT)
+        tiles = entry.tiles
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                if (r, c) not in tiles:
+                    tile = tuple(view.copy() for view in self.canvas.tile_view(r, c))
+                    tiles[(r, c)] = tile
+                    nbytes = sum(view.nbytes for view in tile)
+                    entry.nbytes += nbytes
+                    self.nbytes += nbytes
+
+    def add_stroke(self, index):
+        if index is None:
+            return
+        if self.current is None:
+            self.current = _Entry(EDIT)
+        self.current.strokes.append(index)
+
+    def add_segments(self, ids):
+        # Silgi ile öldürülen parçalar (geri alınca yeniden canlanır)
+        if self.current is None:
+            self.current = _Entry(EDIT)
+        self.current.segments.append(ids)
+        self.current.nbytes += ids.nbytes
+        self.nbytes += ids.nbytes
+
+    def commit(self):
+        entry = self.current
+        self.current = None
+        if entry is None or not (entry.tiles or entry.strokes or entry.segments):
+            return
+        self._push(entry)
+
+    def record_clear(self, prev_gen, gen, ink_rect, strokes):
+        self.commit()
+        entry = _Entry(CLEAR, prev_gen, gen, ink_rect, list(strokes))
+        self.clears[prev_gen] = entry
+        self._hold(entry, True)
+        self._push(entry)
+
+    def save_cleared(self, r, c, tile_gen, content):
+        # Tembel temizlenen karo ilk kez sıfırlanırken eski içeriği ilgili temizleme adımına yazılır
+        entry = self.clears.get(tile_gen)
+        if entry is None:
+            return
+        tile = tuple(view.copy() for view in content)
+        entry.tiles[(r, c)] = tile
+        nbytes = sum(view.nbytes for view in tile)
+        entry.nbytes += nbytes
+        self.nbytes += nbytes
+        self._evict()
+
+    def _hold(self, entry, hidden):
+        # Adımın çizgileri gizliyse vektör verileri adımın boyutuna sayılır
+        nbytes = self.canvas.strokes.strokes_nbytes(entry.strokes) if hidden else 0
+        delta = nbytes - entry.stroke_bytes
+        entry.stroke_bytes = nbytes
+        entry.nbytes += delta
+        self.nbytes += delta
+
+    def _push(self, entry):
+        self.undo_stack.append(entry)
+        if self.redo_stack:
+            for old in self.redo_stack:
+                self.nbytes -= old.nbytes
+            self.redo_stack.clear()
+            self.dropped = True
+        self._evict()
+
+    def _evict(self):
+        # LRU sınırı: en eski adımlar (en uzun süredir kullanılmayan) önce atılır, son adım korunur
+        while self.nbytes > self.max_bytes and len(self.undo_stack) > 1:
+            old = self.undo_stack.popleft()
+            self.nbytes -= old.nbytes
+            self.dropped = True
+            if old.kind == CLEAR and self.clears.get(old.prev_gen) is old:
+                del self.clears[old.prev_gen]
+
+    def undo(self):
+        self.commit()
+        if not self.undo_stack:
+            return False
+        entry = self.undo_stack.pop()
+        if entry.kind == CLEAR:
+            self.clears.pop(entry.prev_gen, None)
+            self.canvas.undo_clear(entry)
+            self.nbytes -= entry.nbytes
+            entry.tiles.clear()
+            entry.nbytes = 0
+            entry.stroke_bytes = 0
+        else:
+            self._swap(entry)
+            self.canvas.strokes.set_visible(entry.strokes, False)
+            for ids in entry.segments:
+                self.canvas.strokes.set_alive(ids, True)
+            self._hold(entry, True)
+        self.redo_stack.append(entry)
+        return True
+
+    def redo(self):
+        self.commit()
+        if not self.redo_stack:
+            return False
+        entry = self.redo_stack.pop()
+        if entry.kind == CLEAR:
+            self.clears[entry.prev_gen] = entry
+            self.canvas.redo_clear(entry)
+            self._hold(entry, True)
+        else:
+            self._swap(entry)
+            self.canvas.strokes.set_visible(entry.strokes, True)
+            for ids in entry.segments:
+                self.canvas.strokes.set_alive(ids, False)
+            self._hold(entry, False)
+        self.undo_stack.append(entry)
+        self._evict()
+        return True
+
+    def _swap(self, entry):
+        for (r, c), tile in entry.tiles.items():
+            self.canvas.preserve_tiles(r, r + 1, c, c + 1)
+            views = self.canvas.tile_view(r, c)
+            current = tuple(view.copy() for view in views)
+            for view, saved in zip(views, tile):
+                np.copyto(view, saved)
+            entry.tiles[(r, c)] = current
+            self.canvas.mark_tile_dirty(r, c)
+
+    def entries(self):
+        entries = list(self.undo_stack) + self.redo_stack
+        return entries if self.current is None else entries + [self.current]
+
+    def references(self):
+        # Adımların geri getirebileceği çizgiler ve parçalar (depo sıkıştırılırken tutulur)
+        strokes, segments = [], []
+        for entry in self.entries():
+            strokes.extend(entry.strokes)
+            segments.extend(entry.segments)
+        return strokes, np.concatenate(segments) if segments else np.empty(0, dtype=np.int64)
+
+    def remap(self, stroke_map, point_map):
+        # Depo sıkıştırıldı: adımların çizgi ve parça indeksleri yenilenir
+        for entry in self.entries():
+            entry.strokes = stroke_map[np.asarray(entry.strokes, dtype=np.int64)].tolist()
+            entry.segments = [point_map[ids] for ids in entry.segments]
+
+    def reset(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.clears.clear()
+        self.current = None
+        self.nbytes = 0
+        self.dropped = True
+
+
+class TileSnapshot:
+    # Dışa aktarım için karo bazlı yazarken-kopyala anlık görüntü. Oluşturmak sadece karo nesli tablosunun
+    # karşılaştırmasıdır; tuval bir karoyu değiştirmeden önce preserve() ile o anki içeriği buraya kopyalar.
+    # Arka plan thread'i canlı tamponu kilit altında okur, değişmiş karoları saklanan kopyalarla düzeltir.
+    def __init__(self, canvas, tile):
+        self.canvas = canvas
+        self.tile = tile
+        self.lock = canvas.snapshot_lock
+        # Tuval boyutu değişirse yeni tamponlar ayrılır; eskileri değişmeden kalır
+        self.image, self.mask = canvas.image, canvas.mask
+        self.height, self.width = canvas.height, canvas.width
+        self.ink_rect = canvas.ink_rect
+        # Anlık görüntüde geçerli karolar; tembel temizlenmeyi bekleyenler boş sayılır
+        self.valid = canvas.tile_gen == canvas.generation
+        self.saved = {}
+        self.strokes = canvas.strokes.snapshot()
+
+    def preserve(self, r0, r1, c0, c1):
+        # Tuval kilidi tutarken çağırır: karolar ilk kez değişmeden önce kopyalanır
+        for r, c in np.argwhere(self.valid[r0:r1, c0:c1]).tolist():
+            r += r0
+            c += c0
+            if (r, c) not in self.saved:
+                self.saved[(r, c)] = tuple(view.copy() for view in self._views(self.image, self.mask, r, c))
+
+    def _views(self, image, mask, r, c):
+        rows, cols = slice(r * self.tile, (r + 1) * self.tile), slice(c * self.tile, (c + 1) * self.tile)
+        return image[rows, cols], mask[rows, cols]
+
+    def read(self):
+        # (renk, alfa) tam kopya. Mürekkep kutusu kilit altında tek seferde kopyalanır; o ana kadar değişen
+        # karolar zaten saklanmıştır (değişiklik saklamadan sonra başlar) ve sonradan üstüne yazılır
+        image = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        mask = np.zeros((self.height, self.width), dtype=np.uint8)
+        if self.ink_rect is None:
+            return image, mask
+        x0, y0, x1, y1 = self.ink_rect
+        with self.lock:
+            np.copyto(image[y0:y1, x0:x1], self.image[y0:y1, x0:x1])
+            np.copyto(mask[y0:y1, x0:x1], self.mask[y0:y1, x0:x1])
+            saved = list(self.saved.items())
+        for (r, c), tile in saved:
+            for target, view in zip(self._views(image, mask, r, c), tile):
+                np.copyto(target, view)
+        # Anlık görüntüde tembel temizlenmiş (geçersiz) karolar boştur
+        r0, c0 = y0 // self.tile, x0 // self.tile
+        r1, c1 = -(-y1 // self.tile), -(-x1 // self.tile)
+        for r, c in np.argwhere(~self.valid[r0:r1, c0:c1]).tolist():
+            for target in self._views(image, mask, r + r0, c + c0):
+                target[:] = 0
+        return image, mask
+
+    def release(self):
+        self.canvas.release_snapshot(self)
+        self.saved.clear()
@@ -0,0 +1,151 @@
+import cv2
+import threading
+import time
+from collections import deque
+
+from inference import FramePool
+from metrics import DISABLED
+
+
+class LatestFrameQueue:
+    # Sınırlı kuyruk: dolduğunda en eski eleman atılır ("latest frame wins")
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        # Atılan eleman döner (kare tamponu havuza iade edilebilir), yoksa None
+        with self._cond:
+            evicted = None
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+                evicted = self._items.popleft()
+            self._items.append(item)
+            self._cond.notify()
+        return evicted
+
+    def get(self, timeout=None):
+        # Kuyruk kapanmış ve boşsa None döner
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class CaptureThread(threading.Thread):
+    # pool: kare tamponu havuzu (FramePool); kuyruktan atılan kareler havuza döner
+    def __init__(self, cap, output, stop_event, pool, pace_fps=None, metrics=DISABLED):
+        super().__init__(name="capture", daemon=True)
+        self.cap = cap
+        self.metrics = metrics
+        self.output = output
+        self.stop_event = stop_event
+        self.pool = pool
+        # Video dosyası kaynakta kameranın hızını taklit etmek için
+        self.frame_interval = 1.0 / pace_fps if pace_fps else None
+        self.frames_read = 0
+
+    def run(self):
+        next_time = time.perf_counter()
+        while not self.stop_event.is_set():
+            if self.frame_interval is not None:
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                next_time += self.frame_interval
+            with self.metrics.span('capture'):
+                success, image = self.pool.read(self.cap)
+            if not success:
+                break
+            dropped = self.output.put((self.frames_read, time.perf_counter(), image))
+            if dropped is not None:
+                self.pool.release(dropped[2])
+            self.frames_read += 1
+        self.output.close()
+
+
+class InferenceWorker(threading.Thread):
+    def __init__(self, process_fn, input_queue, output, stop_event, pool, metrics=DISABLED):
+        super().__init__(name="inference", daemon=True)
+        self.process_fn = process_fn
+        self.pool = pool
+        self.metrics = metrics
+        self.input = input_queue
+        self.output = output
+        self.stop_event = stop_event
+        self.frames_processed = 0
+
+    def run(self):
+        while not self.stop_event.is_set():
+            item = self.input.get(timeout=0.1)
+            if item is None:
+                if self.input.closed:
+                    break
+                continue
+            index, timestamp, image = item
+            with self.metrics.span('inference'):
+                results = self.process_fn(image)
+            dropped = self.output.put((index, timestamp, image, results))
+            if dropped is not None:
+                self.pool.release(dropped[2])
+            self.frames_processed += 1
+        self.output.close()
+
+
+class FramePipeline:
+    # capture -> inference -> render, aşamalar arası sınırlı kuyruklar.
+    # mirror: kare render aşamasında yerinde aynalanır; model aynalanmamış kareyi görür
+    # (landmark'ları arka uç çevirir, AdvancedHandDrawing.set_mirror)
+    def __init__(self, cap, process_fn, queue_size=1, mirror=True, pace_fps=None, metrics=DISABLED):
+        self.stop_event = threading.Event()
+        self.capture_queue = LatestFrameQueue(queue_size)
+        self.render_queue = LatestFrameQueue(queue_size)
+        self.mirror = mirror
+        # Kareler aşamalar arasında tampon havuzundan dolaşır: iki kuyruk + okunan, çıkarımdaki ve çizilen kare
+        self.pool = FramePool(2 * queue_size + 3)
+        self.capture = CaptureThread(cap, self.capture_queue, self.stop_event, self.pool, pace_fps, metrics)
+        self.inference = InferenceWorker(process_fn, self.capture_queue, self.render_queue, self.stop_event,
+                                         self.pool, metrics)
+
+    def start(self):
+        self.capture.start()
+        self.inference.start()
+
+    def frames(self):
+        # Render aşaması: ana thread'de (imshow için) sonuçları sırayla verir
+        while not self.stop_event.is_set():
+            item = self.render_queue.get(timeout=0.1)
+            if item is None:
+                if self.render_queue.closed:
+                    break
+                continue
+            if self.mirror:
+                cv2.flip(item[2], 1, dst=item[2])
+            yield item
+            # Kullanıcı sonraki kareyi istedi: bu karenin çizimi ve gösterimi bitti
+            self.pool.release(item[2])
+
+    def stop(self):
+        self.stop_event.set()
+        self.capture.join(timeout=1.0)
+        self.inference.join(timeout=1.0)
+
+    def stats(self):
+        return {
+            'frames_read': self.capture.frames_read,
+            'frames_inferred': self.inference.frames_processed,
+            'dropped_before_inference': self.capture_queue.dropped,
+            'dropped_before_render': self.render_queue.dropped,
+        }
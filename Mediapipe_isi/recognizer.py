@@ -0,0 +1,152 @@
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Tek vuruşlu (unistroke) karakter tanıma: $1 tarzı şablon eşleştirme, tamamen NumPy ile.
+# Vuruş sabit sayıda noktaya yeniden örneklenir, ağırlık merkezine taşınır ve en-boy oranı korunarak
+# ölçeklenir; tüm şablonlara (ve birkaç küçük dönüşe) olan ortalama nokta uzaklığı tek seferde hesaplanır.
+
+NUM_POINTS = 32
+# Eğik yazıya tolerans için denenen dönüşler (derece)
+ANGLES = (-15.0, 0.0, 15.0)
+# Bu skorun altındaki eşleşmeler '?' olarak döner
+MIN_SCORE = 0.75
+UNKNOWN = '?'
+
+
+def _arc(cx, cy, rx, ry, a0, a1, n=16):
+    # Elips yayı; açılar derece, y aşağı doğru (90 alt, -90 üst), artan açı saat yönü
+    t = np.radians(np.linspace(a0, a1, n))
+    return np.stack((cx + rx * np.cos(t), cy + ry * np.sin(t)), axis=1)
+
+
+def _path(*parts):
+    # Parçaları (köşe listesi veya yay) tek polyline yapar
+    return np.concatenate([np.asarray(part, dtype=np.float64).reshape(-1, 2) for part in parts])
+
+
+# Yerleşik şablonlar: birim kutuda (0..1, y aşağı) yazılış sırasıyla tek vuruş
+GLYPHS = {
+    '0': [_arc(0.5, 0.5, 0.35, 0.5, -90, -450, 32)],
+    '1': [_path([(0.5, 0), (0.5, 1)]), _path([(0.3, 0.2), (0.5, 0), (0.5, 1)])],
+    '2': [_path(_arc(0.5, 0.3, 0.38, 0.3, -180, 30), [(0.1, 1), (0.9, 1)])],
+    '3': [_path(_arc(0.45, 0.25, 0.38, 0.25, -160, 90), _arc(0.45, 0.75, 0.42, 0.25, -90, 160))],
+    '4': [_path([(0.65, 1), (0.65, 0), (0.05, 0.7), (0.95, 0.7)])],
+    '5': [_path([(0.85, 0), (0.25, 0), (0.2, 0.45)], _arc(0.5, 0.7, 0.38, 0.3, -130, 140))],
+    '6': [_path(_arc(0.75, 0.72, 0.6, 0.7, -90, -180), _arc(0.5, 0.72, 0.35, 0.28, 180, -180, 24))],
+    '7': [_path([(0.1, 0), (0.9, 0), (0.35, 1)])],
+    '8': [_path(_arc(0.5, 0.25, 0.3, 0.25, -20, -270), _arc(0.5, 0.75, 0.35, 0.25, -90, 270, 24),
+                [(0.8, 0.1)])],
+    '9': [_path(_arc(0.5, 0.3, 0.35, 0.3, 0, -360, 24), [(0.8, 1)])],
+    'A': [_path([(0, 1), (0.5, 0), (1, 1)])],
+    'B': [_path([(0.15, 1), (0.15, 0)], _arc(0.15, 0.25, 0.65, 0.25, -90, 90), _arc(0.15, 0.75, 0.75, 0.25, -90, 90))],
+    'C': [_arc(0.55, 0.5, 0.45, 0.5, -45, -315, 24)],
+    'D': [_path([(0.15, 1), (0.15, 0)], _arc(0.15, 0.5, 0.75, 0.5, -90, 90, 24))],
+    'G': [_path(_arc(0.55, 0.5, 0.45, 0.5, -45, -360, 24), [(0.55, 0.5)])],
+    'J': [_path([(0.8, 0), (0.8, 0.7)], _arc(0.5, 0.7, 0.3, 0.3, 0, 160))],
+    'L': [_path([(0.1, 0), (0.1, 1), (0.8, 1)])],
+    'M': [_path([(0, 1), (0.1, 0), (0.5, 0.6), (0.9, 0), (1, 1)])],
+    'N': [_path([(0.1, 1), (0.1, 0), (0.9, 1), (0.9, 0)])],
+    'P': [_path([(0.15, 1), (0.15, 0)], _arc(0.15, 0.28, 0.65, 0.28, -90, 90))],
+    'R': [_path([(0.15, 1), (0.15, 0)], _arc(0.15, 0.28, 0.65, 0.28, -90, 90), [(0.85, 1)])],
+    'S': [_path(_arc(0.5, 0.25, 0.35, 0.25, -20, -270), _arc(0.5, 0.75, 0.35, 0.25, -90, 150))],
+    'U': [_path([(0.1, 0)], _arc(0.5, 0.6, 0.4, 0.4, 180, 0), [(0.9, 0)])],
+    'V': [_path([(0, 0), (0.5, 1), (1, 0)])],
+    'W': [_path([(0, 0), (0.25, 1), (0.5, 0.3), (0.75, 1), (1, 0)])],
+    'Z': [_path([(0.1, 0), (0.9, 0), (0.1, 1), (0.9, 1)])],
+}
+
+
+def resample(points, n=NUM_POINTS):
+    # Yol boyunca eşit aralıklı n nokta (çizim hızından bağımsız)
+    points = np.asarray(points, dtype=np.float64)[:, :2]
+    step = np.hypot(*np.diff(points, axis=0).T)
+    distance = np.concatenate(([0.0], np.cumsum(step)))
+    if distance[-1] <= 0:
+        return np.repeat(points[:1], n, axis=0)
+    at = np.linspace(0.0, distance[-1], n)
+    return np.stack((np.interp(at, distance, points[:, 0]), np.interp(at, distance, points[:, 1])), axis=1)
+
+
+def normalize(points, n=NUM_POINTS):
+    # Yeniden örnekle, ağırlık merkezini sıfıra taşı, uzun kenarı 1 olacak şekilde ölçekle (en-boy korunur;
+    # '1' ile 'L' gibi dar/geniş şekiller ezilmez). Noktasal vuruşta None
+    sampled = resample(points, n)
+    sampled -= sampled.mean(axis=0)
+    size = np.ptp(sampled, axis=0).max()
+    if size <= 1e-6:
+        return None
+    return sampled / size
+
+
+class StrokeRecognizer:
+    # Şablonlar (T, n, 2) dizisinde; her şablon ters yönüyle de eklenir (yazış yönü kişiden kişiye değişir)
+    def __init__(self, templates=GLYPHS, n=NUM_POINTS, angles=ANGLES, min_score=MIN_SCORE):
+        self.n = n
+        self.min_score = min_score
+        t = np.radians(angles)
+        # (R, 2, 2) dönüş matrisleri (satır vektörü çarpımı için)
+        self.rotations = np.stack((np.stack((np.cos(t), np.sin(t)), axis=1),
+                                   np.stack((-np.sin(t), np.cos(t)), axis=1)), axis=1)
+        self.labels = []
+        self.raw = {}
+        self._templates = np.empty((0, n, 2))
+        for label, strokes in templates.items():
+            for stroke in strokes:
+                self.add_template(label, stroke)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def add_template(self, label, points):
+        shape = normalize(points, self.n)
+        if shape is None:
+            return
+        self.raw.setdefault(label, []).append(np.asarray(points, dtype=np.float64)[:, :2].tolist())
+        self._templates = np.concatenate((self._templates, shape[None], shape[None, ::-1]))
+        self.labels += [label, label]
+
+    def recognize(self, points):
+        # points: (m, 2+) vuruş noktaları (piksel). Dönüş: (karakter, skor 0..1); eşleşme zayıfsa UNKNOWN
+        if len(points) < 2 or not self.labels:
+            return UNKNOWN, 0.0
+        shape = normalize(points, self.n)
+        if shape is None:
+            return UNKNOWN, 0.0
+        # (R, n, 2) döndürülmüş girdi -> (R, T) ortalama nokta uzaklığı
+        candidates = shape @ self.rotations
+        diff = candidates[:, None] - self._templates[None]
+        distance = np.sqrt((diff * diff).sum(axis=-1)).mean(axis=-1).min(axis=0)
+        best = int(distance.argmin())
+        # $1 skoru: birim kutunun yarım köşegenine göre
+        score = max(0.0, 1.0 - float(distance[best]) / (0.5 * math.sqrt(2)))
+        if score < self.min_score:
+            return UNKNOWN, score
+        return self.labels[best], score
+
+    def load(self, path):
+        # JSON: {"karakter": [[[x, y], ...], ...]}; yerleşik şablonlara eklenir
+        with open(path, encoding='utf-8') as f:
+            for label, strokes in json.load(f).items():
+                for stroke in strokes:
+                    self.add_template(label, stroke)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.raw, f, ensure_ascii=False)
+
+
+class AsyncRecognizer:
+    # Tanıma tek işçili arka plan thread'inde; submit() hemen Future döner, kare döngüsü beklemez
+    def __init__(self, recognizer=None):
+        self.recognizer = recognizer if recognizer is not None else StrokeRecognizer()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recognizer")
+
+    def submit(self, points):
+        # Nokta tamponu çizgi bitince yeniden kullanılabileceğinden kopyalanır
+        return self._executor.submit(self.recognizer.recognize, np.array(points[:, :2], dtype=np.float64))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
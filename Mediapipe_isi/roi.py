@@ -0,0 +1,105 @@
+import numpy as np
+
+from backends import HandDetection
+
+# Bölge (ROI) takibi: önceki karenin landmark'larından dolgulu kare bir bölge çıkarılır, model sadece bu
+# kırpıntıyı görür. Kırpıntı NumPy dilim görünümüdür (kopya yok); renk dönüşümü ve modelin görüntü kopyası
+# tüm kare yerine bölge boyutunda yapılır, kamera çözünürlüğü arttıkça maliyet büyümez.
+# Tam kare aramaya dönülen durumlar: el kayboldu (model takip güveni eşiğin altına düşünce eli bırakır),
+# el bölgenin kenarına dayandı (kesilmiş olabilir), bölge karenin büyük kısmını kaplıyor,
+# veya periyodik yenileme (bölge dışına yeni giren eller de bulunur).
+
+
+class RoiTracker:
+    # padding: el kutusu boyunun her yana eklenen oranı; min_size: piksel; align: bölge kenarı bu katlara
+    # yuvarlanır (boyut kareden kareye oynamaz, model takibi kararlı kalır); refresh: tam kare arama periyodu
+    def __init__(self, padding=0.5, min_size=192, align=32, refresh=30, edge=0.02, max_area=0.6):
+        self.padding = padding
+        self.min_size = min_size
+        self.align = align
+        self.refresh = refresh
+        self.edge = edge
+        self.max_area = max_area
+        # mirror: model aynalanmamış kareyi görür, sonuçlar aynalı ekran koordinatındadır (arka uç mirror'ı);
+        # bölge hesabı kamera karesinde yapılır
+        self.mirror = False
+        # Sonraki kare için (x0, y0, x1, y1) piksel; None: tam kare
+        self.box = None
+        self._since_full = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+
+    def crop(self, image):
+        # (model girdisi olacak görüntü, bölge veya None)
+        if self.box is None or self._since_full >= self.refresh:
+            self._since_full = 0
+            self.full_frames += 1
+            return image, None
+        self._since_full += 1
+        self.roi_frames += 1
+        x0, y0, x1, y1 = self.box
+        return image[y0:y1, x0:x1], self.box
+
+    def input_size(self, crop, frame_shape, inference_size=None):
+        # inference_size tam kare içindir; bölge aynı oranla küçültülür (en-boy oranı korunur)
+        if inference_size is None:
+            return None
+        scale = inference_size[0] / frame_shape[1]
+        if scale >= 1:
+            return None
+        return max(1, round(crop.shape[1] * scale)), max(1, round(crop.shape[0] * scale))
+
+    def update(self, detection, box, frame_shape):
+        # Bölgeye göre normalize sonuç tam kareye taşınır; sonraki karenin bölgesi seçilir
+        h, w = frame_shape[:2]
+        if box is None or not len(detection):
+            self.box = self._next_box(self._flip(detection.points), w, h) if len(detection) else None
+            return detection
+        points = self._flip(detection.points)
+        if points[..., :2].min() < self.edge or points[..., :2].max() > 1 - self.edge:
+            # El bölge kenarında: sonraki kare tam karede aranır
+            self.box = None
+        x0, y0, x1, y1 = box
+        cw, ch = x1 - x0, y1 - y0
+        full = np.empty_like(points)
+        full[..., 0] = (points[..., 0] * cw + x0) / w
+        full[..., 1] = (points[..., 1] * ch + y0) / h
+        # z, x ile aynı ölçekte (bölge genişliği -> kare genişliği)
+        full[..., 2] = points[..., 2] * (cw / w)
+        if self.box is not None:
+            self.box = self._next_box(full, w, h)
+        # Protobuf landmark'ları bölge koordinatında kalır: iskelet diziden çizilir
+        return HandDetection(self._flip(full), detection.handedness)
+
+    def _flip(self, points):
+        # Aynalı (ekran) <-> kamera karesi x koordinatı; aynalama kapalıysa aynı dizi
+        if not self.mirror:
+            return points
+        flipped = points.copy()
+        flipped[..., 0] = 1 - flipped[..., 0]
+        return flipped
+
+    def _next_box(self, points, w, h):
+        xs = points[..., 0] * w
+        ys = points[..., 1] * h
+        left, right, top, bottom = xs.min(), xs.max(), ys.min(), ys.max()
+        side = max(right - left, bottom - top) * (1 + 2 * self.padding)
+        side = int(np.ceil(max(side, self.min_size) / self.align) * self.align)
+        if side * side > self.max_area * w * h or side > min(w, h):
+            return None
+        cx, cy = (left + right) / 2, (top + bottom) / 2
+        if self.box is not None:
+            # Histerezis: el hâlâ önceki bölgenin iç kısmındaysa ve boyut uygunsa bölge değişmez
+            x0, y0, x1, y1 = self.box
+            margin = (x1 - x0) * self.padding / (1 + 2 * self.padding) / 2
+            if (x1 - x0 == side and left > x0 + margin and right < x1 - margin
+                    and top > y0 + margin and bottom < y1 - margin):
+                return self.box
+        x0 = int(min(max(cx - side / 2, 0), w - side))
+        y0 = int(min(max(cy - side / 2, 0), h - side))
+        return x0, y0, x0 + side, y0 + side
+
+    def stats(self):
+        total = self.roi_frames + self.full_frames
+        return {'roi_frames': self.roi_frames, 'full_frames': self.full_frames,
+                'roi_ratio': self.roi_frames / total if total else 0.0}
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+class SegmentGrid:
+    # Düzgün ızgara: her hücre, sınır kutusu o hücreye değen parça kimliklerini tutar.
+    # Sorgu sadece dikdörtgenin kapsadığı hücrelere bakar; maliyet toplam parça sayısından bağımsızdır.
+    def __init__(self, cell=32):
+        self.cell = cell
+        self.cells = {}
+
+    def insert(self, ids, boxes):
+        # ids: (n,) parça kimlikleri; boxes: (n, 4) x0, y0, x1, y1
+        if not len(ids):
+            return
+        cell_boxes = np.floor_divide(boxes, self.cell).astype(np.int64)
+        cells = self.cells
+        for i, (cx0, cy0, cx1, cy1) in zip(ids.tolist(), cell_boxes.tolist()):
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [i]
+                    else:
+                        bucket.append(i)
+
+    def query(self, x0, y0, x1, y1):
+        # Dikdörtgene değen hücrelerdeki parça kimlikleri (tekrarsız, sıralı)
+        c = self.cell
+        found = []
+        for cy in range(int(y0 // c), int(y1 // c) + 1):
+            for cx in range(int(x0 // c), int(x1 // c) + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.array(found, dtype=np.int64))
+
+    def remap(self, id_map):
+        # Kimlikler id_map ile yenilenir; -1'e eşlenen (atılan) parçalar hücrelerden çıkar
+        for key, bucket in list(self.cells.items()):
+            ids = id_map[np.array(bucket, dtype=np.int64)]
+            ids = ids[ids >= 0]
+            if len(ids):
+                self.cells[key] = ids.tolist()
+            else:
+                del self.cells[key]
+
+    def __len__(self):
+        # Hücrelerdeki toplam kayıt (bir parça birden çok hücrede olabilir)
+        return sum(len(bucket) for bucket in self.cells.values())
+
+
+def segment_distances(a, b, x, y):
+    # (x, y) noktasının a-b parçalarına uzaklığı; a == b ise nokta uzaklığı
+    ab = b - a
+    length2 = np.einsum('ij,ij->i', ab, ab)
+    t = np.einsum('ij,ij->i', (x, y) - a, ab) / np.maximum(length2, 1e-12)
+    closest = a + np.clip(t, 0.0, 1.0)[:, None] * ab
+    return np.hypot(closest[:, 0] - x, closest[:, 1] - y)
@@ -0,0 +1,416 @@
+import cv2
+import numpy as np
+
+from brush import StrokeBatch, curve_boxes, draw_dots, sample_segments
+from spatial import SegmentGrid, segment_distances
+
+# Çizgi türleri: LINE ardışık noktaları birleştirir, DOTS her noktaya daire basar (silgi)
+LINE = 0
+DOTS = 1
+
+
+class _OpenStroke:
+    # Çizilmekte olan çizgi; noktalar çizgi bitince ana tampona tek kopyayla taşınır.
+    # drawn: rastera çizilmiş son parçanın indeksi (parça, sonraki nokta gelince kesinleşir)
+    __slots__ = ('points', 'count', 'drawn', 'color', 'kind')
+
+    def __init__(self):
+        self.points = np.empty((64, 3), dtype=np.float32)
+        self.count = 0
+        self.drawn = 0
+        self.color = (0, 0, 0)
+        self.kind = LINE
+
+    def append(self, x, y, width):
+        if self.count == len(self.points):
+            grown = np.empty((2 * len(self.points), 3), dtype=np.float32)
+            grown[:self.count] = self.points[:self.count]
+            self.points = grown
+        self.points[self.count] = (x, y, width)
+        self.count += 1
+
+
+class StrokeStore:
+    # Vektör çizgi deposu: tüm noktalar tek bir bitişik (N, 3) float32 tamponda (x, y, kalınlık),
+    # çizgi başına renk/tür/başlangıç/uzunluk/sınır kutusu ayrı dizilerde tutulur.
+    # Koordinatlar `size` (genişlik, yükseklik) uzayındadır; raster her çözünürlükte yeniden üretilebilir.
+    # Parça k, aynı çizgideki (k-1, k) noktalarıdır (DOTS için k. nokta); parçalar ızgarada indekslenir,
+    # silgi sadece kesiştiği parçaları öldürür, çizgi o noktadan bölünmüş olarak çizilir.
+    def __init__(self, size, capacity=4096, max_strokes=256, cell=32):
+        self.size = (int(size[0]), int(size[1]))
+        # Sıkıştırmada tamponlar bu kapasitelerden başlayarak yeniden ayrılır
+        self.initial_capacity = (capacity, max_strokes)
+        self.points = np.empty((capacity, 3), dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.point_stroke = np.empty(capacity, dtype=np.int32)
+        self.num_points = 0
+        self.index = SegmentGrid(cell)
+        self.starts = np.empty(max_strokes, dtype=np.int64)
+        self.lengths = np.empty(max_strokes, dtype=np.int64)
+        self.colors = np.empty((max_strokes, 3), dtype=np.uint8)
+        self.kinds = np.empty(max_strokes, dtype=np.uint8)
+        # (x0, y0, x1, y1), kalınlık dahil
+        self.bboxes = np.empty((max_strokes, 4), dtype=np.float32)
+        # Geri alınan / temizlenen çizgiler silinmez, sadece gizlenir (yineleme için)
+        self.visible = np.empty(max_strokes, dtype=bool)
+        self.count = 0
+        # Anahtar (ör. el slotu) başına açık çizgi; nesneler yeniden kullanılır
+        self.open = {}
+        self._spare = []
+        # Raster çizgi tipi: kenar yumuşatmalı (LINE_AA) veya keskin (LINE_8)
+        self.line_type = cv2.LINE_AA
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return (self.points.nbytes + self.alive.nbytes + self.point_stroke.nbytes + self.starts.nbytes + self.lengths.nbytes + self.colors.nbytes
+                + self.kinds.nbytes + self.bboxes.nbytes + self.visible.nbytes)
+
+    def strokes_nbytes(self, indices):
+        # Verilen çizgilerin depoda kapladığı bayt (noktalar ve bayrakları, çizgi başına bilgiler)
+        indices = np.asarray(indices, dtype=np.int64)
+        point_bytes = self.points.itemsize * 3 + self.alive.itemsize + self.point_stroke.itemsize
+        stroke_bytes = sum(a.itemsize * (a.size // len(a)) for a in (self.starts, self.lengths, self.colors, self.kinds,
+                                                                    self.bboxes, self.visible))
+        return int(self.lengths[indices].sum()) * point_bytes + len(indices) * stroke_bytes
+
+    def begin(self, key, color, kind=LINE):
+        self.end(key)
+        stroke = self._spare.pop() if self._spare else _OpenStroke()
+        stroke.count = 0
+        stroke.drawn = 0
+        stroke.color = tuple(int(c) for c in color)
+        stroke.kind = kind
+        self.open[key] = stroke
+        return stroke
+
+    def add(self, key, point, width):
+        self.open[key].append(point[0], point[1], width)
+
+    def current(self, key):
+        return self.open.get(key)
+
+    def end(self, key):
+        # Açık çizgiyi ana tampona ekler; eklenen çizginin indeksini döner
+        stroke = self.open.pop(key, None)
+        if stroke is None:
+            return None
+        self._spare.append(stroke)
+        if stroke.count == 0:
+            return None
+        return self.append(stroke.points[:stroke.count], stroke.color, stroke.kind)
+
+    def end_all(self):
+        for key in list(self.open):
+            self.end(key)
+
+    def append(self, points, color, kind=LINE):
+        n = len(points)
+        self._reserve_points(self.num_points + n)
+        if self.count == len(self.starts):
+            self._grow_strokes()
+        i = self.count
+        start = self.num_points
+        self.points[start:start + n] = points
+        self.num_points += n
+        self.starts[i] = start
+        self.lengths[i] = n
+        self.colors[i] = color
+        self.kinds[i] = kind
+        self.visible[i] = True
+        pad = points[:, 2].max() if kind == DOTS else points[:, 2].max() / 2
+        self.bboxes[i, :2] = points[:, :2].min(axis=0) - pad
+        self.bboxes[i, 2:] = points[:, :2].max(axis=0) + pad
+        self.point_stroke[start:start + n] = i
+        self.alive[start:start + n] = True
+        self.count += 1
+        self._index_segments(start, n, kind)
+        return i
+
+    def _index_segments(self, start, n, kind):
+        if kind == DOTS:
+            ids = np.arange(start, start + n)
+        else:
+            # İlk nokta parça değildir; kutular çizilen eğriyi (Catmull-Rom) kapsar
+            self.alive[start] = False
+            ids = np.arange(start + 1, start + n)
+        self.index.insert(ids, _boxes(self.points[start:start + n], ids - start, kind))
+
+    def _live_segments(self, ids):
+        # Ölü parçalar ve gizli çizgilerin parçaları elenir
+        ids = ids[self.alive[ids]]
+        return ids[self.visible[self.point_stroke[ids]]]
+
+    def segments_in_rect(self, x0, y0, x1, y1):
+        return self._live_segments(self.index.query(x0, y0, x1, y1))
+
+    def segments_near(self, x, y, radius, kind=None):
+        # Çizilmiş kalınlığıyla birlikte (x, y) merkezli daireye değen parçalar
+        ids = self.segments_in_rect(x - radius, y - radius, x + radius, y + radius)
+        if kind is not None:
+            ids = ids[self.kinds[self.point_stroke[ids]] == kind]
+        if not len(ids):
+            return ids
+        b = self.points[ids]
+        dots = self.kinds[self.point_stroke[ids]] == DOTS
+        a = np.where(dots[:, None], b, self.points[ids - 1])
+        reach = radius + np.where(dots, b[:, 2], b[:, 2] / 2)
+        return ids[segment_distances(a[:, :2], b[:, :2], x, y) <= reach]
+
+    def hit_test(self, x, y, tolerance=0.0):
+        # Noktaya değen görünür çizgilerin indeksleri (alttan üste)
+        return np.unique(self.point_stroke[self.segments_near(x, y, tolerance)])
+
+    def stroke_at(self, x, y, tolerance=4.0):
+        # Seçim: noktadaki en üstteki çizgi, yoksa None
+        hits = self.hit_test(x, y, tolerance)
+        return int(hits[-1]) if len(hits) else None
+
+    def strokes_in_rect(self, x0, y0, x1, y1):
+        return np.unique(self.point_stroke[self.segments_in_rect(x0, y0, x1, y1)])
+
+    def erase(self, x, y, radius):
+        # Daireye değen çizgi parçalarını öldürür (çizgiler bölünür); öldürülen parça kimliklerini döner
+        ids = self.segments_near(x, y, radius, kind=LINE)
+        self.alive[ids] = False
+        return ids
+
+    def remove_stroke(self, i):
+        # Çizginin tüm canlı parçalarını öldürür (geri alınabilir olması için gizlemek yerine)
+        start = self.starts[i]
+        ids = np.arange(start, start + self.lengths[i])
+        ids = ids[self.alive[ids]]
+        self.alive[ids] = False
+        return ids
+
+    def set_alive(self, ids, alive):
+        self.alive[ids] = alive
+
+    def segment_bounds(self, ids):
+        # Parçaların çizilen eğri ve kalınlık dahil sınır kutusu (x0, y0, x1, y1)
+        strokes = self.point_stroke[ids]
+        dots = self.kinds[strokes] == DOTS
+        boxes = np.empty((len(ids), 4), dtype=np.float32)
+        if dots.any():
+            boxes[dots] = _boxes(self.points, ids[dots], DOTS)
+        if not dots.all():
+            lines = ~dots
+            first = self.starts[strokes[lines]]
+            boxes[lines] = curve_boxes(self.points, ids[lines], first, first + self.lengths[strokes[lines]] - 1)
+        return (float(boxes[:, 0].min()), float(boxes[:, 1].min()), float(boxes[:, 2].max()), float(boxes[:, 3].max()))
+
+    def stroke(self, i):
+        # Çizginin noktalarının görünümü (kopya değil)
+        start = self.starts[i]
+        return self.points[start:start + self.lengths[i]]
+
+    def visible_strokes(self):
+        return np.flatnonzero(self.visible[:self.count])
+
+    def set_visible(self, indices, visible):
+        self.visible[indices] = visible
+
+    def snapshot(self):
+        # Dışa aktarım için salt okunur kopya. Nokta ve çizgi tamponlarına sadece sona ekleme yapıldığından
+        # (büyüyünce yeni dizi ayrılır) mevcut önek paylaşılır; değişebilen canlılık/görünürlük bayrakları ve
+        # açık çizgiler kopyalanır. Izgara indeksi taşınmaz: kopya sadece tam çizim ve vektör çıktısı içindir.
+        n, k = self.num_points, self.count
+        snap = StrokeStore.__new__(StrokeStore)
+        snap.size = self.size
+        snap.points = self.points[:n]
+        snap.point_stroke = self.point_stroke[:n]
+        snap.alive = self.alive[:n].copy()
+        snap.num_points = n
+        snap.index = None
+        for name in ('starts', 'lengths', 'colors', 'kinds', 'bboxes'):
+            setattr(snap, name, getattr(self, name)[:k])
+        snap.visible = self.visible[:k].copy()
+        snap.count = k
+        snap.open = {}
+        for key, stroke in self.open.items():
+            frozen = _OpenStroke()
+            frozen.points = stroke.points[:stroke.count].copy()
+            frozen.count, frozen.drawn, frozen.color, frozen.kind = stroke.count, stroke.drawn, stroke.color, stroke.kind
+            snap.open[key] = frozen
+        snap._spare = []
+        snap.line_type = self.line_type
+        return snap
+
+    def in_use(self, strokes=(), segments=()):
+        # Tutulması gereken çizgiler: görünür ve canlı parçası olanlar ile geçmişin başvurduğu çizgiler
+        # (strokes: gizlenip geri getirilebilecek çizgiler, segments: yeniden canlanabilecek parçalar)
+        k, n = self.count, self.num_points
+        live = np.bincount(self.point_stroke[:n][self.alive[:n]], minlength=k) > 0
+        keep = self.visible[:k] & live
+        keep[np.asarray(strokes, dtype=np.int64)] = True
+        keep[self.point_stroke[np.asarray(segments, dtype=np.int64)]] = True
+        return keep
+
+    def compact(self, keep):
+        # Tutulmayan çizgileri atar; tamponlar yeni dizilere (gerekli kapasiteyle) kopyalanır, anlık kopyaların
+        # paylaştığı eski önekler değişmez. Dönen (çizgi, nokta) eşlemeleri eski indeksten yeniye, atılanlar -1
+        k, n = self.count, self.num_points
+        kept = np.flatnonzero(keep[:k])
+        stroke_map = np.full(k, -1, dtype=np.int64)
+        stroke_map[kept] = np.arange(len(kept))
+        kept_points = np.flatnonzero(keep[:k][self.point_stroke[:n]])
+        point_map = np.full(n, -1, dtype=np.int64)
+        point_map[kept_points] = np.arange(len(kept_points))
+        capacity, max_strokes = self.initial_capacity
+        while capacity < len(kept_points):
+            capacity *= 2
+        while max_strokes < len(kept):
+            max_strokes *= 2
+        for name in ('points', 'alive', 'point_stroke'):
+            old = getattr(self, name)
+            compacted = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            compacted[:len(kept_points)] = old[kept_points]
+            setattr(self, name, compacted)
+        self.point_stroke[:len(kept_points)] = stroke_map[self.point_stroke[:len(kept_points)]]
+        starts = point_map[self.starts[kept]]
+        for name in ('starts', 'lengths', 'colors', 'kinds', 'bboxes', 'visible'):
+            old = getattr(self, name)
+            compacted = np.empty((max_strokes,) + old.shape[1:], dtype=old.dtype)
+            compacted[:len(kept)] = old[kept]
+            setattr(self, name, compacted)
+        self.starts[:len(kept)] = starts
+        self.num_points = len(kept_points)
+        self.count = len(kept)
+        self.index.remap(point_map)
+        return stroke_map, point_map
+
+    def _reserve_points(self, needed):
+        if needed <= len(self.points):
+            return
+        capacity = len(self.points)
+        while capacity < needed:
+            capacity *= 2
+        for name in ('points', 'alive', 'point_stroke'):
+            old = getattr(self, name)
+            grown = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:self.num_points] = old[:self.num_points]
+            setattr(self, name, grown)
+
+    def _grow_strokes(self):
+        capacity = 2 * len(self.starts)
+        for name in ('starts', 'lengths', 'colors', 'kinds', 'bboxes', 'visible'):
+            old = getattr(self, name)
+            grown = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:self.count] = old[:self.count]
+            setattr(self, name, grown)
+
+    def render(self, image, alpha=None, include_open=True, rect=None):
+        # Görünür çizgileri sırayla görüntüye (ve alfa kaplamasına) çizer; ölçek görüntü boyutundan gelir.
+        # rect (x0, y0, x1, y1) verilirse sadece o bölge (görüntü pikseli) yeniden çizilir.
+        # Açık çizgilerin sadece kesinleşmiş (drawn) parçaları çizilir, canlı rasterle aynı.
+        h, w = image.shape[:2]
+        sx, sy = w / self.size[0], h / self.size[1]
+        if rect is not None:
+            return self._render_rect(image, alpha, rect, sx, sy, include_open)
+        batch = StrokeBatch(self.line_type)
+        for i in self.visible_strokes():
+            start = self.starts[i]
+            n = self.lengths[i]
+            ends = np.flatnonzero(self.alive[start:start + n])
+            draw_stroke(image, alpha, self.points[start:start + n], self.colors[i].tolist(), self.kinds[i],
+                        sx, sy, ends, batch=batch)
+        if include_open:
+            for stroke in self.open.values():
+                points = stroke.points[:stroke.count]
+                ends = np.arange(stroke.count) if stroke.kind == DOTS else np.arange(1, stroke.drawn + 1)
+                draw_stroke(image, alpha, points, stroke.color, stroke.kind, sx, sy, ends, batch=batch)
+        batch.draw(image, alpha)
+        return image
+
+    def _render_rect(self, image, alpha, rect, sx, sy, include_open):
+        # Sadece bölgeye değen parçalar çizilir. cv2 kalın çizgileri kırpınca farklı rasterleştirdiği için
+        # parçalar, onları tamamen içeren geçici bir tampona çizilip bölge oradan kopyalanır.
+        x0, y0, x1, y1 = rect
+        bx0, by0, bx1, by1 = x0 / sx, y0 / sy, x1 / sx, y1 / sy
+        items = []
+        ids = self.segments_in_rect(bx0, by0, bx1, by1)
+        if len(ids):
+            strokes = self.point_stroke[ids]
+            breaks = np.flatnonzero(np.diff(strokes)) + 1
+            for run in np.split(ids, breaks):
+                i = self.point_stroke[run[0]]
+                start = self.starts[i]
+                points = self.stroke(i)
+                items.append((points, self.colors[i].tolist(), self.kinds[i], run - start))
+        if include_open:
+            for stroke in self.open.values():
+                points = stroke.points[:stroke.count]
+                ends = np.arange(stroke.count) if stroke.kind == DOTS else np.arange(1, stroke.drawn + 1)
+                if not len(ends):
+                    continue
+                boxes = _boxes(points, ends, stroke.kind)
+                hit = (boxes[:, 0] <= bx1) & (boxes[:, 2] >= bx0) & (boxes[:, 1] <= by1) & (boxes[:, 3] >= by0)
+                if hit.any():
+                    items.append((points, stroke.color, stroke.kind, ends[hit]))
+        if not items:
+            return image
+        # Tampon: bölge + çizilecek eğrilerin tamamı (görüntü sınırına kırpılır, orada tam çizimle aynı kırpma olur)
+        boxes = np.concatenate([_boxes(item[0], item[3], item[2]) for item in items])
+        h, w = image.shape[:2]
+        tx0 = max(0, min(x0, int(np.floor(boxes[:, 0].min() * sx)) - 2))
+        ty0 = max(0, min(y0, int(np.floor(boxes[:, 1].min() * sy)) - 2))
+        tx1 = min(w, max(x1, int(np.ceil(boxes[:, 2].max() * sx)) + 3))
+        ty1 = min(h, max(y1, int(np.ceil(boxes[:, 3].max() * sy)) + 3))
+        buffer = np.zeros((ty1 - ty0, tx1 - tx0, 3), dtype=np.uint8)
+        buffer_alpha = np.zeros(buffer.shape[:2], dtype=np.uint8)
+        batch = StrokeBatch(self.line_type)
+        for points, color, kind, ends in items:
+            draw_stroke(buffer, buffer_alpha, points, color, kind, sx, sy, ends, (tx0, ty0), batch)
+        batch.draw(buffer, buffer_alpha, (tx0, ty0))
+        image[y0:y1, x0:x1] = buffer[y0 - ty0:y1 - ty0, x0 - tx0:x1 - tx0]
+        if alpha is not None:
+            alpha[y0:y1, x0:x1] = buffer_alpha[y0 - ty0:y1 - ty0, x0 - tx0:x1 - tx0]
+        return image
+
+    def rasterize(self, shape=None, scale=1.0, with_alpha=False):
+        # Raster önbelleği: istenen boyutta (veya ölçekte) baştan üretilir
+        if shape is None:
+            shape = (int(round(self.size[1] * scale)), int(round(self.size[0] * scale)))
+        image = np.zeros((shape[0], shape[1], 3), dtype=np.uint8)
+        if not with_alpha:
+            return self.render(image)
+        alpha = np.zeros(shape[:2], dtype=np.uint8)
+        self.render(image, alpha)
+        return image, alpha
+
+
+def _boxes(points, ends, kind):
+    if kind == DOTS:
+        b = points[ends]
+        pad = b[:, 2:3] + 1
+        return np.concatenate((b[:, :2] - pad, b[:, :2] + pad), axis=1)
+    return curve_boxes(points, ends)
+
+
+def draw_stroke(image, alpha, points, color, kind, sx=1.0, sy=1.0, ends=None, offset=(0, 0), batch=None):
+    # Çizginin parçalarını kenar yumuşatmalı çizer. ends: çizilecek parçaların indeksleri (silinenler hariç;
+    # LINE için parça k = (k-1, k) noktaları). batch verilirse LINE eğrileri ona eklenir, çizim batch.draw'da
+    # yapılır; DOTS hemen çizildiği için önce bekleyen eğriler çizilir (üst üste binme sırası korunur).
+    if kind == DOTS:
+        if batch is not None and len(batch):
+            batch.draw(image, alpha, offset)
+            batch.clear()
+        draw_dots(image, alpha, points if ends is None else points[ends], color, sx, sy, offset,
+                  cv2.LINE_AA if batch is None else batch.line_type)
+        return
+    if ends is None:
+        ends = np.arange(1, len(points))
+    if not len(ends):
+        return
+    own = batch is None
+    if own:
+        batch = StrokeBatch()
+    elif batch.needs_flush(color):
+        batch.draw(image, alpha, offset)
+        batch.clear()
+    for xy, widths in sample_segments(points, ends, sx, sy):
+        batch.add(xy, widths, color)
+    if own:
+        batch.draw(image, alpha, offset)
@@ -0,0 +1,86 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import FakeBackend, make_backend, parse_backend
+from deneme import AdvancedHandDrawing
+from fixtures import synthetic_stream
+
+# Landmark arka uçlarının aynı çizim hattında karşılaştırılması: tespit süresi, uçtan uca kare süresi ve
+# karede bulunan el sayısı. Video verilmezse boş kareler kullanılır (model süresi yine ölçülür, el bulunmaz).
+
+
+def load_frames(path, limit, size):
+    frames = []
+    if path:
+        cap = cv2.VideoCapture(path)
+        while len(frames) < limit:
+            success, image = cap.read()
+            if not success:
+                break
+            frames.append(cv2.flip(image, 1))
+        cap.release()
+    if not frames:
+        w, h = size
+        frames = [np.zeros((h, w, 3), dtype=np.uint8)] * limit
+    return frames
+
+
+def run_backend(backend, frames, inference_size):
+    # Isınma ölçüme girmez; kare süresi = tespit + çizim + UI
+    app = AdvancedHandDrawing(max_num_hands=backend.max_hands, inference_size=inference_size, backend=backend)
+    app.load_model((frames[0].shape[1], frames[0].shape[0]))
+    detect, total, hands = [], [], 0
+    for frame in frames:
+        start = time.perf_counter()
+        detection = app.process_frame(frame)
+        detected = time.perf_counter()
+        output = app.process_drawing(frame.copy(), detection)
+        app.draw_ui(output)
+        end = time.perf_counter()
+        detect.append(detected - start)
+        total.append(end - start)
+        hands += len(detection)
+    app.exports.close()
+    backend.close()
+    return np.array(detect) * 1000, np.array(total) * 1000, hands / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Landmark arka ucu karşılaştırması")
+    parser.add_argument('video', nargs='?', default=None, help="Kayıtlı video (verilmezse boş kareler)")
+    parser.add_argument('--backends', default='mediapipe,mediapipe-lite,fake',
+                        help="Virgülle ayrılmış arka uçlar (deneme.py --backend biçimi)")
+    parser.add_argument('--frames', type=int, default=150)
+    parser.add_argument('--size', default='1280x720', help="Video yoksa boş kare boyutu")
+    parser.add_argument('--inference-size', default=None, help="Tespit çözünürlüğü, örn. 640x360")
+    parser.add_argument('--hands', type=int, default=2, help="El sayısı")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split('x'))
+    inference_size = tuple(int(v) for v in args.inference_size.split('x')) if args.inference_size else None
+    frames = load_frames(args.video, args.frames, size)
+    h, w = frames[0].shape[:2]
+    print(f"{len(frames)} kare {w}x{h}, {os.cpu_count()} çekirdek")
+    print(f"  {'arka uç':<28} {'tespit p50':>10} {'p99':>8} {'kare p50':>9} {'p99':>8} {'FPS':>7} {'el/kare':>8}")
+    for spec in args.backends.split(','):
+        name, arg = parse_backend(spec)
+        if name == 'fake':
+            # Sahte arka uç sentetik el akışı döner: çizim hattının modelsiz yükü
+            backend = FakeBackend(synthetic_stream(args.hands), latency=float(arg or 0) / 1000)
+        else:
+            backend = make_backend((name, arg), args.hands)
+        detect, total, hands = run_backend(backend, frames, inference_size)
+        print(f"  {spec:<28} {np.percentile(detect, 50):10.2f} {np.percentile(detect, 99):8.2f} "
+              f"{np.percentile(total, 50):9.2f} {np.percentile(total, 99):8.2f} "
+              f"{1000 / total.mean():7.1f} {hands:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
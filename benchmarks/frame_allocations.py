@@ -0,0 +1,138 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import FakeBackend
+from deneme import AdvancedHandDrawing, mirror_frame
+from inference import FramePool, model_input
+from fixtures import synthetic_stream
+
+# Kare başına bellek ayırma: tracemalloc (NumPy ve OpenCV'nin NumPy dizileri izlenir) ile her karenin
+# tepe ayırması, kare başındaki kullanımın üzerinde, tam kare boyutu cinsinden ölçülür.
+#   eski     cap.read() yeni kare + cv2.flip + yeniden boyutlama/BGR->RGB (her biri yeni dizi)
+#   havuzlu  FramePool + InputBuffer (dst= ile aynı tamponlar), aynalama landmark'larda + yerinde flip
+# --check: havuzlu yolda karelerin yarısından fazlası model girdisinin 3/4'ü kadar (küçültülmüş kopya dahil)
+# ayırıyorsa çıkış kodu 1. Seyrek büyük ayırmalar (geri al geçmişine karo kopyası) sayılmaz; UI sprite'ının
+# yeniden çizimi (~80 KB) sınırın altında kalır.
+# Tamponların yeniden kullanımı ayrıca tests/test_frame_buffers.py'de test edilir
+
+
+class SyntheticCamera:
+    # cv2.VideoCapture gibi: read(dst) verilen diziye yazar, verilmezse yeni dizi ayırır
+    def __init__(self, size, frames):
+        self.w, self.h = size
+        self.frames = frames
+        self.index = 0
+        self.background = np.random.default_rng(0).integers(0, 256, (self.h, self.w, 3), dtype=np.uint8)
+
+    def read(self, image=None):
+        if self.index >= self.frames:
+            return False, None
+        if image is None or image.shape != self.background.shape:
+            image = np.empty_like(self.background)
+        np.copyto(image, self.background)
+        x = 40 + (self.index * 7) % max(self.w - 200, 1)
+        cv2.rectangle(image, (x, self.h // 3), (x + 120, self.h // 3 + 160), (200, 180, 160), -1)
+        self.index += 1
+        return True, image
+
+    def release(self):
+        pass
+
+
+def legacy_frame(app, cap, frames):
+    success, image = cap.read()
+    if not success:
+        return False
+    image = cv2.flip(image, 1)
+    results = app.detect(model_input(image, app.inference_size))
+    image = app.process_drawing(image, results)
+    app.draw_ui(image)
+    return True
+
+
+def pooled_frame(app, cap, frames):
+    success, image = frames.read(cap)
+    if not success:
+        return False
+    results = app.process_frame(image)
+    mirror_frame(app, image)
+    image = app.process_drawing(image, results)
+    app.draw_ui(image)
+    frames.release(image)
+    return True
+
+
+def run(step, source, size, frame_count, inference_size, warmup, traced):
+    cap = cv2.VideoCapture(source) if source else SyntheticCamera(size, frame_count)
+    app = AdvancedHandDrawing(max_num_hands=2, inference_size=inference_size,
+                              backend=FakeBackend(synthetic_stream(2)), mirror=True)
+    frames = FramePool()
+    peaks, times = [], []
+    frame_bytes = None
+    if traced:
+        tracemalloc.start()
+    for index in range(frame_count):
+        if traced:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        if not step(app, cap, frames):
+            break
+        times.append(time.perf_counter() - start)
+        if traced and index >= warmup:
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        if frame_bytes is None and app.drawing_canvas is not None:
+            h, w = app.drawing_canvas.shape[:2]
+            frame_bytes = h * w * 3
+    if traced:
+        tracemalloc.stop()
+    cap.release()
+    app.exports.close()
+    return np.array(peaks) / frame_bytes if traced else None, np.array(times[warmup:]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kare başına bellek ayırma benchmark'ı (tracemalloc)")
+    parser.add_argument('video', nargs='?', default=None, help="Video dosyası (verilmezse sentetik kamera)")
+    parser.add_argument('--size', default='1280x720', help="Sentetik kamera çözünürlüğü")
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--warmup', type=int, default=10, help="Ölçüme girmeyen ilk kareler (tampon ve tuval oluşumu)")
+    parser.add_argument('--inference-size', default=None, help="Tespit çözünürlüğü, örn. 640x360")
+    parser.add_argument('--check', action='store_true', help="Havuzlu yolun tepe p50'si sınırı aşarsa hata ver")
+    parser.add_argument('--limit', type=float, default=None,
+                        help="Havuzlu yolda izin verilen tepe p50 (tam kare); varsayılan model girdisinin 3/4'ü")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split('x'))
+    inference_size = tuple(int(v) for v in args.inference_size.split('x')) if args.inference_size else None
+    print(f"{args.video or 'sentetik ' + args.size}, {args.frames} kare (ilk {args.warmup} hariç), "
+          f"tespit {args.inference_size or 'tam'}")
+    print(f"  {'yol':<9} {'tepe p50':>9} {'en çok':>8}  (tam kare)  {'süre p50':>9} {'p99':>7}  (ms, izlemesiz)")
+    results = {}
+    for name, step in (('eski', legacy_frame), ('havuzlu', pooled_frame)):
+        peaks, _ = run(step, args.video, size, args.frames, inference_size, args.warmup, traced=True)
+        _, times = run(step, args.video, size, args.frames, inference_size, args.warmup, traced=False)
+        results[name] = peaks
+        print(f"  {name:<9} {np.median(peaks):9.2f} {peaks.max():8.2f}              "
+              f"{np.median(times):9.2f} {np.percentile(times, 99):7.2f}")
+    limit = args.limit
+    if limit is None:
+        # Her karede model girdisi boyutunda (küçültülmüşse o boyutta) bir dizi ayrılırsa yakalanır
+        input_ratio = 1.0 if inference_size is None else inference_size[0] * inference_size[1] / (size[0] * size[1])
+        limit = 0.75 * input_ratio
+    if args.check and np.median(results['havuzlu']) > limit:
+        print(f"HATA: havuzlu yol kare başına {np.median(results['havuzlu']):.3f} tam kare ayırıyor "
+              f"(sınır {limit:.3f})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
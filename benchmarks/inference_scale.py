@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deneme import AdvancedHandDrawing
+from inference import parse_size
+
+
+# Aynı video farklı tespit çözünürlüklerinde işlenir; tam çözünürlük referans alınır
+def read_frames(path, max_frames):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while max_frames is None or len(frames) < max_frames:
+        success, image = cap.read()
+        if not success:
+            break
+        frames.append(cv2.flip(image, 1))
+    cap.release()
+    return frames
+
+
+def run_scale(frames, inference_size):
+    hands = AdvancedHandDrawing(inference_size=inference_size)
+    # Model yükleme ve ilk çağrı maliyeti ölçüme girmez
+    hands.load_model((frames[0].shape[1], frames[0].shape[0]))
+    detections = []
+    elapsed = 0.0
+    for frame in frames:
+        start = time.perf_counter()
+        results = hands.process_frame(frame)
+        elapsed += time.perf_counter() - start
+        detections.append(hands.landmarks.update_normalized(results.points, frame.shape).copy())
+    return detections, elapsed
+
+
+def landmark_errors(reference, measured):
+    # Her referans el en yakın ölçülen elle eşlenir; ortalama piksel hatası (21 nokta)
+    errors = []
+    missed = 0
+    for ref_hands, got_hands in zip(reference, measured):
+        for ref in ref_hands:
+            if len(got_hands) == 0:
+                missed += 1
+                continue
+            dist = np.linalg.norm(got_hands[:, :, :2] - ref[:, :2], axis=2).mean(axis=1)
+            errors.append(dist.min())
+    return np.array(errors), missed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tespit çözünürlüğüne göre landmark hatası / hız")
+    parser.add_argument('video')
+    parser.add_argument('--sizes', default='960x540,640x360,320x180')
+    parser.add_argument('--max-frames', type=int, default=300)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.max_frames)
+    if not frames:
+        print("Video okunamadı")
+        return
+
+    reference, elapsed = run_scale(frames, None)
+    total_hands = sum(len(hands) for hands in reference)
+    h, w = frames[0].shape[:2]
+    print(f"{len(frames)} kare, {w}x{h}, referansta {total_hands} el")
+    print(f"{'boyut':>10} {'FPS':>8} {'ort. hata':>10} {'p95 hata':>10} {'kaçan el':>9}")
+    print(f"{'full':>10} {len(frames) / elapsed:8.1f} {0:10.2f} {0:10.2f} {0:9d}")
+
+    for size_text in args.sizes.split(','):
+        size = parse_size(size_text)
+        measured, elapsed = run_scale(frames, size)
+        errors, missed = landmark_errors(reference, measured)
+        mean_err = errors.mean() if len(errors) else float('nan')
+        p95_err = np.percentile(errors, 95) if len(errors) else float('nan')
+        print(f"{size_text:>10} {len(frames) / elapsed:8.1f} {mean_err:10.2f} {p95_err:10.2f} {missed:9d}")
+
+
+if __name__ == "__main__":
+    main()
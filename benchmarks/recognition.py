@@ -0,0 +1,92 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognizer import AsyncRecognizer, StrokeRecognizer, GLYPHS, UNKNOWN, resample
+
+# Vuruş tanıyıcının doğruluğu, vuruş başına süresi ve arka plan işçisiyle verimi.
+# Derlem verilmezse yerleşik şablonlar rastgele bozularak (eğme, ölçek, titreme, kare örneklemesi) üretilir.
+
+
+def synthetic_corpus(per_glyph=20, seed=0, min_movement=5.0):
+    # [(karakter, (m, 2) piksel noktaları)]; noktalar deneme2.py'deki gibi en az min_movement aralıklı
+    rng = np.random.default_rng(seed)
+    corpus = []
+    for label, variants in GLYPHS.items():
+        for k in range(per_glyph):
+            path = resample(variants[k % len(variants)], 64)
+            angle = np.radians(rng.uniform(-10, 10))
+            shear = rng.uniform(-0.15, 0.15)
+            scale = rng.uniform(80, 250) * np.array((rng.uniform(0.75, 1.25), 1.0))
+            matrix = np.array([[np.cos(angle), np.sin(angle)], [-np.sin(angle), np.cos(angle)]]) @ [[1, 0], [shear, 1]]
+            points = (path - 0.5) @ matrix * scale + rng.uniform(200, 600, 2)
+            # Yavaş titreme (el oynaması) ve ölçüm gürültüsü
+            points += np.cumsum(rng.normal(0, 0.6, points.shape), axis=0) + rng.normal(0, 1.0, points.shape)
+            kept = [points[0]]
+            for p in points[1:]:
+                if np.hypot(*(p - kept[-1])) >= min_movement:
+                    kept.append(p)
+            corpus.append((label, np.array(kept)))
+    return corpus
+
+
+def load_corpus(path):
+    # JSON: {"karakter": [[[x, y], ...], ...]} (StrokeRecognizer.save biçimi)
+    with open(path, encoding='utf-8') as f:
+        return [(label, np.asarray(stroke, dtype=np.float64)) for label, strokes in json.load(f).items()
+                for stroke in strokes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vuruş tanıma benchmark'ı")
+    parser.add_argument('--corpus', help="Etiketli vuruş derlemi (JSON); verilmezse sentetik")
+    parser.add_argument('--templates', help="Yerleşik şablonlara eklenecek şablon dosyası (JSON)")
+    parser.add_argument('--per-glyph', type=int, default=20, help="Sentetik derlemde karakter başına vuruş")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.per_glyph, args.seed)
+    recognizer = StrokeRecognizer()
+    if args.templates:
+        recognizer.load(args.templates)
+
+    start = time.perf_counter()
+    results = [recognizer.recognize(points) for _, points in corpus]
+    sync_us = (time.perf_counter() - start) / len(corpus) * 1e6
+
+    # Arka plan işçisi: ana thread'in submit maliyeti ve tüm derlemin bitme süresi
+    worker = AsyncRecognizer(recognizer)
+    start = time.perf_counter()
+    futures = [worker.submit(points) for _, points in corpus]
+    submit_us = (time.perf_counter() - start) / len(corpus) * 1e6
+    async_labels = [future.result()[0] for future in futures]
+    throughput = len(corpus) / (time.perf_counter() - start)
+    worker.close()
+
+    labels = [label for label, _ in corpus]
+    predicted = [label for label, _ in results]
+    correct = sum(p == t for p, t in zip(predicted, labels))
+    rejected = predicted.count(UNKNOWN)
+    print(f"{len(corpus)} vuruş, {len(recognizer)} şablon ({'derlem ' + args.corpus if args.corpus else 'sentetik'})")
+    print(f"  doğruluk        {correct / len(corpus):7.1%}   (reddedilen {rejected})")
+    print(f"  vuruş başına    {sync_us:7.1f} µs")
+    print(f"  submit (ana)    {submit_us:7.1f} µs")
+    print(f"  işçi verimi     {throughput:7.0f} vuruş/sn   {'aynı sonuç' if async_labels == predicted else 'FARKLI SONUÇ'}")
+
+    confusions = {}
+    for t, p in zip(labels, predicted):
+        if t != p:
+            confusions[(t, p)] = confusions.get((t, p), 0) + 1
+    if confusions:
+        worst = sorted(confusions.items(), key=lambda item: -item[1])[:8]
+        print("  en sık karışanlar: " + ", ".join(f"{t}->{p} ({c})" for (t, p), c in worst))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import make_backend
+from inference import model_input
+
+# Bölge takibinin kamera çözünürlüğüne göre kazancı: tam kare ile sabit boyutlu el bölgesi için
+# girdi hazırlama (kırpma + BGR->RGB) ve model çağrısı süreleri. Bölge, karenin görünümüdür (kopya yok).
+
+
+def time_calls(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return np.array(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bölge (ROI) takibi benchmark'ı")
+    parser.add_argument('--sizes', default='1280x720,1920x1080,3840x2160', help="Kamera çözünürlükleri")
+    parser.add_argument('--roi', type=int, default=384, help="Bölge kenarı (piksel)")
+    parser.add_argument('--backend', default='mediapipe', help="Landmark arka ucu (deneme.py --backend)")
+    parser.add_argument('--repeat', type=int, default=40)
+    args = parser.parse_args()
+
+    backend = make_backend(args.backend, 1)
+    rng = np.random.default_rng(0)
+    print(f"bölge {args.roi}x{args.roi}, arka uç {args.backend}, {os.cpu_count()} çekirdek")
+    print(f"  {'kare':<11} {'girdi tam':>10} {'bölge':>8} {'model tam':>10} {'bölge':>8} {'toplam kazanç':>14}")
+    for spec in args.sizes.split(','):
+        w, h = (int(v) for v in spec.split('x'))
+        frame = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        y0, x0 = (h - args.roi) // 2, (w - args.roi) // 2
+        crop = frame[y0:y0 + args.roi, x0:x0 + args.roi]
+        full_input = model_input(frame)
+        crop_input = model_input(crop)
+        backend.warm_up((w, h))
+        prep_full = time_calls(lambda: model_input(frame), args.repeat)
+        prep_roi = time_calls(lambda: model_input(crop), args.repeat)
+        model_full = time_calls(lambda: backend.detect(full_input), args.repeat)
+        model_roi = time_calls(lambda: backend.detect(crop_input), args.repeat)
+        total_full = np.median(prep_full) + np.median(model_full)
+        total_roi = np.median(prep_roi) + np.median(model_roi)
+        print(f"  {spec:<11} {np.median(prep_full):10.2f} {np.median(prep_roi):8.2f} "
+              f"{np.median(model_full):10.2f} {np.median(model_roi):8.2f} {total_full / total_roi:13.2f}x")
+    backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from canvas import DrawingCanvas
+from inference import parse_size
+from replay import LandmarkReplay
+from landmarks import (LandmarkBuffer, extended_fingers, finger_masks, hand_sizes, landmark_point,
+                       INDEX_TIP, THUMB_MCP)
+from fixtures import synthetic_stream, synthetic_frames, load_stream, save_stream
+
+# Her aşama kaydedilmiş/sentetik landmark akışıyla ayrı ayrı ölçülür; model çağrılmaz
+
+
+def summarize(samples_ns):
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    mean = ms.mean() if len(ms) else 0.0
+    return {
+        'samples': int(len(ms)),
+        'mean_ms': round(float(mean), 4),
+        'p50_ms': round(float(np.percentile(ms, 50)), 4) if len(ms) else 0.0,
+        'p95_ms': round(float(np.percentile(ms, 95)), 4) if len(ms) else 0.0,
+        'p99_ms': round(float(np.percentile(ms, 99)), 4) if len(ms) else 0.0,
+        'fps': round(1000.0 / mean, 1) if mean > 0 else 0.0,
+    }
+
+
+def pixel_hands(points, counts, shape):
+    # Normalize akışı piksel uzayındaki kare dizilerine çevirir (ölçüm dışında, bir kez)
+    buffer = LandmarkBuffer(points.shape[1])
+    return [buffer.update_normalized(points[i, :counts[i]], shape).copy() for i in range(len(points))]
+
+
+def timed(samples, fn, *args):
+    start = time.perf_counter_ns()
+    result = fn(*args)
+    samples.append(time.perf_counter_ns() - start)
+    return result
+
+
+def bench_advanced(stream, frames, shape, antialias=True):
+    from deneme import AdvancedHandDrawing
+
+    app = AdvancedHandDrawing(max_num_hands=max(len(h) for h in stream) or 1)
+    results = {}
+    work = np.empty_like(frames[0])
+
+    samples = []
+    gestures = []
+    for hands in stream:
+        def gesture_stage():
+            masks = finger_masks(extended_fingers(hands))
+            return [app.detect_gesture(masks[i], hands[i]) for i in range(len(hands))]
+        gestures.append(timed(samples, gesture_stage))
+    results['gesture'] = summarize(samples)
+
+    # Landmark filtresi tüm ellerin 21 landmark'ına tek çağrıda uygulanır (30 FPS zaman damgalarıyla)
+    samples = []
+    tips = []
+    for k, hands in enumerate(stream):
+        smoothed = timed(samples, app.tracker.filter.update, hands, None, k / 30)
+        tips.append([landmark_point(smoothed[i], INDEX_TIP) for i in range(len(hands))])
+    results['smoothing'] = summarize(samples)
+
+    # Çizgi çizimi ve birleştirme aynı tuval üzerinde, gerçek oturum sırasıyla
+    canvas = DrawingCanvas(shape, antialias=antialias)
+    stroke_samples, compose_samples = [], []
+    prev = {}
+    for k, hands in enumerate(stream):
+        start = time.perf_counter_ns()
+        for i, gesture in enumerate(gestures[k]):
+            tip = tips[k][i]
+            if gesture in ('draw', 'pinch_draw'):
+                if i in prev:
+                    canvas.line(prev[i], tip, (0, 255, 0), 5, key=i)
+                prev[i] = tip
+            elif gesture == 'erase':
+                canvas.erase(tip, 10, key=i)
+                prev.pop(i, None)
+            elif gesture == 'clear_canvas':
+                canvas.clear()
+                prev.pop(i, None)
+            else:
+                prev.pop(i, None)
+        stroke_samples.append(time.perf_counter_ns() - start)
+        np.copyto(work, frames[k % len(frames)])
+        timed(compose_samples, canvas.compose, work)
+    results['stroke'] = summarize(stroke_samples)
+    results['compositing'] = summarize(compose_samples)
+
+    samples = []
+    for k, hands in enumerate(stream):
+        if len(hands):
+            app.brush_thickness = app.adjust_brush_thickness(hand_sizes(hands)[0])
+        app.drawing_mode = bool(gestures[k]) and gestures[k][0] in ('draw', 'pinch_draw', 'erase')
+        app.eraser_mode = bool(gestures[k]) and gestures[k][0] == 'erase'
+        np.copyto(work, frames[k % len(frames)])
+        timed(samples, app.draw_ui, work)
+    results['ui'] = summarize(samples)
+
+    # Uçtan uca: model hariç tüm çizim hattı, temiz uygulama durumuyla
+    app = AdvancedHandDrawing(max_num_hands=app.landmarks.max_hands)
+    app.antialias = antialias
+    samples = []
+    for k, hands in enumerate(stream):
+        np.copyto(work, frames[k % len(frames)])
+        start = time.perf_counter_ns()
+        output = app.process_hands(work, hands, timestamp=k / 30)
+        app.draw_ui(output)
+        samples.append(time.perf_counter_ns() - start)
+    results['end_to_end'] = summarize(samples)
+    return results
+
+
+def bench_simple(stream, frames, shape, antialias=True):
+    from deneme2 import FingerDrawingApp
+
+    app = FingerDrawingApp()
+    app.verbose = False
+    results = {}
+    work = np.empty_like(frames[0])
+
+    samples = []
+    gestures = []
+    for hands in stream:
+        def gesture_stage():
+            extended = extended_fingers(hands[:1], thumb_base=THUMB_MCP)
+            return [app.detect_gesture(extended[i]) for i in range(len(extended))]
+        gestures.append(timed(samples, gesture_stage))
+    results['gesture'] = summarize(samples)
+
+    samples = []
+    tips = []
+    for k, hands in enumerate(stream):
+        tips.append(timed(samples, app.smooth_point, hands[0], k / 30) if len(hands) else None)
+    results['smoothing'] = summarize(samples)
+
+    canvas = DrawingCanvas(shape, antialias=antialias)
+    app.drawing_canvas = canvas
+    stroke_samples, compose_samples = [], []
+    prev = None
+    for k, tip in enumerate(tips):
+        start = time.perf_counter_ns()
+        if tip is not None and gestures[k] and gestures[k][0][0] == 'draw':
+            if prev is not None and app.distance(tip, prev) >= app.min_movement:
+                canvas.line(prev, tip, app.colors['draw'], app.brush_size)
+            prev = tip
+        else:
+            canvas.end_stroke(0)
+            prev = None
+        stroke_samples.append(time.perf_counter_ns() - start)
+        np.copyto(work, frames[k % len(frames)])
+        timed(compose_samples, app.compose, work)
+    results['stroke'] = summarize(stroke_samples)
+    results['compositing'] = summarize(compose_samples)
+
+    app = FingerDrawingApp()
+    app.verbose = False
+    app.drawing_canvas = DrawingCanvas(shape, antialias=antialias)
+    samples = []
+    for k, hands in enumerate(stream):
+        np.copyto(work, frames[k % len(frames)])
+        timed(samples, app.process_hands, work, hands[:1], None, k / 30)
+    results['end_to_end'] = summarize(samples)
+    return results
+
+
+def print_results(results, baseline=None):
+    for app_name, stages in results.items():
+        print(f"[{app_name}]")
+        print(f"  {'aşama':<12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'FPS':>9}  değişim(p50)")
+        for stage, stats in stages.items():
+            change = ''
+            if baseline is not None:
+                old = baseline.get(app_name, {}).get(stage)
+                if old and old['p50_ms'] > 0:
+                    change = f"{100 * (stats['p50_ms'] - old['p50_ms']) / old['p50_ms']:+.1f}%"
+            print(f"  {stage:<12} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f} "
+                  f"{stats['fps']:9.1f}  {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aşama bazlı çizim hattı benchmark'ı")
+    parser.add_argument('--apps', default='advanced,simple', help="advanced (deneme.py), simple (deneme2.py)")
+    parser.add_argument('--landmarks', help="Kaydedilmiş landmark akışı (.npz: points, counts veya --record kaydı)")
+    parser.add_argument('--save-landmarks', help="Kullanılan akışı .npz olarak kaydet")
+    parser.add_argument('--hands', type=int, default=1, help="Sentetik akıştaki el sayısı")
+    parser.add_argument('--repeat', type=int, default=3, help="Sentetik senaryonun tekrar sayısı")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=parse_size, default=(1280, 720))
+    parser.add_argument('--output', help="Sonuçları JSON olarak yaz")
+    parser.add_argument('--compare', help="Önceki JSON sonucuyla karşılaştır")
+    parser.add_argument('--no-antialias', action='store_true', help="Keskin kenarlı çizim ve maskeli birleştirme")
+    args = parser.parse_args()
+
+    if args.landmarks and args.landmarks.endswith('.npz'):
+        points, counts = load_stream(args.landmarks)
+    elif args.landmarks:
+        # replay.py kaydı (deneme.py --record ile alınan)
+        points, counts = LandmarkReplay(args.landmarks).as_stream()
+    else:
+        points, counts = synthetic_stream(args.hands, seed=args.seed, repeat=args.repeat)
+    if args.save_landmarks:
+        save_stream(args.save_landmarks, points, counts)
+
+    w, h = args.size
+    shape = (h, w, 3)
+    frames = synthetic_frames(shape, seed=args.seed)
+    stream = pixel_hands(points, counts, shape)
+
+    results = {}
+    for app_name in args.apps.split(','):
+        bench = bench_advanced if app_name == 'advanced' else bench_simple
+        results[app_name] = bench(stream, frames, shape, not args.no_antialias)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print(f"{len(stream)} kare, {w}x{h}")
+    print_results(results, baseline)
+
+    if args.output:
+        report = {
+            'meta': {
+                'frames': len(stream), 'size': [w, h], 'seed': args.seed,
+                'landmarks': args.landmarks or 'synthetic', 'antialias': not args.no_antialias,
+                'python': platform.python_version(), 'opencv': cv2.__version__, 'numpy': np.__version__,
+                'machine': platform.machine(), 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Sonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial import segment_distances
+from strokes import StrokeStore, LINE
+
+# Izgara indeksli silgi/seçim sorgusunun, tüm parçaları tarayan doğrusal sorguyla karşılaştırması
+
+
+def build_store(num_segments, size=(1280, 720), seed=0):
+    # Rastgele yürüyüşlerden oluşan, uzun bir oturumu andıran çizgiler
+    rng = np.random.default_rng(seed)
+    store = StrokeStore(size)
+    w, h = size
+    while store.num_points < num_segments:
+        n = int(rng.integers(20, 120))
+        start = rng.uniform((0, 0), (w, h))
+        steps = rng.normal(0, 6, (n, 2))
+        points = np.empty((n, 3), dtype=np.float32)
+        points[:, :2] = np.clip(start + np.cumsum(steps, axis=0), 0, (w - 1, h - 1))
+        points[:, 2] = rng.integers(2, 20)
+        store.append(points, (0, 255, 0), LINE)
+    return store
+
+
+def linear_hits(store, x, y, radius):
+    # İndekssiz karşılaştırma: tüm canlı parçalara uzaklık
+    ids = np.flatnonzero(store.alive[:store.num_points])
+    b = store.points[ids]
+    a = store.points[ids - 1]
+    hit = segment_distances(a[:, :2], b[:, :2], x, y) <= radius + b[:, 2] / 2
+    return ids[hit]
+
+
+def time_queries(fn, queries):
+    start = time.perf_counter()
+    for x, y, r in queries:
+        fn(x, y, r)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çizgi parçası ızgara indeksi benchmark'ı")
+    parser.add_argument('--segments', default='1000,10000,50000', help="Virgülle ayrılmış parça sayıları")
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--radius', type=float, default=20.0, help="Silgi yarıçapı (piksel)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"  {'parça':>8} {'ızgara µs':>10} {'doğrusal µs':>12} {'hızlanma':>9}  eşleşme")
+    for count in (int(c) for c in args.segments.split(',')):
+        store = build_store(count, seed=args.seed)
+        rng = np.random.default_rng(args.seed + 1)
+        queries = [(float(x), float(y), args.radius)
+                   for x, y in rng.uniform((0, 0), store.size, (args.queries, 2))]
+        same = all(np.array_equal(np.sort(store.segments_near(x, y, r)), linear_hits(store, x, y, r))
+                   for x, y, r in queries[:200])
+        grid_us = time_queries(store.segments_near, queries)
+        linear_us = time_queries(lambda x, y, r: linear_hits(store, x, y, r), queries)
+        print(f"  {store.num_points:>8} {grid_us:10.1f} {linear_us:12.1f} {linear_us / grid_us:8.1f}x  "
+              f"{'evet' if same else 'HAYIR'}")
+
+
+if __name__ == "__main__":
+    main()
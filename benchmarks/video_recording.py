@@ -0,0 +1,92 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_video import SessionVideoRecorder
+
+# Oturum kaydının kare döngüsüne maliyeti: senkron cv2.VideoWriter.write ile kodlayıcı thread'i karşılaştırılır.
+# Kare aralığı (--interval) kamera hızını taklit eder; kodlayıcı yetişemezse kareler atılır, ana thread beklemez.
+
+
+def make_frames(size, count, seed=0):
+    # Hareketli içerik (sabit kare kodlayıcıya fazla kolay gelir)
+    w, h = size
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+    base = cv2.GaussianBlur(base, (0, 0), 8)
+    frames = []
+    for i in range(count):
+        frame = np.roll(base, i * 7, axis=1)
+        cv2.circle(frame, (int(w / 2 + w / 3 * np.cos(i / 10)), int(h / 2 + h / 3 * np.sin(i / 10))), 30,
+                   (0, 255, 100), -1)
+        frames.append(frame)
+    return frames
+
+
+def wait_until(deadline):
+    # Kamera kare aralığı: kalan süre uyunur
+    remaining = deadline - time.perf_counter()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def percentiles(samples_ns):
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    return f"{np.percentile(ms, 50):8.3f} {np.percentile(ms, 99):8.3f} {ms.max():8.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Oturum videosu kayıt benchmark'ı")
+    parser.add_argument('--size', default='1280x720')
+    parser.add_argument('--frames', type=int, default=150)
+    parser.add_argument('--interval', type=float, default=1000 / 30, help="Kare aralığı (ms)")
+    parser.add_argument('--capacities', default='2,4,8,16', help="Denenecek halka tampon boyutları")
+    parser.add_argument('--extensions', default='.mp4,.avi,.bgr', help="Denenecek çıktı türleri")
+    args = parser.parse_args()
+
+    w, h = (int(v) for v in args.size.split('x'))
+    frames = make_frames((w, h), min(args.frames, 30))
+    interval = args.interval / 1000
+    out_dir = tempfile.mkdtemp(prefix="video_bench_")
+    print(f"{w}x{h}, {args.frames} kare, {args.interval:.1f} ms aralık, {os.cpu_count()} çekirdek")
+    print(f"  {'yol':<26} {'p50':>8} {'p99':>8} {'en çok':>8} {'atılan':>7}")
+
+    for ext in args.extensions.split(','):
+        path = os.path.join(out_dir, f"sync{ext}")
+        if ext in ('.mp4', '.avi'):
+            # Eski yol: kare döngüsünde senkron kodlama
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*('mp4v' if ext == '.mp4' else 'MJPG')),
+                                     30, (w, h))
+            samples = []
+            start = time.perf_counter()
+            for i in range(args.frames):
+                t = time.perf_counter_ns()
+                writer.write(frames[i % len(frames)])
+                samples.append(time.perf_counter_ns() - t)
+                wait_until(start + (i + 1) * interval)
+            writer.release()
+            print(f"  {'senkron ' + ext:<26} {percentiles(samples)} {0:>7}")
+
+        for capacity in (int(c) for c in args.capacities.split(',')):
+            video = SessionVideoRecorder(os.path.join(out_dir, f"ring{capacity}{ext}"), capacity=capacity)
+            samples = []
+            start = time.perf_counter()
+            for i in range(args.frames):
+                t = time.perf_counter_ns()
+                video.write(frames[i % len(frames)])
+                samples.append(time.perf_counter_ns() - t)
+                wait_until(start + (i + 1) * interval)
+            stats = video.close()
+            print(f"  {f'kuyruk {ext} (tampon {capacity})':<26} {percentiles(samples)} "
+                  f"{stats['dropped'] / stats['frames']:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
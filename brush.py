@@ -0,0 +1,168 @@
+import math
+
+import cv2
+import numpy as np
+
+# Alt piksel koordinatlar için sabit nokta kaydırması (cv2 shift parametresi)
+SHIFT = 4
+# Eğri örnekleme aralığı (piksel) ve parça başına en fazla örnek
+SAMPLE_STEP = 3.0
+MAX_SAMPLES = 16
+# Zaman damgası verilmeyen noktalar arasındaki varsayılan süre (30 FPS)
+NOMINAL_DT = 1 / 30
+
+
+def speed_width(base, prev_width, distance, dt, speed_ref=1500.0, smoothing=0.5):
+    # Hız arttıkça çizgi incelir (mürekkep kalemi gibi); ani kalınlık sıçramaları üstel ortalamayla yumuşatılır.
+    # distance: piksel, dt: saniye; hız speed_ref px/sn ve üstünde kalınlık tabanın yarısıdır
+    speed = distance / max(dt, 1e-3)
+    target = base * max(0.5, 1.0 - 0.5 * speed / speed_ref)
+    if prev_width is None:
+        return target
+    return prev_width + (target - prev_width) * smoothing
+
+
+# Catmull-Rom taban matrisi: P(t) = [1, t, t², t³] · M · [p0, p1, p2, p3]
+_CATMULL_ROM = 0.5 * np.array([[0, 2, 0, 0], [-1, 0, 1, 0], [2, -5, 4, -1], [-1, 3, -3, 1]])
+
+
+def _basis(k):
+    # k örnekli parça için (k, 4) ağırlıklar (t = 0, 1/k, ..., (k-1)/k); örnek sayısı başına bir kez hesaplanır
+    t = np.arange(k) / k
+    return np.stack((np.ones(k), t, t * t, t * t * t), axis=1) @ _CATMULL_ROM, t
+
+
+_BASES = [None] + [_basis(k) for k in range(1, MAX_SAMPLES + 1)]
+
+
+def sample_segments(points, ends, sx=1.0, sy=1.0):
+    # Catmull-Rom eğrisiyle (i-1, i) parçalarını örnekler; ends: parça bitiş indeksleri (artan sırada).
+    # Teğetler komşu noktalardan gelir, çizgi uçlarında uç nokta tekrarlanır; böylece bir parça
+    # sadece kendisi ve iki komşusuyla belirlenir, canlı ve yeniden çizim aynı eğriyi verir.
+    # Dönüş: her kesintisiz parça dizisi için (örnekler (m, 2) piksel, kalınlıklar (m,))
+    n = len(points)
+    if len(ends) == 1:
+        # Canlı çizimde her karede tek parça: numpy çağrıları en aza indirilir (sonuç toplu yolla aynı)
+        e = int(ends[0])
+        c = points[[max(e - 2, 0), e - 1, e, min(e + 1, n - 1)]]
+        if sx != 1.0 or sy != 1.0:
+            c = c * np.array((sx, sy, min(sx, sy)), dtype=np.float32)
+        (x1, y1, w1), (x2, y2, w2) = c[1].tolist(), c[2].tolist()
+        basis, t = _BASES[min(MAX_SAMPLES, max(1, math.ceil(math.hypot(x2 - x1, y2 - y1) / SAMPLE_STEP)))]
+        xy = np.empty((len(t) + 1, 2))
+        np.matmul(basis, c[:, :2], out=xy[:-1])
+        xy[-1] = x2, y2
+        widths = np.empty(len(t) + 1)
+        widths[:-1] = w1 + (w2 - w1) * t
+        widths[-1] = w2
+        return [(xy, widths)]
+    ends = np.asarray(ends, dtype=np.int64)
+    if not len(ends):
+        return []
+    # (m, 4, 3): p0, p1, p2, p3 kontrol noktaları
+    ctrl = points[np.stack((np.maximum(ends - 2, 0), ends - 1, ends, np.minimum(ends + 1, n - 1)), axis=1)]
+    if sx != 1.0 or sy != 1.0:
+        ctrl = ctrl * np.array((sx, sy, min(sx, sy)), dtype=np.float32)
+    delta = ctrl[:, 2, :2] - ctrl[:, 1, :2]
+    counts = np.clip(np.ceil(np.hypot(delta[:, 0], delta[:, 1]) / SAMPLE_STEP), 1, MAX_SAMPLES).astype(np.int64)
+
+    # Aynı örnek sayılı parçalar tek matris çarpımıyla örneklenir
+    offsets = np.cumsum(counts) - counts
+    xy = np.empty((int(counts.sum()), 2))
+    widths = np.empty(len(xy))
+    for k in np.unique(counts).tolist():
+        sel = np.flatnonzero(counts == k)
+        basis, t = _BASES[k]
+        rows = (offsets[sel][:, None] + np.arange(k)).ravel()
+        xy[rows] = (basis @ ctrl[sel, :, :2]).reshape(-1, 2)
+        w1 = ctrl[sel, 1, 2, None].astype(np.float64)
+        widths[rows] = (w1 + (ctrl[sel, 2, 2, None] - w1) * t).ravel()
+
+    # Ardışık parçalar tek çoklu çizgi; son parçanın bitiş noktası (t = 1) eklenir
+    breaks = np.flatnonzero(np.diff(ends) != 1) + 1
+    runs = []
+    for first, last in zip([0] + breaks.tolist(), breaks.tolist() + [len(ends)]):
+        lo, hi = offsets[first], offsets[last - 1] + counts[last - 1]
+        runs.append((np.concatenate((xy[lo:hi], ctrl[last - 1, 2:3, :2])), np.append(widths[lo:hi], ctrl[last - 1, 2, 2])))
+    return runs
+
+
+class StrokeBatch:
+    # Bir karede çizilecek eğrileri (renk, kalınlık) gruplarında toplar.
+    # draw() grup başına tek cv2.polylines çağrısı yapar (kenar yumuşatmalı, alt piksel).
+    # cv2.fillPoly tek çağrıdaki çokgenleri çift-tek kuralıyla doldurduğundan üst üste binen
+    # parçalar delik bırakır; polylines her parçayı ayrı doldurur, birleşimler dolu kalır.
+    def __init__(self, line_type=cv2.LINE_AA):
+        self.line_type = line_type
+        self.groups = {}
+        self.bounds = []
+        self.last_color = None
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def needs_flush(self, color):
+        # Aynı renk araya başka renk girdikten sonra gelirse önce çizilmelidir (üst üste binme sırası korunur)
+        color = tuple(int(v) for v in color)
+        return color != self.last_color and any(key[0] == color for key in self.groups)
+
+    def add(self, xy, widths, color):
+        # xy: (m, 2) piksel koordinatları; i. örneğin kalınlığı (i-1, i) alt parçasına aittir
+        if len(xy) < 2:
+            return
+        fixed = np.rint(xy * (1 << SHIFT)).astype(np.int32)
+        thickness = np.rint(widths[1:]).astype(np.int64).tolist()
+        color = self.last_color = tuple(int(v) for v in color)
+        start = 0
+        for end in range(1, len(xy)):
+            # Kalınlığı aynı olan ardışık alt parçalar tek eğri
+            if end == len(xy) - 1 or thickness[end] != thickness[end - 1]:
+                self.groups.setdefault((color, max(1, thickness[end - 1])), []).append(fixed[start:end + 1])
+                start = end
+        pad = max(thickness) / 2 + 2
+        x0, y0 = xy.min(axis=0) - pad
+        x1, y1 = xy.max(axis=0) + pad
+        self.bounds.append((x0, y0, x1, y1))
+
+    def draw(self, image, alpha=None, offset=(0, 0)):
+        # image: önceden çarpılmış (premultiplied) renk, alpha: kaplama. AA karışımı ikisinde de "üstüne" işlemidir.
+        # offset: hedef görüntünün köşesi (tam sayı), bölge tamponlarına çizerken
+        shift = np.array(offset, dtype=np.int32) << SHIFT
+        for (color, thickness), curves in self.groups.items():
+            if shift.any():
+                curves = [curve - shift for curve in curves]
+            cv2.polylines(image, curves, False, color, thickness, self.line_type, SHIFT)
+            if alpha is not None:
+                cv2.polylines(alpha, curves, False, 255, thickness, self.line_type, SHIFT)
+
+    def clear(self):
+        self.groups.clear()
+        self.bounds.clear()
+        self.last_color = None
+
+
+def curve_boxes(points, ends, first=0, last=None):
+    # sample_segments eğrilerinin kalınlık dahil sınır kutuları (x0, y0, x1, y1).
+    # Catmull-Rom parçası, kontrol noktaları b, b + (c - a) / 6, c - (d - b) / 6, c olan Bezier eğrisidir
+    # ve bu noktaların dışbükey zarfında kalır. first/last: parçanın çizgisinin ilk/son nokta indeksi
+    if last is None:
+        last = len(points) - 1
+    ends = np.asarray(ends, dtype=np.int64)
+    a = points[np.maximum(ends - 2, first), :2]
+    b = points[ends - 1, :2]
+    c = points[ends, :2]
+    d = points[np.minimum(ends + 1, last), :2]
+    hull = np.stack((b, b + (c - a) / 6, c - (d - b) / 6, c))
+    pad = (np.maximum(points[ends - 1, 2], points[ends, 2]) / 2 + 2)[:, None]
+    return np.concatenate((hull.min(axis=0) - pad, hull.max(axis=0) + pad), axis=1)
+
+
+def draw_dots(image, alpha, points, color, sx=1.0, sy=1.0, offset=(0, 0), line_type=cv2.LINE_AA):
+    # Dolu daireler (DOTS çizgileri); yarıçap nokta kalınlık sütunundadır
+    scale = min(sx, sy)
+    centers = np.rint((points[:, :2] * (sx, sy) - offset) * (1 << SHIFT)).astype(np.int32)
+    for (x, y), radius in zip(centers.tolist(), points[:, 2].tolist()):
+        r = max(1, int(round(radius * scale * (1 << SHIFT))))
+        cv2.circle(image, (x, y), r, color, -1, line_type, SHIFT)
+        if alpha is not None:
+            cv2.circle(alpha, (x, y), r, 255, -1, line_type, SHIFT)
@@ -1,68 +1,56 @@
-import mediapipe as mp
 import cv2
 import numpy as np
-import tempfile
-import os
 import math
 import time
-from collections import deque
+import argparse
+from pipeline import FramePipeline
+from canvas import DrawingCanvas
+from ui import UILayer
+from inference import FramePool, InputBuffer, parse_size, start_capture, CAMERA_SIZE
+from backends import SolutionsBackend, make_backend, parse_backend
+from roi import RoiTracker
+from prediction import SkippingDetector
+from metrics import DISABLED, add_metrics_args, metrics_from_args
+from replay import LandmarkRecorder
+from export import ExportQueue, parse_formats
+from session_video import SessionVideoRecorder
+from tracking import HandTracker
+from filters import parse_filter
+from landmarks import (LandmarkBuffer, extended_fingers, finger_masks, hand_sizes,
+                       landmark_point, draw_hand_skeleton, THUMB_TIP, INDEX_TIP)
 
 class AdvancedHandDrawing:
     def __init__(self,
                  static_image_mode=False,
                  max_num_hands=2,
                  min_detection_confidence=0.7,
-                 min_tracking_confidence=0.7):
-
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_drawing_styles = mp.solutions.drawing_styles
-        self.mp_hands = mp.solutions.hands
-
-        # .binarypb hatasını atlatmak için custom temp graph yoksa normal yolla patlarsın 
-        graph_str = f"""
-        input_stream: "input_video"
-        output_stream: "multi_hand_landmarks"
-        output_stream: "multi_handedness"
-        node {{
-          calculator: "FlowLimiterCalculator"
-          input_stream: "input_video"
-          input_stream: "FINISHED:multi_hand_landmarks"
-          input_stream_info: {{
-            tag_index: "FINISHED"
-            back_edge: true
-          }}
-          output_stream: "throttled_input_video"
-        }}
-        node {{
-          calculator: "PalmDetectionCalculator"
-          input_stream: "IMAGE:throttled_input_video"
-          output_stream: "DETECTIONS:palm_detections"
-        }}
-        node {{
-          calculator: "HandLandmarkCpu"
-          input_stream: "IMAGE:throttled_input_video"
-          input_stream: "DETECTIONS:palm_detections"
-          output_stream: "LANDMARKS:multi_hand_landmarks"
-          output_stream: "HANDEDNESS:multi_handedness"
-        }}
-        """
-
-        tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pbtxt")
-        tmp_file.write(graph_str.encode("utf-8"))
-        tmp_file.close()
-
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=static_image_mode,
-            max_num_hands=max_num_hands,
+                 min_tracking_confidence=0.7,
+                 inference_size=None,
+                 gesture_window=10,
+                 gesture_hysteresis=1,
+                 gesture_dwell=0.0,
+                 smoothing='one_euro',
+                 backend=None,
+                 roi=None,
+                 mirror=False):
+
+        # Landmark arka ucu (backends.py); model ilk tespitte ya da load_model ile yüklenir,
+        # replay ve benchmark gibi modelsiz kullanımlar bu maliyeti hiç ödemez
+        self.backend = backend if backend is not None else SolutionsBackend(
+            max_num_hands, static_image_mode=static_image_mode,
             min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
+            min_tracking_confidence=min_tracking_confidence)
 
-        os.remove(tmp_file.name)
+        self.inference_size = inference_size
+        # Model girdisi (küçültme + BGR->RGB) her karede aynı tamponlara yazılır
+        self.input_buffer = InputBuffer()
+        # Bölge takibi (roi.py): model önceki landmark'lardan çıkarılan kırpıntıyı görür; None: tam kare
+        self.roi = roi
+        self.set_mirror(mirror)
 
         # Çizim için değişkenler
         self.drawing_canvas = None
-        self.prev_x, self.prev_y = None, None
+        # Aşağıdaki dört alan UI içindir: son işlenen ilk elin durumunu gösterir
         self.drawing_mode = False
         self.current_color = (0, 255, 0)  # Yeşil
         self.brush_thickness = 5
@@ -81,153 +69,123 @@ class AdvancedHandDrawing:
         }
         
         
-        self.gesture_buffer = deque(maxlen=10)
-        self.last_gesture_time = time.time()
-        
+        # El başına çizgi, renk, fırça, yumuşatma ve kararlı jest durumu (slot tabanlı)
+        # smoothing: landmark filtresi (filters.py), her el kendi slotunda filtrelenir
+        self.tracker = HandTracker(max_num_hands, smoothing=smoothing, gesture_window=gesture_window,
+                                   gesture_hysteresis=gesture_hysteresis, gesture_dwell=gesture_dwell)
+        # Tuval ortak olduğu için temizleme bekleme süresi de ortak (kare zamanı; ilk karede başlar)
+        self.last_clear_time = None
         
-        self.finger_positions = deque(maxlen=5)
+        # Her karede yeniden kullanılan landmark dizisi
+        self.landmarks = LandmarkBuffer(max_num_hands)
+        # Son karede her el için uygulanan jest (kayıt/toplu işlem için)
+        self.last_gestures = []
         
         # UI elementleri
         self.show_ui = True
+        # 's' ile kayıt ve otomatik kayıt arka planda yazılır (biçimler, ölçek, periyot)
+        self.exports = ExportQueue()
+        # Kenar yumuşatmalı çizgiler (kapalıyken keskin kenar, daha hızlı birleştirme)
+        self.antialias = True
         self.ui_alpha = 0.7
+        self.ui_layer = UILayer(self.ui_alpha)
+
+    def set_mirror(self, mirror):
+        # Ekran aynalı (selfie) gösterilecekse kare modele çevrilmeden verilir, landmark x'leri çevrilir;
+        # pikseller tespitten sonra yerinde aynalanır (mirror_frame)
+        self.mirror = mirror
+        self.backend.mirror = mirror
+        if self.roi is not None:
+            self.roi.mirror = mirror and self.backend.uses_image
 
     def process_frame(self, image):
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(image_rgb)
-        return results
+        if self.roi is None:
+            return self.detect(self.prepare_input(image))
+        crop, box = self.roi.crop(image)
+        model_input_image = self.input_buffer(crop, self.roi.input_size(crop, image.shape, self.inference_size))
+        return self.roi.update(self.detect(model_input_image), box, image.shape)
+
+    def prepare_input(self, image):
+        # inference_size verilmişse tespit küçültülmüş karede yapılır, çizim tam çözünürlükte kalır.
+        # Dönen dizi bir sonraki çağrıda üzerine yazılır
+        return self.input_buffer(image, self.inference_size)
+
+    def load_model(self, warm_up_size=None):
+        # warm_up_size verilirse model sentetik bir karede ısıtılır (tespit çözünürlüğü önceliklidir)
+        self.backend.load()
+        if warm_up_size is not None:
+            self.backend.warm_up(self.inference_size or warm_up_size)
+        return self.backend
+
+    def detect(self, image_rgb):
+        # HandDetection: normalize landmark'lar ve el etiketleri
+        return self.backend.detect(image_rgb)
 
     def calculate_distance(self, point1, point2):
         return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
 
-    def get_finger_positions(self, landmarks, image_shape):
-        h, w = image_shape[:2]
-        positions = {}
-        
-        # Parmak uçları landmark indeksleri
-        finger_tips = {
-            'thumb': 4,
-            'index': 8,
-            'middle': 12,
-            'ring': 16,
-            'pinky': 20
-        }
-        
-        # Parmak diplerinin landmark indeksleri
-        finger_bases = {
-            'thumb': 3,
-            'index': 6,
-            'middle': 10,
-            'ring': 14,
-            'pinky': 18
-        }
-        
-        for finger, tip_idx in finger_tips.items():
-            tip = landmarks.landmark[tip_idx]
-            base = landmarks.landmark[finger_bases[finger]]
-            
-            positions[finger] = {
-                'tip': (int(tip.x * w), int(tip.y * h)),
-                'base': (int(base.x * w), int(base.y * h)),
-                'extended': tip.y < base.y if finger != 'thumb' else tip.x > base.x
-            }
-        
-        return positions
-
-    def detect_gesture(self, finger_positions):
-        # Hangi parmaklar açık(daha geliştirilebilir)
-        extended_fingers = [finger for finger, data in finger_positions.items() if data['extended']]
-        
-        
-        if len(extended_fingers) == 1 and 'index' in extended_fingers:
+    def detect_gesture(self, finger_mask, hand_points):
+        # Hangi parmaklar açık(daha geliştirilebilir) - bit maskesi: thumb=1, index=2, middle=4, ring=8, pinky=16
+        if finger_mask == 0b00010:
             return 'draw'
-        elif len(extended_fingers) == 2 and 'index' in extended_fingers and 'thumb' in extended_fingers:
+        elif finger_mask == 0b00011:
             
-            thumb_tip = finger_positions['thumb']['tip']
-            index_tip = finger_positions['index']['tip']
-            distance = self.calculate_distance(thumb_tip, index_tip)
+            distance = self.calculate_distance(hand_points[THUMB_TIP], hand_points[INDEX_TIP])
             if distance < 40:
                 return 'pinch_draw'
             else:
                 return 'stop'
-        elif len(extended_fingers) == 2 and 'index' in extended_fingers and 'middle' in extended_fingers:
+        elif finger_mask == 0b00110:
             return 'erase'
-        elif len(extended_fingers) == 3 and 'index' in extended_fingers and 'middle' in extended_fingers and 'ring' in extended_fingers:
+        elif finger_mask == 0b01110:
             return 'color_change'
-        elif len(extended_fingers) == 5:
+        elif finger_mask == 0b11111:
             return 'clear_canvas'
-        elif len(extended_fingers) == 0:
+        elif finger_mask == 0:
             return 'fist'
         else:
             return 'stop'
 
-    def smooth_position(self, new_pos):
-        self.finger_positions.append(new_pos)
-        if len(self.finger_positions) < 3:
-            return new_pos
-        
-        # Ortalama pozisyon hesapla
-        avg_x = sum(pos[0] for pos in self.finger_positions) // len(self.finger_positions)
-        avg_y = sum(pos[1] for pos in self.finger_positions) // len(self.finger_positions)
-        return (avg_x, avg_y)
-
     def change_color_based_on_position(self, finger_tip, image_shape):
         h, w = image_shape[:2]
         x, y = finger_tip
         
         
         if x < w // 4:
-            self.current_color = self.colors['red']
+            return self.colors['red']
         elif x < w // 2:
-            self.current_color = self.colors['green']
+            return self.colors['green']
         elif x < 3 * w // 4:
-            self.current_color = self.colors['blue']
+            return self.colors['blue']
         else:
-            self.current_color = self.colors['yellow']
+            return self.colors['yellow']
 
-    def adjust_brush_thickness(self, hand_landmarks, image_shape):
-        # El büyüklüğüne göre fırça kalınlığını ayarla
-        h, w = image_shape[:2]
-        
-       
-        wrist = hand_landmarks.landmark[0]
-        middle_tip = hand_landmarks.landmark[12]
-        
-        wrist_pos = (int(wrist.x * w), int(wrist.y * h))
-        middle_pos = (int(middle_tip.x * w), int(middle_tip.y * h))
-        
-        hand_size = self.calculate_distance(wrist_pos, middle_pos)
-        
+    def adjust_brush_thickness(self, hand_size):
+        # El büyüklüğüne (bilek - orta parmak ucu) göre fırça kalınlığı
         # Kalınlığı 2-20 piksel arasında ayarla(opsiyonel)
-        self.brush_thickness = max(2, min(20, int(hand_size / 10)))
+        return max(2, min(20, int(hand_size / 10)))
 
-    def draw_ui(self, image):
-        if not self.show_ui:
-            return
-        
-        h, w = image.shape[:2]
-        overlay = image.copy()
-        
+    def palette_ops(self):
         # Renk paleti
+        ops = []
         color_names = ['red', 'green', 'blue', 'yellow', 'purple', 'cyan', 'white', 'black']
         for i, color_name in enumerate(color_names):
             x = 20 + i * 60
             y = 20
             color = self.colors[color_name]
-            cv2.rectangle(overlay, (x, y), (x + 50, y + 30), color, -1)
+            ops.append(('rect', (x, y), (x + 50, y + 30), color, -1))
             if color == self.current_color:
-                cv2.rectangle(overlay, (x-2, y-2), (x + 52, y + 32), (255, 255, 255), 2)
-        
-        # Mod göstergesi
-        mode_text = "ÇIZIM" if self.drawing_mode else "DURDUR"
-        if self.eraser_mode:
-            mode_text = "SİLGİ"
-        
-        cv2.putText(overlay, mode_text, (20, h - 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        
-        # Fırça kalınlığı
-        cv2.putText(overlay, f"Kalinlik: {self.brush_thickness}", (20, h - 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        
-       
+                ops.append(('rect', (x-2, y-2), (x + 52, y + 32), (255, 255, 255), 2))
+        return ops
+
+    def status_ops(self, mode_text, h):
+        return [
+            ('text', mode_text, (20, h - 30), 1, (255, 255, 255), 2),
+            # Fırça kalınlığı
+            ('text', f"Kalinlik: {self.brush_thickness}", (20, h - 60), 0.7, (255, 255, 255), 2),
+        ]
+
+    def help_ops(self, w):
         help_texts = [
             "1 parmak: Ciz",
             "2 parmak (V): Silgi",
@@ -235,117 +193,187 @@ class AdvancedHandDrawing:
             "5 parmak: Temizle",
             "Yumruk: Durdur"
         ]
+        return [('text', text, (w - 250, 30 + i * 25), 0.5, (255, 255, 255), 1)
+                for i, text in enumerate(help_texts)]
+
+    def draw_ui(self, image):
+        if not self.show_ui:
+            return
         
-        for i, text in enumerate(help_texts):
-            cv2.putText(overlay, text, (w - 250, 30 + i * 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        h, w = image.shape[:2]
         
-        # Overlay'i ana görüntüye karıştır
-        cv2.addWeighted(overlay, self.ui_alpha, image, 1 - self.ui_alpha, 0, image)
+        # Mod göstergesi
+        mode_text = "ÇIZIM" if self.drawing_mode else "DURDUR"
+        if self.eraser_mode:
+            mode_text = "SİLGİ"
+        
+        # Sprite'lar sadece içerikleri değiştiğinde yeniden çizilir
+        self.ui_layer.alpha = self.ui_alpha
+        self.ui_layer.sprite('palette', self.current_color, self.palette_ops)
+        self.ui_layer.sprite('status', (mode_text, self.brush_thickness, h),
+                             lambda: self.status_ops(mode_text, h))
+        self.ui_layer.sprite('help', w, lambda: self.help_ops(w))
+        
+        # Overlay'i sadece UI'nin kapladığı bölgelerde ana görüntüye karıştır
+        self.ui_layer.blend(image, ('palette', 'status', 'help'))
 
-    def process_drawing(self, image, results):
-        h, w = image.shape[:2]
+    def process_drawing(self, image, detection, timestamp=None):
+        # Tüm eller için landmark'lar tek seferde piksel uzayına çevrilir.
+        # timestamp: kare zamanı (toplu işlemde video zamanı); yoksa duvar saati
+        hands = self.landmarks.update_normalized(detection.points, image.shape)
+        hand_ids = detection.labels()
+        return self.process_hands(image, hands, detection.multi_hand_landmarks,
+                                  hand_ids[:len(hands)] if hand_ids else None, timestamp)
+
+    def process_hands(self, image, hands, multi_hand_landmarks=None, hand_ids=None, timestamp=None):
+        # hands: piksel uzayında (n, 21, 3) landmark'lar; tahmin edilen karelerde
+        # MediaPipe sonucu olmadığından multi_hand_landmarks None olur.
+        # hand_ids: el etiketleri ('Left'/'Right'); yoksa eller sadece konumla eşleştirilir
+        # timestamp: kare zamanı (saniye, monotonik); kayıttan oynatırken kayıttaki zaman verilir
         
         # Canvas oluştur
         if self.drawing_canvas is None:
-            self.drawing_canvas = np.zeros((h, w, 3), dtype=np.uint8)
-        
-        current_time = time.time()
-        
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Parmak pozisyonlarını al
-                finger_positions = self.get_finger_positions(hand_landmarks, image.shape)
-                
+            self.drawing_canvas = DrawingCanvas(image.shape, antialias=self.antialias)
+        elif self.drawing_canvas.shape[:2] != image.shape[:2]:
+            # Boyut değişti: raster vektör çizgilerden yeni boyutta yeniden üretilir
+            self.drawing_canvas.resize(image.shape)
+        
+        # Filtreler, jest bekleme süreleri ve soğuma süreleri aynı kare zamanını kullanır
+        now = time.monotonic() if timestamp is None else timestamp
+        if self.last_clear_time is None:
+            self.last_clear_time = now
+        self.last_gestures = []
+        sizes = hand_sizes(hands) if len(hands) else ()
+        tracks = self.tracker.assign(hands, sizes, hand_ids, now, self.current_color)
+        
+        if len(hands):
+            masks = finger_masks(extended_fingers(hands))
+            # Tüm ellerin landmark'ları tek seferde filtrelenir
+            smoothed = self.tracker.smooth(hands, tracks, now)
+            
+            for i, track in enumerate(tracks):
+                if track is None:
+                    continue
                 # Gesture tanı
-                gesture = self.detect_gesture(finger_positions)
-                self.gesture_buffer.append(gesture)
+                gesture = self.detect_gesture(masks[i], hands[i])
                 
                 # Fırça kalınlığını ayarla
-                self.adjust_brush_thickness(hand_landmarks, image.shape)
+                track.brush_thickness = self.adjust_brush_thickness(sizes[i])
                 
                 # En yaygın gesture'ı kullan (stabilite için yoksa çok saçmalıyor)
-                if len(self.gesture_buffer) >= 5:
-                    most_common_gesture = max(set(self.gesture_buffer), key=self.gesture_buffer.count)
-                else:
-                    most_common_gesture = gesture
+                most_common_gesture = track.gesture.update(gesture, now)
+                self.last_gestures.append(most_common_gesture)
                 
                 # Index finger pozisyonu
-                index_tip = finger_positions['index']['tip']
-                smooth_tip = self.smooth_position(index_tip)
+                smooth_tip = landmark_point(smoothed[i], INDEX_TIP)
                 
                 # Gesture işlemleri
                 if most_common_gesture == 'draw' or most_common_gesture == 'pinch_draw':
-                    self.drawing_mode = True
-                    self.eraser_mode = False
+                    track.drawing_mode = True
+                    track.eraser_mode = False
                     
-                    if self.prev_x is not None and self.prev_y is not None:
-                        cv2.line(self.drawing_canvas, (self.prev_x, self.prev_y), smooth_tip, 
-                                self.current_color, self.brush_thickness)
+                    if track.prev is not None:
+                        # Kalınlık gerçek hıza göre (kare zamanı; düşük/değişken FPS'te de aynı)
+                        self.drawing_canvas.line(track.prev, smooth_tip, track.color, track.brush_thickness,
+                                                 key=track.slot, timestamp=now)
                     
-                    self.prev_x, self.prev_y = smooth_tip
+                    track.prev = smooth_tip
                     
                 elif most_common_gesture == 'erase':
-                    self.drawing_mode = True
-                    self.eraser_mode = True
+                    track.drawing_mode = True
+                    track.eraser_mode = True
                     
-                    if self.prev_x is not None and self.prev_y is not None:
-                        cv2.circle(self.drawing_canvas, smooth_tip, self.brush_thickness * 2, (0, 0, 0), -1)
+                    if track.prev is not None:
+                        # Sadece dokunulan çizgi parçaları silinir, alttaki çizim korunur
+                        self.drawing_canvas.erase(smooth_tip, track.brush_thickness * 2, key=track.slot)
                     
-                    self.prev_x, self.prev_y = smooth_tip
+                    track.prev = smooth_tip
                     
                 elif most_common_gesture == 'color_change':
-                    if current_time - self.last_gesture_time > 1.0:  # 1 saniye cooldown
-                        self.change_color_based_on_position(smooth_tip, image.shape)
-                        self.last_gesture_time = current_time
-                    self.drawing_mode = False
-                    self.prev_x, self.prev_y = None, None
+                    if now - track.last_gesture_time > 1.0:  # 1 saniye cooldown
+                        track.color = self.change_color_based_on_position(smooth_tip, image.shape)
+                        track.last_gesture_time = now
+                    track.drawing_mode = False
+                    track.prev = None
                     
                 elif most_common_gesture == 'clear_canvas':
-                    if current_time - self.last_gesture_time > 2.0:  # 2 saniye cooldown
-                        self.drawing_canvas = np.zeros((h, w, 3), dtype=np.uint8)
-                        self.last_gesture_time = current_time
-                    self.drawing_mode = False
-                    self.prev_x, self.prev_y = None, None
+                    if now - self.last_clear_time > 2.0:  # 2 saniye cooldown
+                        self.drawing_canvas.clear()
+                        self.last_clear_time = now
+                    track.drawing_mode = False
+                    track.prev = None
                     
                 else:
-                    self.drawing_mode = False
-                    self.eraser_mode = False
-                    self.prev_x, self.prev_y = None, None
+                    track.stop_stroke()
                 
                 # El çizgilerini göster
-                if self.show_ui:
-                    self.mp_drawing.draw_landmarks(
-                        image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                        self.mp_drawing_styles.get_default_hand_connections_style())
+                if self.show_ui and multi_hand_landmarks is not None:
+                    # MediaPipe sonucu varsa modül zaten yüklüdür
+                    import mediapipe as mp
+                    mp.solutions.drawing_utils.draw_landmarks(
+                        image, multi_hand_landmarks[i], mp.solutions.hands.HAND_CONNECTIONS,
+                        mp.solutions.drawing_styles.get_default_hand_landmarks_style(),
+                        mp.solutions.drawing_styles.get_default_hand_connections_style())
+                elif self.show_ui:
+                    draw_hand_skeleton(image, hands[i])
                 
                 # Aktif parmagı vurgula
-                if self.drawing_mode:
-                    cv2.circle(image, smooth_tip, 10, self.current_color, -1)
+                if track.drawing_mode:
+                    cv2.circle(image, smooth_tip, 10, track.color, -1)
                     cv2.circle(image, smooth_tip, 12, (255, 255, 255), 2)
+        
+        # Çizgisi kopan ellerin açık çizgileri vektör deposuna kapatılır
+        for track in self.tracker.tracks:
+            if track.prev is None:
+                self.drawing_canvas.end_stroke(track.slot)
+        
+        # UI ilk elin durumunu gösterir
+        focus = next((track for track in tracks if track is not None), None)
+        if focus is not None:
+            self.drawing_mode = focus.drawing_mode
+            self.eraser_mode = focus.eraser_mode
+            self.current_color = focus.color
+            self.brush_thickness = focus.brush_thickness
         else:
             self.drawing_mode = False
-            self.prev_x, self.prev_y = None, None
         
-        # Canvası ana görntüye ekle
-        mask = cv2.cvtColor(self.drawing_canvas, cv2.COLOR_BGR2GRAY)
-        mask = cv2.threshold(mask, 1, 255, cv2.THRESH_BINARY)[1]
-        mask_inv = cv2.bitwise_not(mask)
-        
-        image_bg = cv2.bitwise_and(image, image, mask=mask_inv)
-        canvas_fg = cv2.bitwise_and(self.drawing_canvas, self.drawing_canvas, mask=mask)
-        
-        result = cv2.add(image_bg, canvas_fg)
-        
-        return result
+        # Canvası ana görntüye ekle (sadece değişen/mürekkepli bölgeler işlenir)
+        return self.drawing_canvas.compose(image)
 
-def run_advanced_drawing():
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-    
-    advanced_hands = AdvancedHandDrawing()
-    
+def open_capture(source):
+    cap = cv2.VideoCapture(source)
+    if isinstance(source, int):
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_SIZE[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_SIZE[1])
+    return cap
+
+def open_with_model(advanced_hands, source, metrics=DISABLED):
+    # Kamera açılırken model arka planda yüklenip ısıtılır; ilk kare model yükleme gecikmesi taşımaz
+    return start_capture(lambda: open_capture(source), lambda: advanced_hands.load_model(CAMERA_SIZE), metrics)
+
+def save_drawing(advanced_hands):
+    # Anlık görüntü alınır, kodlama ve yazma arka planda (kare döngüsü beklemez).
+    # Ölçek > 1 ise raster vektörlerden yüksek çözünürlükte üretilir
+    if advanced_hands.drawing_canvas is not None:
+        advanced_hands.exports.save(advanced_hands.drawing_canvas, f"drawing_{int(time.time())}")
+
+def handle_key(advanced_hands, key, metrics=DISABLED):
+    # False dönerse döngüden çıkılır
+    if key == 27:  # ESC
+        return False
+    elif key == ord('u'):  # UI toggle
+        advanced_hands.show_ui = not advanced_hands.show_ui
+    elif key == ord('m'):  # FPS/gecikme göstergesi
+        metrics.overlay = not metrics.overlay
+    elif key == ord('s'):  # Save
+        save_drawing(advanced_hands)
+    elif key == ord('z') and advanced_hands.drawing_canvas is not None:  # Geri al
+        advanced_hands.drawing_canvas.undo()
+    elif key == ord('y') and advanced_hands.drawing_canvas is not None:  # Yinele
+        advanced_hands.drawing_canvas.redo()
+    return True
+
+def print_controls():
     print("=== GELİŞMİŞ EL ÇİZİM SİSTEMİ ===")
     print("Kontroller:")
     print("- 1 parmak (işaret): Çizim yap")
@@ -355,40 +383,265 @@ def run_advanced_drawing():
     print("- Yumruk: Çizimi durdur")
     print("- 'u' tuşu: UI'yi aç/kapat")
     print("- 's' tuşu: Çizimi kaydet")
+    print("- 'z' / 'y' tuşu: Geri al / Yinele")
+    print("- 'm' tuşu: FPS/gecikme göstergesi (--metrics ile)")
     print("- ESC: Çıkış")
     print("=" * 40)
 
+def mirror_frame(advanced_hands, image):
+    # Tespitten sonra ekran için yerinde aynalama (yeni kare ayrılmaz); landmark'lar zaten aynalı
+    if advanced_hands.mirror:
+        cv2.flip(image, 1, dst=image)
+
+def render_frame(advanced_hands, image, results, metrics=DISABLED, timestamp=None):
+    # Çizim işlemlerini yap; timestamp: karenin yakalanma zamanı (filtre, bekleme ve hıza bağlı kalınlık için)
+    with metrics.span('drawing'):
+        image = advanced_hands.process_drawing(image, results, timestamp)
+    
+    # UI çiz
+    with metrics.span('ui'):
+        advanced_hands.draw_ui(image)
+    return image
+
+def show_frame(advanced_hands, image, metrics, wait_ms):
+    # False dönerse döngüden çıkılır
+    metrics.draw_overlay(image)
+    with metrics.span('display'):
+        cv2.imshow('Gelişmiş El Çizim Sistemi', image)
+        key = cv2.waitKey(wait_ms) & 0xFF
+    return handle_key(advanced_hands, key, metrics)
+
+def run_advanced_drawing(source=0, headless=False, max_frames=None, inference_size=None,
+                         infer_every=1, adaptive=False, metrics=DISABLED, recorder=None, advanced_hands=None,
+                         video=None):
+    if advanced_hands is None:
+        advanced_hands = AdvancedHandDrawing(inference_size=inference_size, mirror=True)
+    cap = open_with_model(advanced_hands, source, metrics)
+    # Kareler her seferinde aynı tampona okunur (kare bir sonraki okumadan önce tamamen kullanılır)
+    frames = FramePool()
+    
+    # Zayıf CPU'lar için: çıkarım her karede yapılmaz, aradaki landmark'lar tahmin edilir
+    detector = None
+    if infer_every > 1 or adaptive:
+        detector = SkippingDetector(advanced_hands.prepare_input, advanced_hands.detect,
+                                    advanced_hands.landmarks.max_hands, infer_every, adaptive,
+                                    advanced_hands.backend.detect_async if adaptive else None)
+        if recorder is not None:
+            print("Uyarı: kayıt her karede MediaPipe sonucu gerektirir, kare atlamalı modda kayıt yapılmaz")
+            recorder = None
+        if advanced_hands.roi is not None:
+            print("Uyarı: bölge takibi kare atlamalı/asenkron modda kullanılmaz, tam kare aranır")
+    
+    if not headless:
+        print_controls()
+
+    frame_count = 0
+    start_time = time.perf_counter()
     while cap.isOpened():
-        success, image = cap.read()
+        with metrics.span('capture'):
+            success, image = frames.read(cap)
+            captured_at = time.perf_counter()
         if not success:
-            print("Kamera okunamıyor...")
+            if not headless:
+                print("Kamera okunamıyor...")
             break
 
-        image = cv2.flip(image, 1)
-        results = advanced_hands.process_frame(image)
-        
-        # Çizim işlemlerini yap
-        image = advanced_hands.process_drawing(image, results)
-        
-        # UI çiz
-        advanced_hands.draw_ui(image)
-        
-        cv2.imshow('Gelişmiş El Çizim Sistemi', image)
-        
-        key = cv2.waitKey(5) & 0xFF
-        if key == 27:  # ESC
+        if detector is None:
+            with metrics.span('inference'):
+                results = advanced_hands.process_frame(image)
+            mirror_frame(advanced_hands, image)
+            if recorder is not None:
+                recorder.write(results, time.perf_counter(), (image.shape[1], image.shape[0]))
+            image = render_frame(advanced_hands, image, results, metrics, captured_at)
+        else:
+            with metrics.span('inference'):
+                hands, hand_landmarks = detector(image, captured_at)
+            mirror_frame(advanced_hands, image)
+            if adaptive:
+                # Uygulanan landmark'ların yaşı (tahminle kapatılan gecikme) ve sonucun gelme süresi
+                metrics.record('result_age', detector.result_age)
+                if detector.latency is not None:
+                    metrics.record('async_latency', detector.latency)
+            with metrics.span('drawing'):
+                image = advanced_hands.process_hands(image, hands, hand_landmarks, timestamp=captured_at)
+            with metrics.span('ui'):
+                advanced_hands.draw_ui(image)
+        if video is not None:
+            # Birleştirilmiş kare (çizim + UI) kodlayıcı thread'ine; yetişemezse kare atılır
+            video.write(image, captured_at)
+        frames.release(image)
+        frame_count += 1
+        metrics.frame_done()
+        advanced_hands.exports.tick(advanced_hands.drawing_canvas)
+        
+        if headless:
+            if max_frames is not None and frame_count >= max_frames:
+                break
+            continue
+
+        if not show_frame(advanced_hands, image, metrics, 5):
             break
-        elif key == ord('u'):  # UI toggle
-            advanced_hands.show_ui = not advanced_hands.show_ui
-        elif key == ord('s'):  # Save
-            if advanced_hands.drawing_canvas is not None:
-                timestamp = int(time.time())
-                filename = f"drawing_{timestamp}.png"
-                cv2.imwrite(filename, advanced_hands.drawing_canvas)
-                print(f"Çizim kaydedildi: {filename}")
 
+    elapsed = time.perf_counter() - start_time
     cap.release()
-    cv2.destroyAllWindows()
+    if not headless:
+        cv2.destroyAllWindows()
+    print(f"{frame_count} kare, {elapsed:.2f} sn, {frame_count / max(elapsed, 1e-9):.1f} FPS")
+    if detector is not None:
+        detector.close()
+        print(f"Çıkarım yapılan kare: {detector.inferences}")
+    report_roi(advanced_hands)
+    # Bekleyen kayıtlar tamamlanır
+    advanced_hands.exports.close()
+    metrics.report()
+    metrics.dump()
+
+def report_roi(advanced_hands):
+    if advanced_hands.roi is not None:
+        stats = advanced_hands.roi.stats()
+        print(f"Bölge takibi: {stats['roi_frames']} kare bölgede, {stats['full_frames']} tam kare "
+              f"({stats['roi_ratio']:.0%})")
+
+def run_pipelined_drawing(source=0, headless=False, max_frames=None, queue_size=1, inference_size=None,
+                          metrics=DISABLED, recorder=None, advanced_hands=None, video=None):
+    # Kamera okuma, MediaPipe ve çizim ayrı aşamalarda paralel çalışır
+    if advanced_hands is None:
+        advanced_hands = AdvancedHandDrawing(inference_size=inference_size, mirror=True)
+    cap = open_with_model(advanced_hands, source, metrics)
+    # Dosya kaynağında kareler kendi FPS'inde okunur, kamera zaten kendi hızında
+    pace_fps = None if isinstance(source, int) else (cap.get(cv2.CAP_PROP_FPS) or 30)
+    pipeline = FramePipeline(cap, advanced_hands.process_frame, queue_size=queue_size,
+                             mirror=advanced_hands.mirror, pace_fps=pace_fps, metrics=metrics)
+    
+    if not headless:
+        print_controls()
+
+    frame_count = 0
+    total_latency = 0.0
+    start_time = time.perf_counter()
+    pipeline.start()
+    try:
+        for index, captured_at, image, results in pipeline.frames():
+            if recorder is not None:
+                recorder.write(results, captured_at, (image.shape[1], image.shape[0]))
+            image = render_frame(advanced_hands, image, results, metrics, captured_at)
+            if video is not None:
+                video.write(image, captured_at)
+            frame_count += 1
+            latency = time.perf_counter() - captured_at
+            total_latency += latency
+            metrics.record('latency', latency)
+            metrics.frame_done()
+            advanced_hands.exports.tick(advanced_hands.drawing_canvas)
+
+            if headless:
+                if max_frames is not None and frame_count >= max_frames:
+                    break
+                continue
+
+            if not show_frame(advanced_hands, image, metrics, 1):
+                break
+    finally:
+        pipeline.stop()
+        cap.release()
+        if not headless:
+            cv2.destroyAllWindows()
+
+    elapsed = time.perf_counter() - start_time
+    stats = pipeline.stats()
+    print(f"{frame_count} kare, {elapsed:.2f} sn, {frame_count / max(elapsed, 1e-9):.1f} FPS, "
+          f"ort. gecikme {1000 * total_latency / max(frame_count, 1):.1f} ms")
+    print(f"Okunan: {stats['frames_read']}, atlanan (inference öncesi): {stats['dropped_before_inference']}, "
+          f"atlanan (render öncesi): {stats['dropped_before_render']}")
+    report_roi(advanced_hands)
+    advanced_hands.exports.close()
+    metrics.report()
+    metrics.dump()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Gelişmiş el çizim sistemi")
+    parser.add_argument('--source', default='0', help="Kamera indeksi veya video dosyası")
+    parser.add_argument('--pipelined', action='store_true', help="Capture/inference/render aşamalarını ayrı thread'lerde çalıştır")
+    parser.add_argument('--headless', action='store_true', help="Pencere açmadan çalış (benchmark için)")
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--queue-size', type=int, default=1, help="Aşamalar arası kuyruk boyu (pipelined)")
+    parser.add_argument('--inference-size', type=parse_size, default=None,
+                        help="Tespit çözünürlüğü, örn. 640x360 (varsayılan: tam çözünürlük)")
+    parser.add_argument('--infer-every', type=int, default=1,
+                        help="Çıkarımı her N karede bir yap, aradaki karelerde landmark tahmini kullan")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Çıkarımı arka planda çalıştır, önceki çıkarım bitince yenisini başlat "
+                             "(Tasks arka ucunda LIVE_STREAM); son sonuç kare zamanına kadar ileri kestirilir")
+    parser.add_argument('--backend', type=parse_backend, default='mediapipe',
+                        help="Landmark arka ucu: mediapipe, mediapipe-lite (hafif model), tasks:<model.task>, "
+                             "replay:<kayıt>, fake[:gecikme_ms]")
+    parser.add_argument('--roi', action='store_true',
+                        help="Bölge takibi: model önceki karedeki elin çevresini görür, el kaybolunca tam kare aranır")
+    parser.add_argument('--roi-padding', type=float, default=0.5, help="Bölgeye el boyunun her yana eklenen oranı")
+    parser.add_argument('--roi-refresh', type=int, default=30,
+                        help="N karede bir tam kare arama (bölge dışına giren yeni eller için)")
+    add_metrics_args(parser)
+    parser.add_argument('--max-hands', type=int, default=2, help="Aynı anda takip edilecek en fazla el sayısı")
+    parser.add_argument('--gesture-window', type=int, default=10, help="Jest oylama penceresi (kare)")
+    parser.add_argument('--gesture-hysteresis', type=int, default=1,
+                        help="Yeni jestin kararlı jesti geçmesi gereken oy farkı")
+    parser.add_argument('--gesture-dwell', type=float, default=0.0,
+                        help="Yeni jestin çoğunlukta kalması gereken süre (sn)")
+    parser.add_argument('--filter', type=parse_filter, default='one_euro',
+                        help="Landmark filtresi: none, ema, one_euro, kalman; parametreler "
+                             "'one_euro:min_cutoff=1,beta=0.05' biçiminde")
+    parser.add_argument('--record', default=None,
+                        help="MediaPipe sonuçlarını kaydet (replay.py ile modelsiz tekrar oynatılır)")
+    parser.add_argument('--record-video', default=None,
+                        help="Oturumu (çizim + UI) videoya kaydet: .mp4/.avi/.mkv veya ham .bgr; "
+                             "yanına <taban>.timecodes.txt kare zamanları yazılır")
+    parser.add_argument('--video-fps', type=float, default=30.0, help="Video kabının nominal FPS'i")
+    parser.add_argument('--video-buffer', type=int, default=8,
+                        help="Kodlayıcı halka tamponu (kare); doluysa en eski kare atılır")
+    parser.add_argument('--export-scale', type=float, default=1.0,
+                        help="'s' ile kaydedilen çizimin ölçeği (çizgiler vektörden yeniden çizilir)")
+    parser.add_argument('--export-formats', type=parse_formats, default=('png',),
+                        help="Kayıt biçimleri: png, webp (kayıpsız), svg, json; virgülle ayrılır (örn. 'png,svg')")
+    parser.add_argument('--autosave', type=float, default=None,
+                        help="Tuval değiştiyse N saniyede bir arka planda kaydet (autosave.* dosyalarının üzerine)")
+    parser.add_argument('--no-mirror', action='store_true',
+                        help="Görüntüyü aynalama (arka kamera, video dosyası); landmark'lar da çevrilmez")
+    parser.add_argument('--no-antialias', action='store_true',
+                        help="Kenar yumuşatmayı kapat (keskin çizgiler, daha hızlı birleştirme)")
+    args = parser.parse_args()
+    args.source = int(args.source) if args.source.isdigit() else args.source
+    return args
 
 if __name__ == "__main__":
-    run_advanced_drawing()
+    args = parse_args()
+    metrics = metrics_from_args(args)
+    recorder = LandmarkRecorder(args.record, max_hands=args.max_hands) if args.record else None
+    advanced_hands = AdvancedHandDrawing(max_num_hands=args.max_hands,
+                                         inference_size=args.inference_size,
+                                         gesture_window=args.gesture_window,
+                                         gesture_hysteresis=args.gesture_hysteresis,
+                                         gesture_dwell=args.gesture_dwell,
+                                         smoothing=args.filter,
+                                         backend=make_backend(args.backend, args.max_hands,
+                                                              live_stream=args.adaptive),
+                                         roi=RoiTracker(args.roi_padding, refresh=args.roi_refresh)
+                                         if args.roi else None,
+                                         mirror=not args.no_mirror)
+    advanced_hands.exports = ExportQueue(args.export_formats, args.export_scale, args.autosave)
+    video = SessionVideoRecorder(args.record_video, args.video_fps, args.video_buffer) if args.record_video else None
+    advanced_hands.antialias = not args.no_antialias
+    try:
+        if args.pipelined:
+            run_pipelined_drawing(args.source, args.headless, args.max_frames, args.queue_size,
+                                  args.inference_size, metrics, recorder, advanced_hands, video)
+        else:
+            run_advanced_drawing(args.source, args.headless, args.max_frames, args.inference_size,
+                                 args.infer_every, args.adaptive, metrics, recorder, advanced_hands, video)
+    finally:
+        if recorder is not None:
+            recorder.close()
+            print(f"Landmark kaydı: {args.record}")
+        if video is not None:
+            stats = video.close()
+            print(f"Oturum videosu: {video.path} ({stats['written']} kare yazıldı, {stats['dropped']} atıldı), "
+                  f"kare zamanları: {video.timecodes_path}")
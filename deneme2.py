@@ -1,41 +1,61 @@
 import cv2
-import mediapipe as mp
 import numpy as np
 import math
 import time
 from collections import deque
 import json
+import argparse
+from landmarks import (LandmarkBuffer, extended_fingers, landmark_point, draw_hand_skeleton,
+                       FINGER_BITS, THUMB_MCP, INDEX_TIP)
+from inference import model_input, parse_size, start_capture, CAMERA_SIZE
+from backends import SolutionsBackend, make_backend, parse_backend
+from metrics import DISABLED, add_metrics_args, metrics_from_args
+from replay import LandmarkRecorder
+from canvas import DrawingCanvas
+from filters import make_filter, parse_filter
+from recognizer import AsyncRecognizer, StrokeRecognizer, UNKNOWN
+from export import ExportQueue, parse_formats
+from session_video import SessionVideoRecorder
 
 class FingerDrawingApp:
-    def __init__(self):
-        # MediaPipe Hands
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.8,
-            min_tracking_confidence=0.7,
-            model_complexity=1
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+    def __init__(self, inference_size=None, metrics=DISABLED, recorder=None, smoothing='one_euro', recognizer=None,
+                 exports=None, video=None, backend=None):
+        # Landmark arka ucu (backends.py): ilk tespitte veya load_model ile yüklenir (replay/benchmark modeli hiç yüklemez)
+        self.backend = backend if backend is not None else SolutionsBackend(1, min_detection_confidence=0.8, min_tracking_confidence=0.7)
+        # Tespit çözünürlüğü (None: tam çözünürlük)
+        self.inference_size = inference_size
+        # Aşama süreleri (kapalıyken maliyeti yok denecek kadar az)
+        self.metrics = metrics
+        # MediaPipe sonuç kaydı (replay.py ile modelsiz tekrar oynatılır)
+        self.recorder = recorder
+        # Oturum videosu (session_video.py); kodlama ayrı thread'de, geride kalırsa kare atılır
+        self.video = video
+        self.landmarks = LandmarkBuffer(max_hands=1)
 
         # Canvas ve çizim
-        self.canvas = None
-        self.drawing_points = []
-        self.current_stroke = []
+        # Çizgiler vektör olarak saklanır, raster karo bazlı geri al/yinele destekler
+        self.drawing_canvas = None
         self.is_drawing = False
         self.prev_point = None
-        self.finger_history = deque(maxlen=10)
-        self.smoothing_factor = 0.7
+        # Landmark filtresi (filters.py); tek el, tek slot
+        self.filter = make_filter(smoothing, 1)
         self.min_movement = 5
 
         # Jest
         self.gesture_history = deque(maxlen=8)
-        self.last_gesture_time = 0
+        self.last_gesture_time = float('-inf')
         self.gesture_cooldown = 0.8
 
-        # Yazı
-        self.written_text = ""
+        # Yazı: karakterler listesi; tanıması süren vuruşlar Future olarak yer tutar (ekranda '_')
+        self.text = []
+        # Her karakteri üreten çizginin indeksi (jestle eklenenler için None); geri alınan çizgilerin karakterleri
+        # (çizgi, konum, karakter) olarak hidden_text'te bekler, yinelenince metne döner
+        self.text_strokes = []
+        self.hidden_text = []
+        # Vuruş tanıma arka planda (recognizer.py); kare döngüsü sonucu beklemez
+        self.recognizer = recognizer if recognizer is not None else AsyncRecognizer()
+        # Kayıt ve otomatik kayıt arka planda yazılır (export.py)
+        self.exports = exports if exports is not None else ExportQueue()
         self.stats = {'characters_written': 0, 'strokes_drawn': 0, 'session_start': time.time()}
 
         # Renkler
@@ -48,136 +68,267 @@ class FingerDrawingApp:
             'background': (40, 40, 40)
         }
         self.brush_size = 3
-        self.canvas_alpha = 0.3
+        self.last_gesture = "none"
+        # Toplu işlemde jest mesajları basılmaz
+        self.verbose = True
 
 
-    def get_finger_positions(self, landmarks, frame_shape):
-        h, w = frame_shape[:2]
-        points = {
-            'wrist': 0, 'thumb_tip': 4, 'thumb_mcp': 2,
-            'index_tip': 8, 'index_pip': 6, 'index_mcp': 5,
-            'middle_tip': 12, 'middle_pip': 10,
-            'ring_tip': 16, 'ring_pip': 14,
-            'pinky_tip': 20, 'pinky_pip': 18
-        }
-        positions = {}
-        for k, idx in points.items():
-            positions[k] = (int(landmarks[idx].x * w), int(landmarks[idx].y * h))
-        return positions
-
-    def detect_gesture(self, positions):
-        fingers_up = []
-        thumb_up = positions['thumb_tip'][0] > positions['thumb_mcp'][0]
-        fingers_up.append(thumb_up)
-        for tip, pip in [('index_tip','index_pip'), ('middle_tip','middle_pip'), ('ring_tip','ring_pip'), ('pinky_tip','pinky_pip')]:
-            fingers_up.append(positions[tip][1] < positions[pip][1])
-        up_count = sum(fingers_up)
-        if fingers_up == [False, True, False, False, False]: return "draw", 0.9
-        elif fingers_up == [False, True, True, False, False]: return "peace", 0.8
+    def detect_gesture(self, extended):
+        # extended: [başparmak, işaret, orta, yüzük, serçe]
+        finger_mask = int(extended @ FINGER_BITS)
+        up_count = int(extended.sum())
+        if finger_mask == 0b00010: return "draw", 0.9
+        elif finger_mask == 0b00110: return "peace", 0.8
         elif up_count == 0: return "fist", 0.9
         elif up_count >= 4: return "open", 0.7
-        elif fingers_up == [True, False, False, False, False]: return "thumb", 0.8
-        elif fingers_up == [False, False, False, False, True]: return "pinky", 0.7
+        elif finger_mask == 0b00001: return "thumb", 0.8
+        elif finger_mask == 0b10000: return "pinky", 0.7
         return "unknown", 0.3
 
-    def smooth_point(self, point):
-        self.finger_history.append(point)
-        if len(self.finger_history) < 3: return point
-        weights = np.linspace(0.1, 1.0, len(self.finger_history))
-        weights /= weights.sum()
-        points_arr = np.array(list(self.finger_history))
-        smoothed = np.average(points_arr, axis=0, weights=weights)
-        return tuple(map(int, smoothed))
+    @property
+    def written_text(self):
+        return "".join(c if isinstance(c, str) else "_" for c in self.text)
+
+    def collect_recognized(self, wait=False):
+        # Biten tanımaları yerine yazar; wait=True bekleyenlerin hepsini bekler (kaydetme, çıkış)
+        for i, c in enumerate(self.text):
+            if not isinstance(c, str) and (wait or c.done()):
+                label, score = c.result()
+                self.text[i] = label
+                if label != UNKNOWN:
+                    self.stats['characters_written'] += 1
+
+    def add_text(self, item, stroke=None):
+        self.text.append(item)
+        self.text_strokes.append(stroke)
+
+    def sync_text(self):
+        # Geri al/yinele sonrası metin tuvalle eşlenir: çizgisi gizlenen karakterler çıkar, yeniden görünenler
+        # eski yerlerine döner
+        visible = self.drawing_canvas.strokes.visible
+        for i in reversed(range(len(self.text))):
+            s = self.text_strokes[i]
+            if s is not None and not visible[s]:
+                self.hidden_text.append((s, i, self.text.pop(i)))
+                self.text_strokes.pop(i)
+        shown = sorted((e for e in self.hidden_text if visible[e[0]]), key=lambda e: e[0])
+        if shown:
+            self.hidden_text = [e for e in self.hidden_text if not visible[e[0]]]
+            for s, i, c in shown:
+                i = min(i, len(self.text))
+                self.text.insert(i, c)
+                self.text_strokes.insert(i, s)
+
+    def remap_text(self, stroke_map):
+        # Tuval deposu sıkıştırıldı: çizgi indeksleri yenilenir; çizgisi atılan karakter çizgiden bağımsız kalır
+        self.text_strokes = [None if s is None or stroke_map[s] < 0 else int(stroke_map[s]) for s in self.text_strokes]
+        self.hidden_text = [(int(stroke_map[s]), i, c) for s, i, c in self.hidden_text if stroke_map[s] >= 0]
+
+    def undo(self):
+        if self.drawing_canvas is None or not self.drawing_canvas.undo():
+            return False
+        self.sync_text()
+        return True
+
+    def redo(self):
+        if self.drawing_canvas is None or not self.drawing_canvas.redo():
+            return False
+        self.sync_text()
+        return True
+
+    def smooth_point(self, hand, timestamp):
+        # Elin tüm landmark'ları filtrelenir, işaret parmağı ucu döner
+        return landmark_point(self.filter.update(hand[None], None, timestamp)[0], INDEX_TIP)
 
     def distance(self, p1, p2):
         return math.sqrt((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2)
 
-    def process_gesture_command(self, gesture, confidence):
-        t = time.time()
+    def process_gesture_command(self, gesture, confidence, t):
+        # t: kare zamanı (saniye); bekleme süresi video zamanında da doğru işler
         if confidence < 0.6 or t - self.last_gesture_time < self.gesture_cooldown: return
         if gesture == "peace":
-            if self.canvas is not None: self.canvas.fill(0)
-            self.drawing_points = []
-            self.written_text = ""
+            if self.drawing_canvas is not None: self.drawing_canvas.clear()
+            self.text, self.text_strokes, self.hidden_text = [], [], []
             self.stats = {'characters_written': 0, 'strokes_drawn': 0, 'session_start': time.time()}
-            print("🧹 Temizlendi!")
+            if self.verbose: print("🧹 Temizlendi!")
         elif gesture == "open":
-            self.written_text += " "
-            print("Boşluk eklendi")
+            self.add_text(" ")
+            if self.verbose: print("Boşluk eklendi")
         elif gesture == "thumb":
-            self.written_text += "\n"
-            print("Yeni satır eklendi")
-        elif gesture == "pinky" and self.written_text:
-            self.written_text = self.written_text[:-1]
-            print("Geri al")
+            self.add_text("\n")
+            if self.verbose: print("Yeni satır eklendi")
+        elif gesture == "pinky" and self.text:
+            # Tanıması süren vuruş silinirse sonucu yok sayılır
+            self.text.pop()
+            self.text_strokes.pop()
+            if self.verbose: print("Geri al")
         self.last_gesture_time = t
 
-    def run(self):
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH,1280)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT,720)
-        if self.canvas is None:
-            ret, frame = cap.read()
-            h,w = frame.shape[:2]
-            self.canvas = np.zeros((h,w,3), dtype=np.uint8)
+    def load_model(self, warm_up_size=None):
+        self.backend.load()
+        if warm_up_size is not None: self.backend.warm_up(self.inference_size or warm_up_size)
+        return self.backend
 
-        while True:
-            ret, frame = cap.read()
-            if not ret: break
-            frame = cv2.flip(frame,1)
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb)
-
-            gesture, conf = "none",0
-            if results.multi_hand_landmarks:
-                for lm in results.multi_hand_landmarks:
-                    self.mp_draw.draw_landmarks(frame, lm, self.mp_hands.HAND_CONNECTIONS)
-                    pos = self.get_finger_positions(lm.landmark, frame.shape)
-                    gesture, conf = self.detect_gesture(pos)
-                    if gesture == "draw" and conf>0.7:
-                        pt = self.smooth_point(pos['index_tip'])
-                        if not self.is_drawing:
-                            self.is_drawing=True
-                            self.current_stroke=[pt]
-                            self.prev_point=pt
-                        else:
-                            if self.prev_point and self.distance(pt,self.prev_point)>=self.min_movement:
-                                self.current_stroke.append(pt)
-                                cv2.line(self.canvas, self.prev_point, pt, self.colors['draw'], self.brush_size)
-                                self.prev_point=pt
-                    elif gesture=="fist" and conf>0.7:
-                        if self.is_drawing and len(self.current_stroke)>2:
-                            self.drawing_points.append(self.current_stroke.copy())
-                            self.written_text += "*"
-                            self.stats['strokes_drawn']+=1
-                            self.stats['characters_written']+=1
-                            self.current_stroke=[]
-                        self.is_drawing=False
-                        self.prev_point=None
+    def process_frame(self, frame):
+        return self.backend.detect(model_input(frame, self.inference_size))
+
+    def process_drawing(self, frame, detection, timestamp=None):
+        # timestamp: kare zamanı (toplu işlemde video zamanı); yoksa duvar saati
+        hands = self.landmarks.update_normalized(detection.points, frame.shape)
+        return self.process_hands(frame, hands, detection.multi_hand_landmarks, timestamp=timestamp)
+
+    def process_hands(self, frame, hands, multi_hand_landmarks=None, hand_ids=None, timestamp=None):
+        # hands: piksel uzayında (n, 21, 3) landmark'lar; MediaPipe sonucu yoksa iskelet diziden çizilir.
+        # hand_ids: AdvancedHandDrawing ile aynı imza için (tek el takip edilir, kullanılmaz)
+        # timestamp: kare zamanı (saniye, monotonik); kayıttan oynatırken kayıttaki zaman verilir
+        if self.drawing_canvas is None:
+            self.drawing_canvas = DrawingCanvas(frame.shape)
+            self.drawing_canvas.compact_listeners.append(self.remap_text)
+        elif self.drawing_canvas.shape[:2] != frame.shape[:2]:
+            # Boyut değişti: raster vektörlerden yeni boyutta üretilir
+            self.drawing_canvas.resize(frame.shape)
+
+        self.collect_recognized()
+        now = time.monotonic() if timestamp is None else timestamp
+        gesture, conf = "none",0
+        if len(hands):
+            extended = extended_fingers(hands, thumb_base=THUMB_MCP)
+            for i in range(len(hands)):
+                if multi_hand_landmarks is not None:
+                    import mediapipe as mp
+                    mp.solutions.drawing_utils.draw_landmarks(frame, multi_hand_landmarks[i], mp.solutions.hands.HAND_CONNECTIONS)
+                else:
+                    draw_hand_skeleton(frame, hands[i])
+                gesture, conf = self.detect_gesture(extended[i])
+                if gesture == "draw" and conf>0.7:
+                    pt = self.smooth_point(hands[i], now)
+                    if not self.is_drawing:
+                        self.is_drawing=True
+                        self.prev_point=pt
                     else:
-                        self.process_gesture_command(gesture, conf)
-                        self.is_drawing=False
-                        self.prev_point=None
+                        if self.prev_point and self.distance(pt,self.prev_point)>=self.min_movement:
+                            self.drawing_canvas.line(self.prev_point, pt, self.colors['draw'], self.brush_size, timestamp=now)
+                            self.prev_point=pt
+                elif gesture=="fist" and conf>0.7:
+                    stroke = self.drawing_canvas.strokes.current(0)
+                    character = None
+                    if self.is_drawing and stroke is not None and stroke.count>2:
+                        character = self.recognizer.submit(stroke.points[:stroke.count])
+                        self.stats['strokes_drawn']+=1
+                    index = self.drawing_canvas.end_stroke(0)
+                    # Yeni çizgi yinele yığınını boşaltır: geri alınmış karakterler artık dönmez
+                    if index is not None: self.hidden_text = []
+                    if character is not None: self.add_text(character, index)
+                    self.is_drawing=False
+                    self.prev_point=None
+                else:
+                    self.process_gesture_command(gesture, conf, now)
+                    self.drawing_canvas.end_stroke(0)
+                    self.is_drawing=False
+                    self.prev_point=None
+        self.last_gesture = gesture
+        return self.compose(frame)
+
+    def close(self):
+        self.collect_recognized(wait=True)
+        self.recognizer.close()
+        self.exports.close()
+        if self.video is not None:
+            stats = self.video.close()
+            print(f"Oturum videosu: {self.video.path} ({stats['written']} kare yazıldı, {stats['dropped']} atıldı)")
 
-            # Overlay canvas
-            overlay = cv2.addWeighted(frame,0.7,self.canvas,self.canvas_alpha,0)
-            # Yazı göstergesi
-            cv2.putText(overlay,f"Yazilan Metin: {self.written_text[-50:]}",(20,50),cv2.FONT_HERSHEY_SIMPLEX,0.8,(255,255,255),2)
-            cv2.imshow("Finger Drawing App", overlay)
+    @property
+    def canvas(self):
+        # Tam raster (tembel temizlemeler uygulanmış)
+        return self.drawing_canvas.raster() if self.drawing_canvas is not None else None
 
-            key=cv2.waitKey(1)&0xFF
+    def compose(self, frame):
+        # Tuval kareye yerinde, sadece mürekkepli bölgede birleştirilir; temizlenmiş karolar okunmadığı için
+        # temizleme O(1) kalır (tam raster sadece kayıt ve toplu işlem çıktısında üretilir)
+        overlay = self.drawing_canvas.compose(frame)
+        # Yazı göstergesi
+        cv2.putText(overlay,f"Yazilan Metin: {self.written_text[-50:]}",(20,50),cv2.FONT_HERSHEY_SIMPLEX,0.8,(255,255,255),2)
+        return overlay
+
+    def open_camera(self):
+        cap = cv2.VideoCapture(0)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH,CAMERA_SIZE[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT,CAMERA_SIZE[1])
+        return cap
+
+    def run(self):
+        metrics = self.metrics
+        # Kamera açılırken model arka planda yüklenip ısıtılır
+        cap = start_capture(self.open_camera, lambda: self.load_model(CAMERA_SIZE), metrics)
+        while True:
+            with metrics.span('capture'):
+                ret, frame = cap.read()
+                captured_at = time.perf_counter()
+                if ret: frame = cv2.flip(frame,1)
+            if not ret: break
+            with metrics.span('inference'):
+                results = self.process_frame(frame)
+            if self.recorder is not None:
+                self.recorder.write(results, captured_at, (frame.shape[1], frame.shape[0]))
+            with metrics.span('drawing'):
+                overlay = self.process_drawing(frame, results, captured_at)
+            if self.video is not None: self.video.write(overlay, captured_at)
+            metrics.frame_done()
+            self.exports.tick(self.drawing_canvas, texts=lambda: {"autosave.txt": self.written_text})
+            metrics.draw_overlay(overlay)
+            with metrics.span('display'):
+                cv2.imshow("Finger Drawing App", overlay)
+                key=cv2.waitKey(1)&0xFF
             if key==ord('q'): break
-            elif key==ord('s'):
+            elif key==ord('m'): metrics.overlay = not metrics.overlay
+            elif key==ord('z'): self.undo()
+            elif key==ord('y'): self.redo()
+            elif key==ord('s') and self.drawing_canvas is not None:
+                # Anlık görüntü alınır, yazma arka planda; bekleyen tanımalar (< 1 ms) önce tamamlanır
                 ts=int(time.time())
-                cv2.imwrite(f"cizim_{ts}.png",self.canvas)
-                with open(f"metin_{ts}.txt","w",encoding="utf-8") as f:
-                    f.write(self.written_text)
-                print(" Kaydedildi!")
+                self.collect_recognized(wait=True)
+                self.exports.save(self.drawing_canvas, f"cizim_{ts}", texts={f"metin_{ts}.txt": self.written_text})
 
         cap.release()
         cv2.destroyAllWindows()
+        self.close()
+        metrics.report()
+        metrics.dump()
+        if self.recorder is not None:
+            self.recorder.close()
         print("Çıkış yapıldı!")
 
 if __name__=="__main__":
-    app = FingerDrawingApp()
+    parser = argparse.ArgumentParser(description="Parmakla çizim uygulaması")
+    parser.add_argument('--inference-size', type=parse_size, default=None,
+                        help="Tespit çözünürlüğü, örn. 640x360 (varsayılan: tam çözünürlük)")
+    add_metrics_args(parser)
+    parser.add_argument('--filter', type=parse_filter, default='one_euro',
+                        help="Landmark filtresi: none, ema, one_euro, kalman (örn. 'kalman:q=20000,r=9')")
+    parser.add_argument('--templates', default=None,
+                        help="Yerleşik karakter şablonlarına eklenecek şablon dosyası (JSON)")
+    parser.add_argument('--export-formats', type=parse_formats, default=('png',),
+                        help="Kayıt biçimleri: png, webp (kayıpsız), svg, json; virgülle ayrılır")
+    parser.add_argument('--autosave', type=float, default=None,
+                        help="Tuval değiştiyse N saniyede bir arka planda kaydet")
+    parser.add_argument('--record', default=None,
+                        help="MediaPipe sonuçlarını kaydet (replay.py ile modelsiz tekrar oynatılır)")
+    parser.add_argument('--record-video', default=None,
+                        help="Oturumu videoya kaydet: .mp4/.avi/.mkv veya ham .bgr (+ <taban>.timecodes.txt)")
+    parser.add_argument('--video-fps', type=float, default=30.0, help="Video kabının nominal FPS'i")
+    parser.add_argument('--video-buffer', type=int, default=8,
+                        help="Kodlayıcı halka tamponu (kare); doluysa en eski kare atılır")
+    parser.add_argument('--backend', type=parse_backend, default='mediapipe',
+                        help="Landmark arka ucu: mediapipe, mediapipe-lite, tasks:<model.task>, replay:<kayıt>, fake[:ms]")
+    args = parser.parse_args()
+    recorder = LandmarkRecorder(args.record, max_hands=1) if args.record else None
+    recognizer = StrokeRecognizer()
+    if args.templates:
+        recognizer.load(args.templates)
+    app = FingerDrawingApp(inference_size=args.inference_size, metrics=metrics_from_args(args), recorder=recorder,
+                           smoothing=args.filter, recognizer=AsyncRecognizer(recognizer),
+                           exports=ExportQueue(args.export_formats, autosave_interval=args.autosave),
+                           video=SessionVideoRecorder(args.record_video, args.video_fps, args.video_buffer)
+                           if args.record_video else None,
+                           backend=make_backend(args.backend, 1, min_detection_confidence=0.8))
     app.run()
@@ -0,0 +1,56 @@
+from collections import deque
+
+
+class GestureStabilizer:
+    # Kayan penceredeki jest sayıları artımlı tutulur; çoğunluk her karede O(1) bulunur.
+    # Histerezis: yeni jest, kararlı jestin sayısını en az `hysteresis` kadar geçmeli.
+    # Bekleme (dwell): yeni jest `dwell` saniye boyunca çoğunlukta kalmalı.
+    def __init__(self, window=10, min_samples=5, hysteresis=1, dwell=0.0):
+        self.history = deque(maxlen=window)
+        self.counts = {}
+        self.min_samples = min_samples
+        self.hysteresis = hysteresis
+        self.dwell = dwell
+        self.leader = None
+        self.stable = None
+        self.candidate = None
+        self.candidate_since = 0.0
+
+    def _add(self, gesture):
+        if len(self.history) == self.history.maxlen:
+            old = self.history[0]
+            self.counts[old] -= 1
+            if old == self.leader:
+                # Jest çeşidi sabit ve az olduğu için yeniden tarama pencere boyundan bağımsız
+                self.leader = max(self.counts, key=self.counts.get)
+        self.history.append(gesture)
+        count = self.counts.get(gesture, 0) + 1
+        self.counts[gesture] = count
+        if self.leader is None or count > self.counts[self.leader]:
+            self.leader = gesture
+
+    def update(self, gesture, timestamp):
+        self._add(gesture)
+        if len(self.history) < self.min_samples:
+            self.stable = gesture
+            return gesture
+
+        leader = self.leader
+        if leader == self.stable:
+            self.candidate = None
+            return self.stable
+        if self.counts[leader] < self.counts.get(self.stable, 0) + self.hysteresis:
+            return self.stable
+        if leader != self.candidate:
+            self.candidate = leader
+            self.candidate_since = timestamp
+        if timestamp - self.candidate_since >= self.dwell:
+            self.stable = leader
+            self.candidate = None
+        return self.stable
+
+    def reset(self):
+        self.history.clear()
+        self.counts.clear()
+        self.leader = self.stable = self.candidate = None
+
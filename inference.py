@@ -0,0 +1,86 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from metrics import DISABLED
+
+# Kameranın istenen çözünürlüğü; ısınma karesi de bu boyutta (inference_size verilmemişse)
+CAMERA_SIZE = (1280, 720)
+
+
+def parse_size(text):
+    # "640x360" -> (640, 360); "full" veya boş -> None (tam çözünürlük)
+    if not text or text == 'full':
+        return None
+    w, h = text.lower().split('x')
+    return int(w), int(h)
+
+
+def model_input(image, inference_size=None):
+    # Landmark'lar normalize döndüğü için model küçültülmüş kareyi görebilir,
+    # sonuçlar tam çözünürlükteki görüntüye doğrudan ölçeklenir
+    if inference_size is not None and (image.shape[1], image.shape[0]) != inference_size:
+        image = cv2.resize(image, inference_size, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+class FramePool:
+    # Kamera kareleri için yeniden kullanılan tamponlar: cap.read(dst) boştaki tampona yazar, her karede
+    # tam kare ayrılmaz. Kullanımı biten kare release ile havuza döner; havuz boşsa (ilk kareler, yavaş
+    # aşamalar) OpenCV yeni dizi ayırır. size: havuzda tutulacak en fazla tampon.
+    # Thread'ler arası kullanılabilir (deque ekleme/çıkarma atomiktir)
+    def __init__(self, size=1):
+        self.size = size
+        self.free = deque()
+
+    def read(self, cap):
+        try:
+            buffer = self.free.popleft()
+        except IndexError:
+            buffer = None
+        return cap.read(buffer)
+
+    def release(self, image):
+        if image is not None and len(self.free) < self.size:
+            self.free.append(image)
+
+
+class InputBuffer:
+    # model_input'un dst= ile yeniden kullanılan tamponlu hali. Dönen dizi bir sonraki çağrıda üzerine
+    # yazılır: model sonucu dönmeden (veya asenkron çıkarım bitmeden) yeni girdi hazırlanmamalı
+    def __init__(self):
+        self.resized = None
+        self.rgb = None
+
+    def __call__(self, image, inference_size=None):
+        if inference_size is not None and (image.shape[1], image.shape[0]) != inference_size:
+            self.resized = _reuse(self.resized, (inference_size[1], inference_size[0], 3))
+            image = cv2.resize(image, inference_size, dst=self.resized, interpolation=cv2.INTER_AREA)
+        self.rgb = _reuse(self.rgb, image.shape)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self.rgb)
+
+
+def _reuse(buffer, shape):
+    # Boyut değişmedikçe (bölge takibinde bölge boyutu hizalı, nadiren değişir) aynı dizi
+    if buffer is None or buffer.shape != shape:
+        buffer = np.empty(shape, dtype=np.uint8)
+    return buffer
+
+
+def start_capture(open_capture, load_model, metrics=DISABLED):
+    # Kamera açılışı (sürücü, çözünürlük pazarlığı) ile model yükleme + ısınma aynı anda yapılır.
+    # Süreler ms cinsinden metrik olarak raporlanır
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-load") as executor:
+        def load():
+            load_model()
+            return time.perf_counter() - start
+        model = executor.submit(load)
+        cap = open_capture()
+        metrics.set_value('camera_open_ms', round((time.perf_counter() - start) * 1000, 1))
+        metrics.set_value('model_ready_ms', round(model.result() * 1000, 1))
+    metrics.set_value('startup_ms', round((time.perf_counter() - start) * 1000, 1))
+    return cap
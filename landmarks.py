@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+WRIST = 0
+THUMB_MCP = 2
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+
+# Parmak sırası: başparmak, işaret, orta, yüzük, serçe
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+FINGER_PIPS = np.array([6, 10, 14, 18])
+# extended maskesini tek bir tamsayıya çevirmek için (thumb=1, index=2, ...)
+FINGER_BITS = np.array([1, 2, 4, 8, 16])
+
+
+class LandmarkBuffer:
+    # MediaPipe sonuçlarını her karede tek bir (eller, 21, 3) float32 diziye çevirir
+    def __init__(self, max_hands=2):
+        self.max_hands = max_hands
+        self.points = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self._scale = np.ones(3, dtype=np.float32)
+        self.count = 0
+
+    def update(self, multi_hand_landmarks, image_shape):
+        # Piksel uzayına ölçeklenmiş (n, 21, 3) görünüm döner; z, x ile aynı ölçekte
+        self.count = 0
+        if multi_hand_landmarks:
+            self.count = min(len(multi_hand_landmarks), self.max_hands)
+            for i in range(self.count):
+                self.points[i] = [(lm.x, lm.y, lm.z) for lm in multi_hand_landmarks[i].landmark]
+        return self._scaled(image_shape)
+
+    def update_normalized(self, normalized, image_shape):
+        # Önceden diziye çevrilmiş normalize (n, 21, 3) landmark'lar için
+        self.count = min(len(normalized), self.max_hands)
+        self.points[:self.count] = normalized[:self.count]
+        return self._scaled(image_shape)
+
+    def _scaled(self, image_shape):
+        h, w = image_shape[:2]
+        self._scale[0] = w
+        self._scale[1] = h
+        self._scale[2] = w
+        hands = self.points[:self.count]
+        np.multiply(hands, self._scale, out=hands)
+        return hands
+
+
+def extended_fingers(hands, thumb_base=THUMB_IP):
+    # (n, 5) bool: başparmak x ekseninde, diğerleri y ekseninde karşılaştırılır
+    extended = np.empty((len(hands), 5), dtype=bool)
+    np.greater(hands[:, THUMB_TIP, 0], hands[:, thumb_base, 0], out=extended[:, 0])
+    np.less(hands[:, FINGER_TIPS[1:], 1], hands[:, FINGER_PIPS, 1], out=extended[:, 1:])
+    return extended
+
+
+def finger_masks(extended):
+    # Açık parmakları bit maskesine çevirir, jest eşleştirmesi tek karşılaştırma olur
+    return extended @ FINGER_BITS
+
+
+def landmark_distance(hands, a, b):
+    # Her el için iki landmark arasındaki 2B piksel mesafesi
+    diff = hands[:, a, :2] - hands[:, b, :2]
+    return np.sqrt((diff * diff).sum(axis=1))
+
+
+def hand_sizes(hands):
+    return landmark_distance(hands, WRIST, MIDDLE_TIP)
+
+
+def landmark_point(hand, idx):
+    # cv2 çizim fonksiyonları için int piksel koordinatı
+    return (int(hand[idx, 0]), int(hand[idx, 1]))
+
+
+# mediapipe.solutions.hands.HAND_CONNECTIONS ile aynı bağlantılar
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+])
+
+
+def draw_hand_skeleton(image, hand, color=(224, 224, 224), point_color=(0, 0, 255)):
+    # MediaPipe sonucu olmadan (tahmin edilmiş/kaydedilmiş landmark'lar) el iskeletini çizer
+    points = hand[:, :2].astype(np.int32)
+    cv2.polylines(image, list(points[HAND_CONNECTIONS]), False, color, 2)
+    for x, y in points:
+        cv2.circle(image, (int(x), int(y)), 3, point_color, -1)
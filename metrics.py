@@ -0,0 +1,177 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class _Span:
+    # Aşama başına tek nesne; her kullanımda yeni nesne oluşturulmaz
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class StageMetrics:
+    # Monoton saatle aşama süreleri, kayan pencereli histogramlar, FPS ve periyodik döküm
+    def __init__(self, enabled=True, window=240, overlay=False, dump_path=None, dump_interval=5.0):
+        self.enabled = enabled
+        self.window = window
+        self.overlay = overlay
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.samples = {}
+        self._spans = {}
+        self._frame_times = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._last_dump = time.perf_counter()
+        self._overlay_lines = []
+        self._overlay_updated = 0.0
+        self.counters = {}
+
+    def span(self, stage):
+        if not self.enabled:
+            return NULL_SPAN
+        span = self._spans.get(stage)
+        if span is None:
+            with self._lock:
+                span = self._spans.setdefault(stage, _Span(self, stage))
+        return span
+
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        samples = self.samples.get(stage)
+        if samples is None:
+            with self._lock:
+                samples = self.samples.setdefault(stage, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    def set_value(self, name, value):
+        # Aşama dışı tekil ölçümler (ör. açılış süresi)
+        if self.enabled:
+            self.counters[name] = value
+
+    def frame_done(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._frame_times.append(now)
+        if self.dump_path and now - self._last_dump >= self.dump_interval:
+            self._last_dump = now
+            self.dump()
+
+    def fps(self):
+        if len(self._frame_times) < 2:
+            return 0.0
+        span = self._frame_times[-1] - self._frame_times[0]
+        return (len(self._frame_times) - 1) / span if span > 0 else 0.0
+
+    def summary(self):
+        stats = {}
+        for stage, samples in list(self.samples.items()):
+            if not samples:
+                continue
+            ms = np.fromiter(samples, dtype=np.float64, count=len(samples)) * 1000
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            stats[stage] = {
+                'mean_ms': round(float(ms.mean()), 3),
+                'p50_ms': round(float(p50), 3),
+                'p95_ms': round(float(p95), 3),
+                'p99_ms': round(float(p99), 3),
+                'samples': len(ms),
+            }
+        return stats
+
+    def draw_overlay(self, image, origin=(20, 90)):
+        if not (self.enabled and self.overlay):
+            return
+        # Yazılar yarım saniyede bir güncellenir, yüzdelikler her karede hesaplanmaz
+        now = time.perf_counter()
+        if now - self._overlay_updated > 0.5:
+            self._overlay_updated = now
+            lines = [f"FPS: {self.fps():.1f}"]
+            for stage, stats in self.summary().items():
+                lines.append(f"{stage}: {stats['mean_ms']:.1f} ms (p95 {stats['p95_ms']:.1f})")
+            self._overlay_lines = lines
+        x, y = origin
+        for i, line in enumerate(self._overlay_lines):
+            cv2.putText(image, line, (x, y + i * 22), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 255, 255), 1)
+
+    def dump(self, path=None):
+        path = path or self.dump_path
+        if not path:
+            return
+        summary = self.summary()
+        timestamp = time.time()
+        if path.endswith('.csv'):
+            new_file = not os.path.exists(path)
+            with open(path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(['time', 'stage', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'samples', 'fps'])
+                fps = round(self.fps(), 2)
+                for stage, stats in summary.items():
+                    writer.writerow([round(timestamp, 3), stage, stats['mean_ms'], stats['p50_ms'],
+                                     stats['p95_ms'], stats['p99_ms'], stats['samples'], fps])
+        else:
+            # JSON satırları (her döküm bir satır)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'time': round(timestamp, 3), 'fps': round(self.fps(), 2),
+                                    'stages': summary, 'values': self.counters}) + "\n")
+
+    def report(self):
+        if not self.enabled:
+            return
+        print(f"FPS: {self.fps():.1f}")
+        for stage, stats in self.summary().items():
+            print(f"  {stage:<10} ort {stats['mean_ms']:.2f} ms, p50 {stats['p50_ms']:.2f}, "
+                  f"p95 {stats['p95_ms']:.2f}, p99 {stats['p99_ms']:.2f}")
+        for name, value in self.counters.items():
+            print(f"  {name}: {value}")
+
+
+# Ölçüm kapalıyken kullanılan paylaşılan örnek
+DISABLED = StageMetrics(enabled=False)
+
+
+def add_metrics_args(parser):
+    parser.add_argument('--metrics', action='store_true', help="Aşama bazlı süre ölçümünü aç")
+    parser.add_argument('--metrics-overlay', action='store_true', help="FPS ve aşama sürelerini ekranda göster")
+    parser.add_argument('--metrics-dump', default=None, help="Periyodik metrik dökümü (.json veya .csv)")
+    parser.add_argument('--metrics-interval', type=float, default=5.0, help="Döküm aralığı (sn)")
+
+
+def metrics_from_args(args):
+    if args.metrics or args.metrics_overlay or args.metrics_dump:
+        return StageMetrics(overlay=args.metrics_overlay, dump_path=args.metrics_dump,
+                            dump_interval=args.metrics_interval)
+    return DISABLED
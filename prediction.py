@@ -0,0 +1,121 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from landmarks import LandmarkBuffer, NUM_LANDMARKS, WRIST, extended_fingers, finger_masks
+
+
+class ConstantVelocityPredictor:
+    # Son iki tespitten landmark hızını tahmin eder, aradaki kareler için ileri kestirir.
+    # Sabit hız varsayımı el poz veya yön değiştirdiğinde hedefi aşar; bu yüzden kestirim son gözlenen
+    # adımın max_steps katıyla sınırlanır ve açık parmakları (jest) değişen elin hızı sıfırlanır
+    def __init__(self, max_hands=2, max_horizon=0.25, max_steps=1.0):
+        self.last = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.velocity = np.zeros_like(self.last)
+        self.predicted = np.zeros_like(self.last)
+        self.masks = np.zeros(max_hands, dtype=np.int64)
+        self.count = 0
+        self.last_time = None
+        # Son iki tespit arası süre (sn)
+        self.interval = 0.0
+        # Çok eski tespitten uzun süre kestirim yapılmaz (ör. el kaybolduysa)
+        self.max_horizon = max_horizon
+        self.max_steps = max_steps
+
+    def update(self, hands, timestamp):
+        n = len(hands)
+        masks = finger_masks(extended_fingers(hands)) if n else self.masks[:0]
+        if n and n == self.count and self.last_time is not None and timestamp > self.last_time:
+            if n == 2 and self._swapped(hands):
+                self.last[:2] = self.last[1::-1].copy()
+                self.velocity[:2] = self.velocity[1::-1].copy()
+                self.masks[:2] = self.masks[1::-1].copy()
+            self.interval = timestamp - self.last_time
+            np.subtract(hands, self.last[:n], out=self.velocity[:n])
+            self.velocity[:n] /= self.interval
+            # Poz değişimi (parmak açılıp kapanması) el hareketi değildir, ileri taşınmaz
+            self.velocity[:n][masks != self.masks[:n]] = 0
+        else:
+            self.velocity[:n] = 0
+        self.last[:n] = hands
+        self.masks[:n] = masks
+        self.count = n
+        self.last_time = timestamp
+
+    def _swapped(self, hands):
+        # İki elin sırası tespitler arasında değiştiyse bileklere göre düzelt
+        straight = np.abs(hands[:, WRIST, :2] - self.last[:2, WRIST, :2]).sum()
+        crossed = np.abs(hands[:, WRIST, :2] - self.last[1::-1, WRIST, :2]).sum()
+        return crossed < straight
+
+    def predict(self, timestamp):
+        n = self.count
+        if self.last_time is None:
+            return self.predicted[:0]
+        # Kestirim son gözlenen adımın max_steps katını geçmez (adım başına hareket x gecikme)
+        dt = min(max(timestamp - self.last_time, 0.0), self.max_horizon, self.max_steps * self.interval)
+        np.multiply(self.velocity[:n], dt, out=self.predicted[:n])
+        self.predicted[:n] += self.last[:n]
+        return self.predicted[:n]
+
+
+class SkippingDetector:
+    # Çıkarım her N karede bir (veya adaptif modda önceki çıkarım bittiğinde) çalışır,
+    # aradaki karelerde landmark'lar sabit hız modeliyle tahmin edilir.
+    # Adaptif mod: kare, yakalanma zamanıyla submit_fn(model_input, timestamp) -> Future'a verilir
+    # (arka uçların detect_async'i; Tasks'ta LIVE_STREAM). Sonuç geldiği karede, sonucun ait olduğu karenin
+    # zamanıyla tahminciye yazılır ve o anki kareye kadar ileri kestirilir: ekran kamera hızında akar,
+    # model gecikmesi kadar geride kalmaz
+    def __init__(self, prepare_fn, detect_fn, max_hands=2, every=2, adaptive=False, submit_fn=None):
+        self.prepare_fn = prepare_fn
+        self.detect_fn = detect_fn
+        self.every = max(1, every)
+        self.adaptive = adaptive
+        self.landmarks = LandmarkBuffer(max_hands)
+        self.predictor = ConstantVelocityPredictor(max_hands)
+        self.frame_index = 0
+        self.inferences = 0
+        self._executor = None
+        if adaptive and submit_fn is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            submit_fn = lambda model_input, timestamp: self._executor.submit(self.detect_fn, model_input)
+        self.submit_fn = submit_fn
+        self._pending = None
+        # Son uygulanan sonucun yaşı (kare zamanı - sonucun karesinin zamanı) ve gönderilen karenin
+        # sonucunun kullanıldığı kareye kadar geçen süre (sn)
+        self.result_age = 0.0
+        self.latency = None
+
+    def __call__(self, image, timestamp):
+        # (piksel uzayında eller, MediaPipe landmark'ları veya tahmin karesinde None) döner
+        self.frame_index += 1
+        if self.adaptive:
+            return self._adaptive(image, timestamp)
+        if (self.frame_index - 1) % self.every == 0:
+            results = self.detect_fn(self.prepare_fn(image))
+            self.inferences += 1
+            hands = self.landmarks.update_normalized(results.points, image.shape)
+            self.predictor.update(hands, timestamp)
+            return hands, results.multi_hand_landmarks
+        return self.predictor.predict(timestamp), None
+
+    def _adaptive(self, image, timestamp):
+        if self._pending is not None and self._pending[0].done():
+            future, shape, submitted_at = self._pending
+            self._pending = None
+            # İptal: arka uç kareyi düşürdü (LIVE_STREAM), sonraki kare gönderilir
+            if not future.cancelled():
+                hands = self.landmarks.update_normalized(future.result().points, shape)
+                self.predictor.update(hands, submitted_at)
+                self.latency = timestamp - submitted_at
+        if self._pending is None:
+            # Girdi ana thread'de kopyalanır, çizim aynı kare üzerinde devam edebilir
+            model_input = self.prepare_fn(image)
+            self._pending = (self.submit_fn(model_input, timestamp), image.shape, timestamp)
+            self.inferences += 1
+        if self.predictor.last_time is not None:
+            self.result_age = timestamp - self.predictor.last_time
+        return self.predictor.predict(timestamp), None
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
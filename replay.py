@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from inference import parse_size
+from landmarks import LandmarkBuffer, NUM_LANDMARKS
+
+# Kayıt biçimi (aynı taban isimli üç dosya):
+#   <taban>.json    başlık: sürüm, max_hands, kare sayısı, kare boyutu
+#   <taban>.f32     float32 (kareler, max_hands, 65): 21x3 normalize landmark + el etiketi (0 sol, 1 sağ) + skor
+#   <taban>.idx.npy her kare için zaman damgası ve el sayısı
+RECORD_WIDTH = NUM_LANDMARKS * 3 + 2
+INDEX_DTYPE = np.dtype([('timestamp', '<f8'), ('count', '<i4')])
+HANDEDNESS_LABELS = ('Left', 'Right')
+
+
+def _paths(base):
+    base = os.path.splitext(base)[0] if base.endswith(('.json', '.f32')) else base
+    return base + '.json', base + '.f32', base + '.idx.npy'
+
+
+class LandmarkRecorder:
+    # Landmark sonuçlarını kare kare sıkıştırılmamış float32 kayda yazar
+    def __init__(self, path, max_hands=2, frame_size=None):
+        self.header_path, self.data_path, self.index_path = _paths(path)
+        self.max_hands = max_hands
+        self.frame_size = frame_size
+        self._file = open(self.data_path, 'wb')
+        self._row = np.zeros((max_hands, RECORD_WIDTH), dtype=np.float32)
+        self._index = []
+
+    def write(self, detection, timestamp=None, frame_size=None):
+        # detection: arka uçların döndüğü HandDetection (backends.py)
+        self.write_arrays(detection.points, detection.handedness, timestamp, frame_size)
+
+    def write_arrays(self, points, handedness=None, timestamp=None, frame_size=None):
+        # points: normalize (n, 21, 3); handedness: (n, 2) [etiket, skor]
+        count = min(len(points), self.max_hands)
+        self._row.fill(0)
+        self._row[:count, :RECORD_WIDTH - 2] = np.reshape(points[:count], (count, RECORD_WIDTH - 2))
+        if handedness is not None:
+            self._row[:count, -2:] = handedness[:count]
+        self._append(count, timestamp, frame_size)
+
+    def _append(self, count, timestamp, frame_size):
+        if self.frame_size is None and frame_size is not None:
+            self.frame_size = (int(frame_size[0]), int(frame_size[1]))
+        self._row.tofile(self._file)
+        self._index.append((time.perf_counter() if timestamp is None else timestamp, count))
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        np.save(self.index_path, np.array(self._index, dtype=INDEX_DTYPE))
+        with open(self.header_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'max_hands': self.max_hands, 'frames': len(self._index),
+                       'frame_size': self.frame_size}, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class LandmarkReplay:
+    # Kaydı bellek eşlemeli (memmap) açar; kareler kopyalanmadan okunur
+    def __init__(self, path):
+        header_path, data_path, index_path = _paths(path)
+        with open(header_path, encoding='utf-8') as f:
+            self.header = json.load(f)
+        self.max_hands = self.header['max_hands']
+        self.frame_size = tuple(self.header['frame_size']) if self.header.get('frame_size') else None
+        self.index = np.load(index_path)
+        if len(self.index):
+            self.data = np.memmap(data_path, dtype=np.float32, mode='r',
+                                  shape=(len(self.index), self.max_hands, RECORD_WIDTH))
+        else:
+            # Boş kayıt (.f32 sıfır bayt): memmap boş dosyayı açamaz
+            self.data = np.zeros((0, self.max_hands, RECORD_WIDTH), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.index)
+
+    def frame(self, i):
+        # (zaman damgası, normalize (n, 21, 3) landmark'lar, (n, 2) el etiketi/skor)
+        count = int(self.index['count'][i])
+        rows = self.data[i, :count]
+        return (float(self.index['timestamp'][i]),
+                rows[:, :RECORD_WIDTH - 2].reshape(count, NUM_LANDMARKS, 3),
+                rows[:, RECORD_WIDTH - 2:])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.frame(i)
+
+    def as_stream(self):
+        # Benchmark'ların kullandığı (points, counts) biçimi
+        points = np.ascontiguousarray(self.data[:, :, :RECORD_WIDTH - 2]).reshape(
+            len(self), self.max_hands, NUM_LANDMARKS, 3)
+        return points, self.index['count'].astype(np.int32)
+
+
+def recorded_labels(handedness):
+    # Kayıttaki el etiketleri ('Left'/'Right'); etiketsiz kayıtta (skor 0) veya elsiz karede None.
+    # Canlı çalışmadaki HandDetection.labels ile aynı: eller aynı slotlara atanır
+    if not len(handedness) or not handedness[:, 1].all():
+        return None
+    return [HANDEDNESS_LABELS[int(label)] for label in handedness[:, 0]]
+
+
+def replay_into(app, recording, shape, background=None, on_frame=None):
+    # Kaydı modele dokunmadan çizim/jest mantığına sınırsız hızda besler
+    buffer = LandmarkBuffer(recording.max_hands)
+    frame = np.zeros(shape, dtype=np.uint8) if background is None else background
+    work = np.empty_like(frame)
+    for i, (timestamp, points, handedness) in enumerate(recording):
+        np.copyto(work, frame)
+        hands = buffer.update_normalized(points, shape)
+        output = app.process_hands(work, hands, hand_ids=recorded_labels(handedness), timestamp=timestamp)
+        if on_frame is not None:
+            on_frame(i, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaydedilmiş MediaPipe sonuçlarını modelsiz tekrar oynat")
+    parser.add_argument('recording', help="Kayıt taban yolu (<taban>.json/.f32/.idx.npy)")
+    parser.add_argument('--app', choices=('advanced', 'simple'), default='advanced')
+    parser.add_argument('--size', type=parse_size, default=None, help="Kare boyutu (varsayılan: kayıttaki)")
+    parser.add_argument('--canvas-out', default=None, help="Son tuvali PNG olarak kaydet")
+    parser.add_argument('--profile', action='store_true', help="cProfile ile en pahalı fonksiyonları göster")
+    args = parser.parse_args()
+
+    recording = LandmarkReplay(args.recording)
+    if not len(recording):
+        print(f"Kayıt boş, oynatılacak kare yok: {args.recording}")
+        return
+    w, h = args.size or recording.frame_size or (1280, 720)
+    if args.app == 'advanced':
+        from deneme import AdvancedHandDrawing
+        app = AdvancedHandDrawing(max_num_hands=recording.max_hands)
+    else:
+        from deneme2 import FingerDrawingApp
+        app = FingerDrawingApp()
+        app.verbose = False
+
+    start_time = time.perf_counter()
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.runcall(replay_into, app, recording, (h, w, 3))
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+    else:
+        replay_into(app, recording, (h, w, 3))
+    elapsed = time.perf_counter() - start_time
+    print(f"{len(recording)} kare, {elapsed:.2f} sn, {len(recording) / max(elapsed, 1e-9):.1f} FPS")
+    if args.app == 'simple':
+        app.close()
+        print(f"Tanınan metin: {app.written_text!r}")
+
+    if args.canvas_out:
+        if args.app == 'advanced':
+            canvas = app.drawing_canvas.raster() if app.drawing_canvas is not None else None
+        else:
+            canvas = app.canvas
+        if canvas is not None:
+            cv2.imwrite(args.canvas_out, canvas)
+            print(f"Tuval kaydedildi: {args.canvas_out}")
+        else:
+            print("Tuval oluşmadı, kaydedilmedi")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+# Oturum videosu: birleştirilmiş (çizim + UI) kareler ayrı bir kodlayıcı thread'inde yazılır.
+# Ana thread kareyi önceden ayrılmış halka tampondaki boş bir yuvaya kopyalar; kodlayıcı geride kalırsa
+# en eski bekleyen kare atılır, kare döngüsü hiç beklemez.
+# Yan dosya <taban>.timecodes.txt ("timecode format v2", kare başına ms) gerçek kare zamanlarını tutar;
+# atılan kareler videoda yer almadığından tekrar oynatma süresi bu dosyayla birebir korunur
+# (ör. mkvmerge -o oturum.mkv --timestamps 0:oturum.timecodes.txt oturum.mp4).
+
+# Uzantıya göre varsayılan FourCC (OpenCV'nin her platformda yazılımla kodlayabildikleri)
+FOURCC = {'.mp4': 'mp4v', '.avi': 'MJPG', '.mkv': 'XVID', '.mov': 'mp4v'}
+RAW_EXTENSIONS = ('.bgr', '.raw')
+
+
+class VideoWriterSink:
+    # cv2.VideoWriter; arka uç (FFmpeg, GStreamer, MSMF...) OpenCV kurulumuna göre seçilir
+    def __init__(self, path, fps, fourcc=None):
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc or FOURCC.get(os.path.splitext(path)[1].lower(), 'mp4v')
+        self.writer = None
+
+    def open(self, shape):
+        h, w = shape[:2]
+        self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+        return self.writer.isOpened()
+
+    def write(self, frame):
+        self.writer.write(frame)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+
+class RawFrameSink:
+    # Sıkıştırılmamış BGR kareler + <taban>.json başlık (kodlayıcı gerektirmez, en hızlı yazım).
+    # ffmpeg -f rawvideo -pix_fmt bgr24 -s GxY -r FPS -i <taban>.bgr ile okunabilir
+    def __init__(self, path, fps):
+        self.path = path
+        self.fps = fps
+        self.shape = None
+        self.frames = 0
+        self._file = None
+
+    def open(self, shape):
+        self.shape = shape
+        self._file = open(self.path, 'wb')
+        return True
+
+    def write(self, frame):
+        self._file.write(memoryview(frame).cast('B'))
+        self.frames += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        h, w = self.shape[:2]
+        with open(os.path.splitext(self.path)[0] + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'width': w, 'height': h, 'fps': self.fps, 'pixel_format': 'bgr24',
+                       'frames': self.frames}, f)
+
+
+class SessionVideoRecorder:
+    # capacity: halka tampondaki kare sayısı (kodlanan kare dahil); bellek = capacity x kare boyutu
+    def __init__(self, path, fps=30.0, capacity=8, fourcc=None):
+        self.path = path
+        self.fps = fps
+        self.capacity = max(2, capacity)
+        base, ext = os.path.splitext(path)
+        self.timecodes_path = base + '.timecodes.txt'
+        if ext.lower() in RAW_EXTENSIONS:
+            self.sink = RawFrameSink(path, fps)
+        else:
+            self.sink = VideoWriterSink(path, fps, fourcc)
+        self.frames_in = 0
+        self.written = 0
+        self.dropped = 0
+        self._slots = None
+        self._free = []
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self._start_time = None
+
+    def write(self, frame, timestamp=None):
+        # Kare kopyalanır (çağıran tamponunu hemen yeniden kullanabilir); hiçbir durumda beklemez
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        with self._cond:
+            if self._closed:
+                return False
+            if self._slots is None:
+                self._start(frame.shape)
+            self.frames_in += 1
+            if self._free:
+                slot = self._free.pop()
+            else:
+                # Kodlayıcı geride: en eski bekleyen kare atılır, yuvası yeniden kullanılır
+                slot, _ = self._queue.popleft()
+                self.dropped += 1
+        target = self._slots[slot]
+        if frame.shape == target.shape:
+            np.copyto(target, frame)
+        else:
+            # Kare boyutu değişti (ör. kaynak çözünürlüğü): video boyutu ilk kareninkidir
+            cv2.resize(frame, (target.shape[1], target.shape[0]), dst=target)
+        with self._cond:
+            self._queue.append((slot, timestamp))
+            self._cond.notify()
+        return True
+
+    def _start(self, shape):
+        self._slots = [np.empty(shape, dtype=np.uint8) for _ in range(self.capacity)]
+        self._free = list(range(self.capacity))
+        if not self.sink.open(shape):
+            # Kodlayıcı açılamadı: kareler kaybolmasın diye ham kayda geçilir
+            raw_path = os.path.splitext(self.path)[0] + '.bgr'
+            print(f"Uyarı: {self.path} için kodlayıcı açılamadı, ham kayıt: {raw_path}")
+            self.sink = RawFrameSink(raw_path, self.fps)
+            self.path = raw_path
+            self.sink.open(shape)
+        self._thread = threading.Thread(target=self._run, name="video-encoder", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        with open(self.timecodes_path, 'w', encoding='utf-8') as timecodes:
+            timecodes.write("# timecode format v2\n")
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._queue or self._closed)
+                    if not self._queue:
+                        break
+                    slot, timestamp = self._queue.popleft()
+                self.sink.write(self._slots[slot])
+                if self._start_time is None:
+                    self._start_time = timestamp
+                timecodes.write(f"{(timestamp - self._start_time) * 1000:.3f}\n")
+                self.written += 1
+                with self._cond:
+                    self._free.append(slot)
+        self.sink.close()
+
+    def stats(self):
+        return {'frames': self.frames_in, 'written': self.written, 'dropped': self.dropped}
+
+    def close(self):
+        # Bekleyen kareler yazılır, dosyalar kapatılır
+        with self._cond:
+            if self._closed:
+                return self.stats()
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stats()
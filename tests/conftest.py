@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testler kök dizindeki modülleri içe aktarır (benchmarks/ ile aynı düzen)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,34 @@
+import argparse
+
+import pytest
+
+from backends import parse_backend
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog='deneme')
+    parser.add_argument('--backend', type=parse_backend, default='mediapipe')
+    return parser
+
+
+def test_parse_backend_specs():
+    assert parse_backend('mediapipe') == ('mediapipe', '')
+    assert parse_backend('tasks:hand_landmarker.task') == ('tasks', 'hand_landmarker.task')
+    assert parse_backend('fake:15') == ('fake', '15')
+    assert make_parser().parse_args([]).backend == ('mediapipe', '')
+
+
+@pytest.mark.parametrize('spec, message', [
+    ('yok', 'Bilinmeyen arka uç: yok'),
+    ('tasks', "'tasks' arka ucu bir dosya ister"),
+    ('replay', "'replay' arka ucu bir dosya ister"),
+    ('fake:hızlı', "gecikmesi ms cinsinden sayı olmalı"),
+])
+def test_invalid_backend_reports_message(spec, message, capsys):
+    # argparse ValueError'da genel "invalid parse_backend value" yazar; ArgumentTypeError mesajı korunur
+    with pytest.raises(SystemExit) as exit_info:
+        make_parser().parse_args(['--backend', spec])
+    assert exit_info.value.code == 2
+    err = capsys.readouterr().err
+    assert message in err
+    assert 'invalid parse_backend value' not in err
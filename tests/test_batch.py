@@ -0,0 +1,47 @@
+import time
+
+import numpy as np
+import pytest
+
+import batch
+from backends import FakeBackend
+from benchmarks.fixtures import synthetic_stream
+from deneme import AdvancedHandDrawing
+from deneme2 import FingerDrawingApp
+
+
+def run_video(app_name, wall_step, monkeypatch, frames=300, fps=30.0):
+    # Duvar saati her karede wall_step ilerler (hızlı/yavaş CPU); video zamanı kare / FPS
+    clock = [1000.0]
+
+    def tick():
+        clock[0] += wall_step
+        return clock[0]
+
+    monkeypatch.setattr(time, 'monotonic', tick)
+    monkeypatch.setattr(time, 'time', tick)
+    backend = FakeBackend(synthetic_stream(1))
+    if app_name == 'advanced':
+        app = AdvancedHandDrawing(max_num_hands=1, backend=backend)
+    else:
+        app = FingerDrawingApp(backend=backend)
+        app.verbose = False
+    image = np.zeros((240, 320, 3), dtype=np.uint8)
+    gestures = []
+    for i in range(frames):
+        _, _, frame_gestures = batch.process_frame(app, app_name, image.copy(), i / fps)
+        gestures.append(list(frame_gestures))
+    canvas = batch.final_canvas(app, app_name)
+    if app_name == 'advanced':
+        app.exports.close()
+    else:
+        app.close()
+    return canvas, gestures
+
+
+@pytest.mark.parametrize('app_name', ['advanced', 'simple'])
+def test_batch_output_independent_of_cpu_speed(app_name, monkeypatch):
+    fast_canvas, fast_gestures = run_video(app_name, 0.002, monkeypatch)
+    slow_canvas, slow_gestures = run_video(app_name, 0.2, monkeypatch)
+    assert fast_gestures == slow_gestures
+    assert np.array_equal(fast_canvas, slow_canvas)
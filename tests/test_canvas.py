@@ -0,0 +1,48 @@
+import numpy as np
+
+from benchmarks.fixtures import GESTURE_FINGERS, hand_pose
+from canvas import DrawingCanvas
+from deneme import AdvancedHandDrawing
+from landmarks import LandmarkBuffer
+
+
+def stroke_widths(canvas, key=0):
+    stroke = canvas.strokes.current(key)
+    return stroke.points[:stroke.count, 2] / min(canvas.store_scale)
+
+
+def draw_path(dt):
+    # Aynı yol, kareler arası farklı sürelerle: 20 px/kare yatay hareket
+    canvas = DrawingCanvas((240, 320, 3))
+    points = [(20 + 20 * i, 120) for i in range(10)]
+    for i in range(1, len(points)):
+        canvas.line(points[i - 1], points[i], (0, 255, 0), 8, timestamp=i * dt)
+    return stroke_widths(canvas)
+
+
+def test_line_width_follows_real_velocity():
+    # 30 FPS'te 600 px/sn, 5 FPS'te 100 px/sn: yavaş hareket daha kalın çizilir
+    fast = draw_path(1 / 30)
+    slow = draw_path(1 / 5)
+    assert slow[-1] > fast[-1]
+    assert slow[-1] > 0.9 * 8
+
+
+def app_stroke_widths(dt, frames=40):
+    # Çizim jesti yapan el sabit hızla (kare başına) sağa kayar; kare zamanı process_hands'e verilir
+    shape = (480, 640, 3)
+    app = AdvancedHandDrawing(max_num_hands=1, smoothing='none')
+    buffer = LandmarkBuffer(1)
+    for i in range(frames):
+        pose = hand_pose((0.2 + 0.01 * i, 0.7), 0.25, GESTURE_FINGERS['draw'])[None]
+        hands = buffer.update_normalized(pose, shape)
+        app.process_hands(np.zeros(shape, dtype=np.uint8), hands, timestamp=i * dt)
+    app.exports.close()
+    return stroke_widths(app.drawing_canvas, app.tracker.tracks[0].slot)
+
+
+def test_drawing_uses_frame_time_for_width():
+    # Aynı piksel yolu: düşük FPS'te hız düşüktür, çizgi incelmemeli
+    fast = app_stroke_widths(1 / 30)
+    slow = app_stroke_widths(1 / 5)
+    assert slow[-1] > fast[-1]
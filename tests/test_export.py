@@ -0,0 +1,25 @@
+import argparse
+
+import pytest
+
+from export import parse_formats
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog='deneme')
+    parser.add_argument('--export-formats', type=parse_formats, default=('png',))
+    return parser
+
+
+def test_parse_formats():
+    assert parse_formats('PNG, svg') == ('png', 'svg')
+    assert make_parser().parse_args(['--export-formats', 'json']).export_formats == ('json',)
+
+
+@pytest.mark.parametrize('spec', ['png,gif', ','])
+def test_invalid_formats_list_choices(spec, capsys):
+    with pytest.raises(SystemExit):
+        make_parser().parse_args(['--export-formats', spec])
+    err = capsys.readouterr().err
+    assert 'seçenekler: png, webp, svg, json' in err
+    assert 'invalid parse_formats value' not in err
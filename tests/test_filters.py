@@ -0,0 +1,32 @@
+import argparse
+
+import pytest
+
+from filters import make_filter, parse_filter
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog='deneme')
+    parser.add_argument('--filter', type=parse_filter, default='one_euro')
+    return parser
+
+
+def test_parse_filter_params():
+    assert parse_filter('kalman:q=500,r=9') == ('kalman', {'q': 500.0, 'r': 9.0})
+    assert parse_filter('one_euro:max_gap=0.2') == ('one_euro', {'max_gap': 0.2})
+    # Ayrıştırılan her parametre filtre kurucusunda geçerlidir
+    make_filter(make_parser().parse_args(['--filter', 'ema:alpha=0.4,max_gap=1']).filter)
+
+
+@pytest.mark.parametrize('spec, message', [
+    ('median', 'Bilinmeyen filtre: median'),
+    ('one_euro:foo=1', "'one_euro' filtresinde foo parametresi yok (parametreler: min_cutoff, beta, d_cutoff, max_gap)"),
+    ('ema:alpha=hızlı', 'alpha sayı olmalı'),
+])
+def test_invalid_filter_reports_message(spec, message, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        make_parser().parse_args(['--filter', spec])
+    assert exit_info.value.code == 2
+    err = capsys.readouterr().err
+    assert message in err
+    assert 'invalid parse_filter value' not in err
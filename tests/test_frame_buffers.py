@@ -0,0 +1,155 @@
+import tracemalloc
+
+import cv2
+import numpy as np
+import pytest
+
+from backends import HandDetection, LandmarkBackend, FakeBackend
+from benchmarks.fixtures import synthetic_stream
+from deneme import AdvancedHandDrawing, mirror_frame
+from inference import FramePool, InputBuffer, model_input
+
+
+@pytest.fixture
+def video(tmp_path):
+    # Küçük MJPG test videosu
+    path = str(tmp_path / 'kareler.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (160, 120))
+    rng = np.random.default_rng(0)
+    for _ in range(6):
+        writer.write(rng.integers(0, 256, (120, 160, 3), dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_frame_pool_reuses_buffer(video):
+    cap = cv2.VideoCapture(video)
+    pool = FramePool()
+    success, first = pool.read(cap)
+    assert success
+    pool.release(first)
+    for _ in range(4):
+        success, image = pool.read(cap)
+        assert success and image is first
+        pool.release(image)
+    cap.release()
+
+
+def test_frame_pool_does_not_hand_out_buffer_in_use(video):
+    cap = cv2.VideoCapture(video)
+    pool = FramePool(2)
+    _, a = pool.read(cap)
+    _, b = pool.read(cap)
+    # İade edilmeyen kare başka bir okumaya verilmez
+    assert a is not b and not np.shares_memory(a, b)
+    pool.release(a)
+    _, c = pool.read(cap)
+    assert c is a
+    cap.release()
+
+
+@pytest.mark.parametrize('inference_size', [None, (80, 60)])
+def test_input_buffer_reuses_arrays(inference_size):
+    rng = np.random.default_rng(1)
+    buffer = InputBuffer()
+    first = None
+    for _ in range(3):
+        frame = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+        rgb = buffer(frame, inference_size)
+        np.testing.assert_array_equal(rgb, model_input(frame, inference_size))
+        first = rgb if first is None else first
+        assert rgb is first
+
+
+class BrightestPixel(LandmarkBackend):
+    # Görüntüyü okuyan sahte model: tüm landmark'lar en parlak pikselde, etiket sol yarıda 'Left'
+    name = 'brightest'
+    uses_image = True
+
+    def __init__(self):
+        super().__init__(1)
+        self.seen = None
+
+    def _detect(self, image_rgb, timestamp):
+        self.seen = image_rgb.copy()
+        h, w = image_rgb.shape[:2]
+        y, x = np.unravel_index(np.argmax(image_rgb[..., 0]), (h, w))
+        points = np.zeros((1, 21, 3), dtype=np.float32)
+        points[0, :, 0] = (x + 0.5) / w
+        points[0, :, 1] = (y + 0.5) / h
+        return HandDetection(points, np.array([[0.0 if x < w / 2 else 1.0, 0.9]], dtype=np.float32))
+
+
+def test_mirroring_flips_landmarks_not_model_input():
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    frame[30, 20] = 255
+    app = AdvancedHandDrawing(max_num_hands=1, backend=BrightestPixel(), mirror=True)
+    image = frame.copy()
+    detection = app.process_frame(image)
+    # Model aynalanmamış kareyi gördü, kare tespitte değişmedi
+    np.testing.assert_array_equal(app.backend.seen, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    np.testing.assert_array_equal(image, frame)
+    # Landmark'lar aynalı ekran koordinatında: x -> 1 - x, sol -> sağ
+    assert detection.points[0, 0, 0] == pytest.approx(1 - 20.5 / 160)
+    assert detection.points[0, 0, 1] == pytest.approx(30.5 / 120)
+    assert detection.labels() == ['Right']
+    # Gösterim için yerinde aynalama: aynı dizi, eski cv2.flip çıktısıyla aynı pikseller
+    mirror_frame(app, image)
+    np.testing.assert_array_equal(image, cv2.flip(frame, 1))
+    x = int(detection.points[0, 0, 0] * 160)
+    assert image[30, x].max() == 255
+
+
+def test_no_mirror_leaves_frame_and_landmarks():
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    frame[30, 20] = 255
+    app = AdvancedHandDrawing(max_num_hands=1, backend=BrightestPixel(), mirror=False)
+    image = frame.copy()
+    detection = app.process_frame(image)
+    mirror_frame(app, image)
+    np.testing.assert_array_equal(image, frame)
+    assert detection.points[0, 0, 0] == pytest.approx(20.5 / 160)
+    assert detection.labels() == ['Left']
+
+
+@pytest.mark.parametrize('inference_size', [None, (320, 180)])
+def test_pooled_frame_path_allocates_no_frame_sized_arrays(inference_size):
+    # Kare döngüsü (okuma, tespit, aynalama, çizim, UI) ısındıktan sonra kare başına tepe ayırma
+    # model girdisinin 3/4'ünü geçmemeli: tam kare veya küçültülmüş kopya ayrılırsa yakalanır
+    size = (640, 360)
+    rng = np.random.default_rng(2)
+    frames = [rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8) for _ in range(4)]
+
+    class Camera:
+        index = 0
+
+        def read(self, image=None):
+            source = frames[self.index % len(frames)]
+            self.index += 1
+            if image is None:
+                return True, source.copy()
+            np.copyto(image, source)
+            return True, image
+
+    app = AdvancedHandDrawing(max_num_hands=2, inference_size=inference_size,
+                              backend=FakeBackend(synthetic_stream(2)), mirror=True)
+    cap, pool = Camera(), FramePool()
+    input_size = inference_size or size
+    limit = 0.75 * input_size[0] * input_size[1] * 3
+    peaks = []
+    tracemalloc.start()
+    try:
+        for index in range(60):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            _, image = pool.read(cap)
+            detection = app.process_frame(image)
+            mirror_frame(app, image)
+            app.draw_ui(app.process_drawing(image, detection))
+            pool.release(image)
+            if index >= 10:
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+        app.exports.close()
+    assert np.median(peaks) < limit
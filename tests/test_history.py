@@ -0,0 +1,125 @@
+import numpy as np
+
+import canvas as canvas_module
+
+from benchmarks.fixtures import GESTURE_FINGERS, hand_pose
+from canvas import COMPACT_MIN_POINTS, DrawingCanvas
+from deneme2 import FingerDrawingApp
+from landmarks import LandmarkBuffer
+
+SHAPE = (240, 320, 3)
+
+
+def draw(canvas, i, points=60):
+    # i. çizgi: kısa adımlarla eğik bir yol (çok nokta, az karo)
+    y = 20 + (i * 13) % 200
+    prev = (10, y)
+    for k in range(1, points):
+        p = (10 + k * 5, y + (k % 3))
+        canvas.line(prev, p, (0, 255, (i * 37) % 256), 4)
+        prev = p
+    return canvas.end_stroke(0)
+
+
+def session(canvas, steps, clear_every=4):
+    compactions = []
+    canvas.compact_listeners.append(compactions.append)
+    for i in range(steps):
+        draw(canvas, i)
+        if i % clear_every == clear_every - 1:
+            canvas.clear()
+        canvas.flush()
+    return compactions
+
+
+def test_long_session_keeps_store_bounded():
+    canvas = DrawingCanvas(SHAPE, history_bytes=256 << 10)
+    compactions = session(canvas, 400)
+    store = canvas.strokes
+    assert compactions
+    # Geri alınabilecek adımların çizgileri + en fazla bir o kadar (ve eşik kadar) kullanılmayan nokta
+    strokes, segments = canvas.history.references()
+    used = int(store.lengths[:store.count][store.in_use(strokes, segments)].sum())
+    assert store.num_points <= max(2 * used, used + COMPACT_MIN_POINTS)
+    assert store.num_points < 400 * 60 / 3
+    assert len(store.index) < 400 * 60 * 4 / 3
+    assert canvas.history.nbytes <= canvas.history.max_bytes
+
+
+def test_cleared_strokes_count_towards_history_size():
+    canvas = DrawingCanvas(SHAPE)
+    indices = [draw(canvas, i) for i in range(5)]
+    before = canvas.history.nbytes
+    canvas.clear()
+    assert canvas.history.nbytes - before >= canvas.strokes.strokes_nbytes(indices)
+    canvas.undo()
+    assert canvas.history.nbytes <= before
+
+
+def test_undo_redo_after_compaction_matches_unbounded_history():
+    small = DrawingCanvas(SHAPE, history_bytes=1 << 20)
+    full = DrawingCanvas(SHAPE, history_bytes=1 << 40)
+    compactions = session(small, 150)
+    session(full, 150)
+    assert compactions and len(small.strokes) < len(full.strokes)
+    np.testing.assert_array_equal(small.raster(), full.raster())
+    depth = len(small.history.undo_stack)
+    assert depth > 4
+    for _ in range(depth):
+        assert small.undo() and full.undo()
+        np.testing.assert_array_equal(small.raster(), full.raster())
+    assert not small.undo()
+    for _ in range(depth):
+        assert small.redo() and full.redo()
+        np.testing.assert_array_equal(small.raster(), full.raster())
+    # Yinelemeden sonra yeni çizgi: yinele yığını düşer, çizim devam eder
+    small.undo(), full.undo()
+    draw(small, 999), draw(full, 999)
+    np.testing.assert_array_equal(small.raster(), full.raster())
+
+
+def test_erase_history_survives_compaction():
+    small = DrawingCanvas(SHAPE, history_bytes=128 << 10)
+    full = DrawingCanvas(SHAPE, history_bytes=1 << 40)
+    for canvas in (small, full):
+        session(canvas, 120)
+        draw(canvas, 500)
+        canvas.erase((100, 20 + (500 * 13) % 200), 12, key=1)
+        canvas.end_stroke(1)
+    np.testing.assert_array_equal(small.raster(), full.raster())
+    small.undo(), full.undo()
+    np.testing.assert_array_equal(small.raster(), full.raster())
+
+
+def test_text_follows_compacted_strokes(monkeypatch):
+    monkeypatch.setattr(canvas_module, 'COMPACT_MIN_POINTS', 256)
+    app = FingerDrawingApp(smoothing='none')
+    app.verbose = False
+    buffer = LandmarkBuffer(1)
+    t = 0.0
+    compactions = []
+
+    def frame(gesture, center):
+        nonlocal t
+        t += 1 / 30
+        hands = buffer.update_normalized(hand_pose(center, 0.25, GESTURE_FINGERS[gesture])[None], (480, 640, 3))
+        app.process_hands(np.zeros((480, 640, 3), dtype=np.uint8), hands, timestamp=t)
+
+    frame('fist', (0.5, 0.5))
+    app.drawing_canvas.history.max_bytes = 512 << 10
+    app.drawing_canvas.compact_listeners.append(compactions.append)
+    for n in range(40):
+        for i in range(20):
+            frame('draw', (0.2 + 0.02 * i, 0.3 + 0.01 * (n % 40)))
+        frame('fist', (0.5, 0.5))
+        if n % 4:
+            # Geri alınan çizgi, sonraki çizgiyle yinele yığınından düşer ve depodan atılır
+            app.undo()
+    app.collect_recognized(wait=True)
+    assert compactions
+    visible = app.drawing_canvas.strokes.visible
+    assert all(s is None or visible[s] for s in app.text_strokes)
+    length = len(app.written_text)
+    assert app.undo()
+    assert len(app.written_text) == length - 1
+    app.close()
@@ -0,0 +1,51 @@
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import deneme
+from backends import FakeBackend
+from benchmarks.fixtures import synthetic_stream
+from deneme import AdvancedHandDrawing
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / 'kamera.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (160, 120))
+    for i in range(12):
+        writer.write(np.full((120, 160, 3), i * 10, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+@pytest.mark.parametrize('run, options', [
+    (deneme.run_advanced_drawing, {}),
+    (deneme.run_advanced_drawing, {'infer_every': 2}),
+    (deneme.run_pipelined_drawing, {}),
+])
+def test_live_paths_draw_with_capture_time(video, run, options, monkeypatch):
+    # Çizim, işlendiği anın değil karenin yakalandığı anın zamanını almalı
+    captures = []
+    perf_counter = time.perf_counter
+
+    def capture_clock():
+        captures.append(perf_counter())
+        return captures[-1]
+
+    monkeypatch.setattr(time, 'perf_counter', capture_clock)
+    app = AdvancedHandDrawing(max_num_hands=2, backend=FakeBackend(synthetic_stream(2)), mirror=True)
+    seen = []
+    process_hands = app.process_hands
+
+    def record(image, hands, multi_hand_landmarks=None, hand_ids=None, timestamp=None):
+        seen.append(timestamp)
+        return process_hands(image, hands, multi_hand_landmarks, hand_ids, timestamp)
+
+    app.process_hands = record
+    run(source=video, headless=True, max_frames=10, advanced_hands=app, **options)
+    assert len(seen) >= 5
+    assert all(t is not None for t in seen)
+    assert all(t in captures for t in seen)
+    assert seen == sorted(seen)
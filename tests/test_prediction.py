@@ -0,0 +1,72 @@
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from backends import HandDetection
+from benchmarks.fixtures import GESTURE_FINGERS, hand_pose, synthetic_stream
+from landmarks import INDEX_TIP
+from prediction import ConstantVelocityPredictor, SkippingDetector
+
+
+def pixel_pose(center, gesture, shape=(720, 1280)):
+    pose = hand_pose(center, 0.22, GESTURE_FINGERS[gesture])[None].copy()
+    pose[..., 0] *= shape[1]
+    pose[..., 1] *= shape[0]
+    return pose
+
+
+def test_pose_change_resets_velocity():
+    predictor = ConstantVelocityPredictor(1)
+    predictor.update(pixel_pose((0.4, 0.7), 'fist'), 0.0)
+    predictor.update(pixel_pose((0.41, 0.7), 'draw'), 0.1)
+    # İşaret parmağının açılması hız sayılmaz: kestirim son tespitte kalır
+    assert np.allclose(predictor.predict(0.2), predictor.last[:1])
+
+
+def test_extrapolation_clamped_to_last_step():
+    predictor = ConstantVelocityPredictor(1, max_horizon=1.0)
+    predictor.update(pixel_pose((0.40, 0.7), 'draw'), 0.0)
+    predictor.update(pixel_pose((0.41, 0.7), 'draw'), 0.05)
+    step = predictor.last[0, INDEX_TIP, 0] - pixel_pose((0.40, 0.7), 'draw')[0, INDEX_TIP, 0]
+    # 0.5 sn sonrası: son adımın en fazla bir katı kadar ileri (10 adım değil)
+    moved = predictor.predict(0.55)[0, INDEX_TIP, 0] - predictor.last[0, INDEX_TIP, 0]
+    assert moved == pytest.approx(step, rel=1e-3)
+
+
+def simulate(latency, corrected, fps=30.0, size=(1280, 720)):
+    # benchmarks/async_inference.py'nin zaman çizelgesi, beklemesiz: model tek işçi, sonuç latency sonra gelir
+    truth = synthetic_stream(1, noise=0.0)[0][:240, :1]
+    scale = np.array(size, dtype=np.float32)
+    pending = []
+    current = [0]
+
+    def submit(index, timestamp):
+        future = Future()
+        pending.append((timestamp + latency, future, index))
+        return future
+
+    detector = SkippingDetector(lambda image: current[0], None, 1, adaptive=True, submit_fn=submit)
+    if not corrected:
+        detector.predictor.max_horizon = 0.0
+    frame = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    errors = []
+    for i in range(len(truth)):
+        t = i / fps
+        current[0] = i
+        for item in [item for item in pending if item[0] <= t]:
+            item[1].set_result(HandDetection(truth[item[2]].copy()))
+            pending.remove(item)
+        hands = detector(frame, t)[0][..., :2]
+        if len(hands):
+            errors.append(np.hypot(*(hands[0, INDEX_TIP] - truth[i, 0, INDEX_TIP, :2] * scale)))
+    return np.array(errors)
+
+
+@pytest.mark.parametrize('latency', [0.03, 0.06, 0.09])
+def test_corrected_tail_not_worse_than_uncorrected(latency):
+    corrected = simulate(latency, True)
+    uncorrected = simulate(latency, False)
+    assert np.percentile(corrected, 95) <= np.percentile(uncorrected, 95)
+    assert np.percentile(corrected, 50) < np.percentile(uncorrected, 50)
+    assert corrected.max() <= uncorrected.max()
@@ -0,0 +1,56 @@
+import numpy as np
+
+from backends import ReplayBackend
+from benchmarks.fixtures import GESTURE_FINGERS, hand_pose
+from replay import LandmarkRecorder, LandmarkReplay, main, replay_into
+
+
+class CallRecorder:
+    # process_hands çağrılarını saklayan uygulama yerine geçen nesne
+    def __init__(self):
+        self.calls = []
+
+    def process_hands(self, image, hands, multi_hand_landmarks=None, hand_ids=None, timestamp=None):
+        self.calls.append((hands.copy(), hand_ids, timestamp))
+        return image
+
+
+def two_hands(x_left, x_right):
+    return np.stack([hand_pose((x_left, 0.7), 0.2, GESTURE_FINGERS['draw']),
+                     hand_pose((x_right, 0.7), 0.2, GESTURE_FINGERS['fist'])])
+
+
+def test_replay_passes_recorded_hand_labels(tmp_path):
+    base = str(tmp_path / 'oturum')
+    with LandmarkRecorder(base, max_hands=2, frame_size=(320, 240)) as recorder:
+        # Etiketli iki el, sonra etiketsiz (skor 0) kare, sonra elsiz kare
+        recorder.write_arrays(two_hands(0.3, 0.7), np.array([[0, 0.9], [1, 0.8]], np.float32), 0.0)
+        recorder.write_arrays(two_hands(0.7, 0.3), np.array([[1, 0.9], [0, 0.8]], np.float32), 0.033)
+        recorder.write_arrays(two_hands(0.3, 0.7), None, 0.066)
+        recorder.write_arrays(np.zeros((0, 21, 3), np.float32), None, 0.1)
+    app = CallRecorder()
+    replay_into(app, LandmarkReplay(base), (240, 320, 3))
+    assert [call[1] for call in app.calls] == [['Left', 'Right'], ['Right', 'Left'], None, None]
+    assert [call[2] for call in app.calls] == [0.0, 0.033, 0.066, 0.1]
+
+
+def test_replay_backend_matches_live_labels(tmp_path):
+    base = str(tmp_path / 'oturum')
+    with LandmarkRecorder(base, max_hands=2) as recorder:
+        recorder.write_arrays(two_hands(0.3, 0.7), np.array([[1, 0.9], [0, 0.8]], np.float32), 0.0)
+        recorder.write_arrays(two_hands(0.3, 0.7), None, 0.033)
+    backend = ReplayBackend(base, loop=False)
+    assert backend.detect(None).labels() == ['Right', 'Left']
+    assert backend.detect(None).labels() is None
+
+
+def test_empty_recording(tmp_path, capsys, monkeypatch):
+    base = str(tmp_path / 'bos')
+    LandmarkRecorder(base, max_hands=2).close()
+    recording = LandmarkReplay(base)
+    assert len(recording) == 0
+    assert len(ReplayBackend(recording, loop=True).detect(None)) == 0
+    monkeypatch.setattr('sys.argv', ['replay.py', base, '--canvas-out', str(tmp_path / 'tuval.png')])
+    main()
+    assert 'Kayıt boş' in capsys.readouterr().out
+    assert not (tmp_path / 'tuval.png').exists()
@@ -0,0 +1,63 @@
+import numpy as np
+
+from strokes import StrokeStore
+
+
+def horizontal(y, n=40, x0=10.0, width=4.0):
+    points = np.zeros((n, 3), dtype=np.float32)
+    points[:, 0] = x0 + np.arange(n) * 5
+    points[:, 1] = y
+    points[:, 2] = width
+    return points
+
+
+def filled_store(count=30):
+    store = StrokeStore((320, 240), capacity=64, max_strokes=4)
+    for i in range(count):
+        store.append(horizontal(5 + 7 * i), (0, 255, i))
+    return store
+
+
+def test_compact_drops_unused_strokes_and_shrinks_buffers():
+    store = filled_store()
+    # Çift çizgiler gizlenir (ör. temizlendi, geçmişten düştü); 3. çizgi tamamen silinir
+    store.set_visible(np.arange(0, 30, 2), False)
+    store.remove_stroke(3)
+    before = store.rasterize((240, 320))
+    keep = store.in_use()
+    assert keep.sum() == 14
+    points_capacity = len(store.points)
+    stroke_map, point_map = store.compact(keep)
+    assert len(store) == 14 and store.num_points == 14 * 40
+    assert len(store.points) < points_capacity
+    assert stroke_map[1] == 0 and stroke_map[2] == -1 and stroke_map[3] == -1 and stroke_map[5] == 1
+    np.testing.assert_array_equal(store.rasterize((240, 320)), before)
+    # Izgara sadece kalan parçaları tutar, sorgular yeni indeksleri döner
+    assert set(store.index.query(0, 0, 320, 240).tolist()) <= set(range(store.num_points))
+    assert store.stroke_at(60, 5 + 7 * 5) == stroke_map[5]
+    assert store.stroke_at(60, 5 + 7 * 4) is None
+
+
+def test_compact_keeps_referenced_strokes_and_segments():
+    store = filled_store(6)
+    store.set_visible([0, 1], False)
+    killed = store.remove_stroke(4)
+    # 0. çizgi bir geçmiş adımında (geri alınabilir), 4.'nün parçaları yeniden canlanabilir
+    stroke_map, point_map = store.compact(store.in_use(strokes=[0], segments=killed))
+    assert stroke_map.tolist() == [0, -1, 1, 2, 3, 4]
+    store.set_alive(point_map[killed], True)
+    store.set_visible([stroke_map[0]], True)
+    reference = filled_store(6)
+    reference.set_visible([1], False)
+    np.testing.assert_array_equal(store.rasterize((240, 320)), reference.rasterize((240, 320)))
+
+
+def test_snapshot_survives_compaction():
+    store = filled_store(10)
+    snapshot = store.snapshot()
+    expected = snapshot.rasterize((240, 320))
+    store.set_visible(np.arange(10), False)
+    store.compact(store.in_use())
+    store.append(horizontal(100, width=9.0), (255, 0, 0))
+    assert len(store) == 1
+    np.testing.assert_array_equal(snapshot.rasterize((240, 320)), expected)
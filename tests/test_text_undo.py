@@ -0,0 +1,106 @@
+import numpy as np
+
+from benchmarks.fixtures import GESTURE_FINGERS, hand_pose
+from deneme2 import FingerDrawingApp
+from landmarks import LandmarkBuffer
+
+SHAPE = (480, 640, 3)
+
+
+class Session:
+    # deneme2'ye kare kare el pozu verir; kare zamanı 1/30 sn adımlarla ilerler
+    def __init__(self):
+        self.app = FingerDrawingApp(smoothing='none')
+        self.app.verbose = False
+        self.buffer = LandmarkBuffer(1)
+        self.t = 0.0
+
+    def frame(self, gesture, center=(0.5, 0.6)):
+        pose = hand_pose(center, 0.25, GESTURE_FINGERS[gesture])[None]
+        hands = self.buffer.update_normalized(pose, SHAPE)
+        self.t += 1 / 30
+        self.app.process_hands(np.zeros(SHAPE, dtype=np.uint8), hands, timestamp=self.t)
+
+    def stroke(self, y):
+        # Çizim jestiyle yatay bir vuruş, yumrukla bitirilip tanımaya gönderilir
+        for i in range(12):
+            self.frame('draw', (0.2 + 0.03 * i, y))
+        self.frame('fist')
+        self.app.collect_recognized(wait=True)
+
+    def space(self):
+        # Açık el: boşluk (jest bekleme süresi geçsin diye önce yumruk kareleri)
+        for _ in range(30):
+            self.frame('fist')
+        self.frame('clear_canvas')
+
+    def close(self):
+        self.app.close()
+
+
+def test_undo_removes_recognized_character():
+    session = Session()
+    app = session.app
+    session.stroke(0.4)
+    session.stroke(0.7)
+    assert len(app.written_text) == 2
+    app.undo()
+    assert len(app.written_text) == 1
+    assert len(app.drawing_canvas.strokes.visible_strokes()) == 1
+    app.undo()
+    assert app.written_text == ""
+    app.redo()
+    app.redo()
+    assert len(app.written_text) == 2
+    session.close()
+
+
+def test_undo_keeps_gesture_text_and_order():
+    session = Session()
+    app = session.app
+    session.stroke(0.4)
+    session.space()
+    session.stroke(0.7)
+    text = app.written_text
+    assert len(text) == 3 and text[1] == " "
+    app.undo()
+    app.undo()
+    # Jestle eklenen boşluk çizgi değildir, geri alınmaz
+    assert app.written_text == " "
+    app.redo()
+    app.redo()
+    assert app.written_text == text
+    session.close()
+
+
+def test_new_stroke_after_undo_drops_undone_character():
+    session = Session()
+    app = session.app
+    session.stroke(0.4)
+    app.undo()
+    session.stroke(0.7)
+    app.redo()
+    assert len(app.written_text) == 1
+    assert app.hidden_text == []
+    session.close()
+
+
+def test_clear_does_not_touch_every_tile():
+    # "peace" temizlemesinden sonraki kareler tuvali tam okumaz: karolar sıfırlanmaz, geçmişe kopyalanmaz
+    session = Session()
+    app = session.app
+    for y in (0.3, 0.45, 0.6):
+        session.stroke(y)
+    canvas = app.drawing_canvas
+    for _ in range(30):
+        session.frame('fist')
+    session.frame('peace')
+    assert app.text == []
+    nbytes = canvas.history.nbytes
+    cleared = canvas.history.undo_stack[-1]
+    for _ in range(5):
+        session.frame('fist')
+    assert cleared.tiles == {}
+    assert canvas.history.nbytes == nbytes
+    assert not (canvas.tile_gen == canvas.generation).any()
+    session.close()
@@ -0,0 +1,151 @@
+import numpy as np
+
+from filters import make_filter
+from gestures import GestureStabilizer
+from landmarks import WRIST
+
+# Avuç merkezi: bilek ve dört parmak tabanı (MCP)
+PALM_IDS = (WRIST, 5, 9, 13, 17)
+
+
+class HandTrack:
+    # Bir elin çizim durumu; slot sayısı kadar nesne baştan oluşturulur, kareler arasında yeniden kullanılır
+    __slots__ = ('slot', 'track_id', 'label', 'active', 'last_seen', 'prev', 'color',
+                 'brush_thickness', 'drawing_mode', 'eraser_mode', 'last_gesture_time', 'gesture')
+
+    def __init__(self, slot, gesture):
+        self.slot = slot
+        self.track_id = -1
+        self.label = None
+        self.active = False
+        self.last_seen = 0.0
+        self.prev = None
+        self.color = (0, 255, 0)
+        self.brush_thickness = 5
+        self.drawing_mode = False
+        self.eraser_mode = False
+        self.last_gesture_time = 0.0
+        self.gesture = gesture
+
+    def start(self, track_id, label, color, timestamp):
+        self.track_id = track_id
+        self.label = label
+        self.active = True
+        self.last_seen = timestamp
+        self.prev = None
+        self.color = color
+        self.drawing_mode = False
+        self.eraser_mode = False
+        # Yeni görünen el, ilk karelerde yanlışlıkla renk değiştirmesin diye bekleme süresiyle başlar
+        self.last_gesture_time = timestamp
+        self.gesture.reset()
+
+    def stop_stroke(self):
+        self.prev = None
+        self.drawing_mode = False
+        self.eraser_mode = False
+
+
+class HandTracker:
+    # Tespitleri önceki karedeki ellerle eşleştirir: el etiketi (sol/sağ) + avuç merkezi mesafesi.
+    # Durumun sayısal kısmı (merkezler, landmark filtresi) slot başına sabit boyutlu dizilerde tutulur.
+    # smoothing: filters.make_filter biçiminde filtre ("one_euro", "kalman:q=20000", ...)
+    def __init__(self, max_hands=2, max_jump=2.0, timeout=0.5, smoothing='one_euro',
+                 gesture_window=10, gesture_hysteresis=1, gesture_dwell=0.0):
+        self.max_hands = max_hands
+        self.max_jump = max_jump
+        self.timeout = timeout
+        self.tracks = [HandTrack(slot, GestureStabilizer(window=gesture_window, hysteresis=gesture_hysteresis,
+                                                         dwell=gesture_dwell))
+                       for slot in range(max_hands)]
+        self.centers = np.zeros((max_hands, 2), dtype=np.float32)
+        self.filter = make_filter(smoothing, max_hands)
+        self._smoothed = np.zeros((max_hands,) + self.filter.shape, dtype=np.float32)
+        self._assigned = [None] * max_hands
+        self._next_id = 0
+
+    def active_tracks(self):
+        return [track for track in self.tracks if track.active]
+
+    def assign(self, hands, sizes, labels=None, timestamp=0.0, default_color=(0, 255, 0)):
+        # hands: piksel uzayında (n, 21, 3); her tespit için bir HandTrack döner (tespit sırasıyla)
+        n = min(len(hands), self.max_hands)
+        for track in self.tracks:
+            if track.active and timestamp - track.last_seen > self.timeout:
+                track.active = False
+        assigned = self._assigned
+        for i in range(n):
+            assigned[i] = None
+        if n == 0:
+            for track in self.tracks:
+                track.stop_stroke()
+            return []
+
+        centers = hands[:n, PALM_IDS, :2].mean(axis=1)
+        active = [track.slot for track in self.tracks if track.active]
+        matched = set()
+        if active:
+            # Mesafe el boyuna göre ölçeklenir; etiket uyuşmazlığı bir eşik kadar ceza alır
+            cost = np.linalg.norm(centers[:, None, :] - self.centers[active][None, :, :], axis=2)
+            cost /= np.maximum(np.asarray(sizes[:n], dtype=np.float32), 1.0)[:, None]
+            if labels is not None:
+                for i in range(min(n, len(labels))):
+                    for j, slot in enumerate(active):
+                        label = self.tracks[slot].label
+                        if label is not None and labels[i] is not None and label != labels[i]:
+                            cost[i, j] += self.max_jump
+            # Açgözlü eşleştirme: en yakın çiftler önce (el sayısı küçük, Macar algoritması gereksiz)
+            for flat in np.argsort(cost, axis=None):
+                i, j = divmod(int(flat), len(active))
+                if cost[i, j] > self.max_jump:
+                    break
+                if assigned[i] is not None or active[j] in matched:
+                    continue
+                assigned[i] = self.tracks[active[j]]
+                matched.add(active[j])
+
+        for i in range(n):
+            label = labels[i] if labels is not None and i < len(labels) else None
+            track = assigned[i]
+            if track is None:
+                track = self._free_track()
+                if track is None:
+                    continue
+                track.start(self._next_id, label, default_color, timestamp)
+                self._next_id += 1
+                self.filter.reset(track.slot)
+                matched.add(track.slot)
+                assigned[i] = track
+            elif label is not None:
+                track.label = label
+            track.last_seen = timestamp
+            self.centers[track.slot] = centers[i]
+
+        # Bu karede görünmeyen eller çizgiyi koparır (süre dolana kadar durumları korunur)
+        for track in self.tracks:
+            if track.active and track.slot not in matched:
+                track.stop_stroke()
+        return assigned[:n]
+
+    def _free_track(self):
+        for track in self.tracks:
+            if not track.active:
+                return track
+        return None
+
+    def smooth(self, hands, tracks, timestamp):
+        # Eşleşen ellerin tüm landmark'ları slotlarının filtresiyle tek çağrıda yumuşatılır.
+        # Dönüş tracks ile aynı sıradadır; slotu olmayan ellerde ham değer kalır
+        n = len(tracks)
+        out = self._smoothed[:n]
+        out[:] = hands[:n]
+        rows = [i for i, track in enumerate(tracks) if track is not None]
+        if rows:
+            out[rows] = self.filter.update(hands[rows], [tracks[i].slot for i in rows], timestamp)
+        return out
+
+    def reset(self):
+        for track in self.tracks:
+            track.active = False
+            track.stop_stroke()
+        self.filter.reset()
@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+
+
+class UISprite:
+    # Önceden çizilmiş UI parçası: renk ve maske (kenar yumuşatmalı alfa), çerçeve üzerindeki konumuyla
+    def __init__(self, key, ops, alpha):
+        self.key = key
+        self.alpha = alpha
+        x0, y0, x1, y1 = ops_bounds(ops)
+        self.x, self.y = x0, y0
+        color = np.zeros((y1 - y0, x1 - x0, 3), dtype=np.uint8)
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for op in ops:
+            draw_op(color, op, -x0, -y0)
+            draw_op(mask, op, -x0, -y0, mask_value=255)
+        self.color = color
+        self.mask = mask
+        # Tam kaplanan pikseller cv2 ile karıştırılır; kenar yumuşatmalı (kısmi) pikseller ayrıca
+        self.full_mask = np.where(mask == 255, 255, 0).astype(np.uint8)
+        self.partial = np.nonzero((mask > 0) & (mask < 255))
+        coverage = mask[self.partial][:, None].astype(np.float32) * (alpha / 255.0)
+        self.partial_keep = 1.0 - coverage
+        self.partial_color = color[self.partial].astype(np.float32) * alpha
+        # Karıştırma sonuçları her karede aynı dizilere yazılır
+        self.blended = np.empty_like(color)
+        self.partial_pixels = np.empty_like(self.partial_color)
+
+    def blend(self, image):
+        # Sadece sprite'ın kapladığı bölge karıştırılır
+        h, w = image.shape[:2]
+        sh, sw = self.mask.shape
+        if self.x < 0 or self.y < 0 or self.x + sw > w or self.y + sh > h:
+            return self.blend_clipped(image)
+        roi = image[self.y:self.y + sh, self.x:self.x + sw]
+        cv2.addWeighted(self.color, self.alpha, roi, 1 - self.alpha, 0, dst=self.blended)
+        cv2.copyTo(self.blended, self.full_mask, roi)
+        if len(self.partial[0]):
+            pixels = self.partial_pixels
+            np.multiply(roi[self.partial], self.partial_keep, out=pixels)
+            pixels += self.partial_color
+            roi[self.partial] = np.rint(pixels, out=pixels)
+
+    def blend_clipped(self, image):
+        # Sprite çerçeveden taşıyorsa (küçük çözünürlük) tam çerçeve boyutunda geçici katman kullanılır
+        h, w = image.shape[:2]
+        x0, y0 = max(self.x, 0), max(self.y, 0)
+        x1, y1 = min(self.x + self.mask.shape[1], w), min(self.y + self.mask.shape[0], h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        sy, sx = slice(y0 - self.y, y1 - self.y), slice(x0 - self.x, x1 - self.x)
+        roi = image[y0:y1, x0:x1]
+        coverage = self.mask[sy, sx][..., None].astype(np.float32) * (self.alpha / 255.0)
+        pixels = roi * (1.0 - coverage) + self.color[sy, sx] * self.alpha
+        roi[...] = np.rint(pixels)
+
+
+class UILayer:
+    # Sprite'lar anahtarları (ve saydamlık) değişmedikçe yeniden çizilmez
+    def __init__(self, alpha=0.7):
+        self.alpha = alpha
+        self.sprites = {}
+
+    def sprite(self, name, key, build_ops):
+        sprite = self.sprites.get(name)
+        if sprite is None or sprite.key != key or sprite.alpha != self.alpha:
+            sprite = UISprite(key, build_ops(), self.alpha)
+            self.sprites[name] = sprite
+        return sprite
+
+    def blend(self, image, names):
+        for name in names:
+            self.sprites[name].blend(image)
+
+
+# Çizim komutları: ('rect', p1, p2, color, thickness) veya ('text', text, org, scale, color, thickness)
+def ops_bounds(ops):
+    x0 = y0 = float('inf')
+    x1 = y1 = float('-inf')
+    for op in ops:
+        if op[0] == 'rect':
+            _, p1, p2, _, thickness = op
+            pad = max(thickness, 0) // 2 + 1
+            bx0, by0 = min(p1[0], p2[0]) - pad, min(p1[1], p2[1]) - pad
+            bx1, by1 = max(p1[0], p2[0]) + pad + 1, max(p1[1], p2[1]) + pad + 1
+        else:
+            _, text, org, scale, _, thickness = op
+            (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            bx0, by0 = org[0] - thickness, org[1] - th - thickness
+            bx1, by1 = org[0] + tw + thickness + 1, org[1] + baseline + thickness + 1
+        x0, y0 = min(x0, bx0), min(y0, by0)
+        x1, y1 = max(x1, bx1), max(y1, by1)
+    return int(x0), int(y0), int(x1), int(y1)
+
+
+def draw_op(target, op, dx, dy, mask_value=None):
+    if op[0] == 'rect':
+        _, p1, p2, color, thickness = op
+        cv2.rectangle(target, (p1[0] + dx, p1[1] + dy), (p2[0] + dx, p2[1] + dy),
+                      color if mask_value is None else mask_value, thickness)
+    else:
+        _, text, org, scale, color, thickness = op
+        cv2.putText(target, text, (org[0] + dx, org[1] + dy), cv2.FONT_HERSHEY_SIMPLEX, scale,
+                    color if mask_value is None else mask_value, thickness)